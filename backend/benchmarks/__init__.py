@@ -0,0 +1,6 @@
+"""
+성능 벤치마크 스크립트
+
+backend 디렉토리에서 실행:
+    python -m benchmarks.bench_admet_batch
+"""
@@ -0,0 +1,70 @@
+"""
+ADMET 배치 예측 벤치마크: N회 단일 호출 vs 1회 배치 호출
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_admet_batch --sizes 100 1000 10000
+"""
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+SAMPLE_SMILES = [
+    "CC(=O)Nc1ccc(O)cc1",
+    "Cc1ccc(cc1)C(=O)O",
+    "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
+    "COc1ccc2nc(sc2c1)S(=O)(=O)N",
+    "CC(C)(C)c1ccc(O)c(CC(=O)O)c1",
+    "O=C(O)c1ccccc1",
+]
+
+
+def _smiles_batch(n: int):
+    return [SAMPLE_SMILES[i % len(SAMPLE_SMILES)] for i in range(n)]
+
+
+def bench_single(client: TestClient, smiles_list) -> float:
+    """단일 엔드포인트를 N회 호출하는 데 걸린 시간 (초)"""
+    start = time.perf_counter()
+    for smiles in smiles_list:
+        response = client.post("/api/v1/admet/predict", params={"smiles": smiles})
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def bench_batch(client: TestClient, smiles_list) -> float:
+    """배치 엔드포인트를 1회 호출하는 데 걸린 시간 (초)"""
+    start = time.perf_counter()
+    response = client.post("/api/v1/admet/predict/batch", json={"smiles": smiles_list})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument(
+        "--max-single", type=int, default=1000,
+        help="이 개수를 넘으면 단일 호출 벤치마크는 생략",
+    )
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    print(f"{'N':>8} {'single (s)':>12} {'batch (s)':>12} {'speedup':>9} {'batch mol/s':>12}")
+    for n in args.sizes:
+        smiles_list = _smiles_batch(n)
+        batch_time = bench_batch(client, smiles_list)
+        if n <= args.max_single:
+            single_time = bench_single(client, smiles_list)
+            speedup = f"{single_time / batch_time:8.1f}x"
+            single = f"{single_time:12.3f}"
+        else:
+            speedup, single = f"{'-':>9}", f"{'-':>12}"
+        print(f"{n:>8} {single} {batch_time:12.3f} {speedup} {n / batch_time:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+API 벤치마크 스위트: 엔드포인트별 처리량과 p50/p95/p99 지연 시간
+
+ASGI transport로 앱을 in-process 구동하므로 네트워크는 사용하지 않는다.
+결과를 JSON으로 저장하고, 이전 결과(--baseline)와 비교해 임계값 이상
+느려진 항목이 있으면 종료 코드 1을 반환한다 (CI 회귀 검사용).
+
+시나리오:
+    admet_predict          POST /api/v1/admet/predict (예측 캐시 비활성)
+    generate_{n}           POST /api/v1/molecules/generate (num_molecules=n)
+    search_similar         POST /api/v1/molecules/search/similar
+    sdf_warm / sdf_cold    GET /api/v1/molecules/{smiles}/sdf (배좌 캐시 히트 / 매번 새 시드)
+    micro:*                pydantic 모델 생성/직렬화 마이크로벤치마크
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_api --output bench.json
+    python -m benchmarks.bench_api --baseline bench.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import quote
+
+import httpx
+import numpy as np
+
+from core.cache import prediction_cache
+from core.executor import compute
+from main import app
+from ml.conformers import conformer_cache
+from routers.admet import ADMETDetails, ADMETPredictionResponse
+from schemas import MoleculeProperty
+
+SMILES_POOL = [
+    "CC(=O)Nc1ccc(O)cc1",
+    "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
+    "COc1ccc2nc(sc2c1)S(=O)(=O)N",
+    "CC(C)(C)c1ccc(O)c(CC(=O)O)c1",
+    "CN1C=NC2=C1C(=O)N(C(=O)N2C)C",
+    "O=C(O)c1ccccc1",
+]
+
+GENERATE_SIZES = (1, 20, 100)
+
+# 회귀 판정 지표: (지표 이름, 클수록 좋은지)
+COMPARED_METRICS = (("p95_ms", False), ("p50_ms", False), ("throughput_rps", True))
+
+Request = Tuple[str, str, dict]
+
+
+def _scenarios() -> Dict[str, Callable[[int], Request]]:
+    """시나리오 이름 → (i번째 요청의 method, url, httpx kwargs)"""
+    def smiles(i: int) -> str:
+        return SMILES_POOL[i % len(SMILES_POOL)]
+
+    scenarios: Dict[str, Callable[[int], Request]] = {
+        "admet_predict": lambda i: ("POST", "/api/v1/admet/predict", {"params": {"smiles": smiles(i)}}),
+    }
+    for n in GENERATE_SIZES:
+        scenarios[f"generate_{n}"] = lambda i, n=n: (
+            "POST",
+            "/api/v1/molecules/generate",
+            {"json": {"target_disease": "hepatitis_b", "num_molecules": n}},
+        )
+    scenarios["search_similar"] = lambda i: (
+        "POST",
+        "/api/v1/molecules/search/similar",
+        {"params": {"query_smiles": smiles(i), "threshold": 0.3, "limit": 10}},
+    )
+    scenarios["sdf_warm"] = lambda i: ("GET", f"/api/v1/molecules/{quote(smiles(i), safe='')}/sdf", {})
+    scenarios["sdf_cold"] = lambda i: (
+        "GET",
+        f"/api/v1/molecules/{quote(smiles(i), safe='')}/sdf",
+        {"params": {"seed": 1_000_000 + i}},
+    )
+    return scenarios
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient, build: Callable[[int], Request], requests: int, concurrency: int, warmup: int
+) -> dict:
+    for i in range(warmup):
+        method, url, kwargs = build(i)
+        await client.request(method, url, **kwargs)
+
+    latencies: List[float] = []
+    errors = [0]
+    next_index = iter(range(warmup, warmup + requests))
+
+    async def worker():
+        for i in next_index:
+            method, url, kwargs = build(i)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors[0] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    values = np.asarray(latencies)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+async def run_api(names: List[str], requests: int, concurrency: int, warmup: int, workers: int) -> Dict[str, dict]:
+    scenarios = _scenarios()
+    compute.configure(max_workers=workers)
+    await compute.start()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            results = {}
+            for name in names:
+                # 콜드 시나리오는 임베딩이 느리므로 요청 수를 줄인다
+                n = max(1, requests // 10) if name == "sdf_cold" else requests
+                results[name] = await _run_scenario(client, scenarios[name], n, concurrency, warmup)
+                print(_format_row(name, results[name]), flush=True)
+            return results
+    finally:
+        await compute.stop()
+
+
+def _admet_kwargs() -> dict:
+    return {
+        "smiles": "CC(=O)Nc1ccc(O)cc1",
+        "absorption": 0.81,
+        "distribution": 0.62,
+        "metabolism": 0.55,
+        "excretion": 0.7,
+        "toxicity": 0.9,
+        "overall_score": 0.72,
+        "details": {
+            "caco2_permeability": -5.1,
+            "bioavailability": 0.8,
+            "bbb_penetration": 0.3,
+            "pgp_substrate": False,
+            "cyp_inhibition": ["CYP2C9", "CYP3A4"],
+            "half_life": 4.2,
+            "clearance": 12.5,
+            "ld50": 2.6,
+            "herg_inhibition": False,
+            "hepatotoxicity": False,
+            "skin_sensitization": False,
+        },
+        "timestamp": "2024-01-01T00:00:00",
+    }
+
+
+def run_micro(number: int) -> Dict[str, dict]:
+    """pydantic 모델 생성/직렬화 비용 (호출당 마이크로초)"""
+    molecule_kwargs = {
+        "name": "Compound_0001",
+        "smiles": "CC(=O)Nc1ccc(O)cc1",
+        "molecular_weight": 151.16,
+        "logp": 1.35,
+        "tpsa": 49.33,
+        "hbd": 2,
+        "hba": 2,
+        "binding_affinity": -8.1,
+        "synthesis_score": 0.8,
+    }
+    admet_kwargs = _admet_kwargs()
+    molecule = MoleculeProperty(**molecule_kwargs)
+    admet = ADMETPredictionResponse(**admet_kwargs)
+    admet_details = admet_kwargs["details"]
+
+    cases = {
+        "micro:molecule_property_validate": lambda: MoleculeProperty(**molecule_kwargs),
+        "micro:molecule_property_construct": lambda: MoleculeProperty.model_construct(**molecule_kwargs),
+        "micro:molecule_property_dump_json": molecule.model_dump_json,
+        "micro:admet_response_validate": lambda: ADMETPredictionResponse(**admet_kwargs),
+        "micro:admet_response_construct": lambda: ADMETPredictionResponse.model_construct(
+            **{**admet_kwargs, "details": ADMETDetails.model_construct(**admet_details)}
+        ),
+        "micro:admet_response_dump_json": admet.model_dump_json,
+    }
+    results = {}
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        results[name] = {"us_per_op": round(best / number * 1e6, 3)}
+        print(f"{name:<40} {results[name]['us_per_op']:>10.3f} us/op", flush=True)
+    return results
+
+
+def _format_row(name: str, r: dict) -> str:
+    return (
+        f"{name:<20} {r['throughput_rps']:>10.1f} rps  p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}  "
+        f"p99 {r['p99_ms']:>8.2f} ms  errors {r['errors']}"
+    )
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    기준 결과 대비 회귀 항목 목록
+
+    Args:
+        current: 이번 실행 결과
+        baseline: 기준 결과 (같은 JSON 형식)
+        threshold: 허용 악화 비율 (0.2 = 20%)
+
+    Returns:
+        회귀 설명 문자열 리스트 (없으면 빈 리스트)
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        metrics = COMPARED_METRICS if "us_per_op" not in result else (("us_per_op", False),)
+        for metric, higher_is_better in metrics:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > threshold:
+                regressions.append(f"{name}.{metric}: {old} -> {new} ({change:+.0%} 악화)")
+    return regressions
+
+
+def main():
+    scenario_names = list(_scenarios())
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", default=scenario_names, choices=scenario_names)
+    parser.add_argument("--requests", type=int, default=200, help="시나리오당 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=0, help="계산 프로세스 풀 크기 (0: inline)")
+    parser.add_argument("--micro-number", type=int, default=20_000, help="마이크로벤치마크 반복 횟수")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 악화 비율 (기본 20%%)")
+    args = parser.parse_args()
+
+    # 같은 분자가 캐시에서 바로 응답되지 않도록 예측 캐시 비활성화,
+    # 배좌 캐시는 빈 임시 디렉토리에서 시작 (sdf_warm은 워밍업 후 히트)
+    prediction_cache.max_size = 0
+    conformer_cache.directory = Path(tempfile.mkdtemp(prefix="bench-conformers-"))
+
+    results = asyncio.run(run_api(args.scenarios, args.requests, args.concurrency, args.warmup, args.workers))
+    if not args.skip_micro:
+        results.update(run_micro(args.micro_number))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report, json.load(fh), args.threshold)
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건 (임계값 {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n회귀 없음 (임계값 {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
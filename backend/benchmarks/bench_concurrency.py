@@ -0,0 +1,101 @@
+"""
+동시성 벤치마크: 계산 부하 중 /health 지연 시간 (p50/p95/p99)
+
+ADMET 배치 요청을 동시에 계속 보내면서 /health를 주기적으로 호출한다.
+COMPUTE_WORKERS=0 (이벤트 루프에서 직접 계산)과 프로세스 풀 모드를 비교한다.
+ASGI transport로 앱을 in-process 구동하므로 네트워크는 사용하지 않는다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_concurrency --workers 0 4 --duration 5
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from core.cache import prediction_cache
+from core.executor import compute
+from main import app
+
+SMILES_POOL = [
+    "CC(=O)Nc1ccc(O)cc1",
+    "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
+    "COc1ccc2nc(sc2c1)S(=O)(=O)N",
+    "CC(C)(C)c1ccc(O)c(CC(=O)O)c1",
+    "CN1C=NC2=C1C(=O)N(C(=O)N2C)C",
+]
+
+
+async def load_worker(client: httpx.AsyncClient, batch_size: int, stop_at: float, counter: list):
+    batch = [SMILES_POOL[i % len(SMILES_POOL)] for i in range(batch_size)]
+    while time.perf_counter() < stop_at:
+        response = await client.post("/api/v1/admet/predict/batch", json={"smiles": batch})
+        counter[0 if response.status_code == 200 else 1] += 1
+
+
+async def probe_health(client: httpx.AsyncClient, stop_at: float, interval: float) -> list:
+    """
+    interval마다 /health 호출. 지연 시간은 '보내려던 시각'부터 측정하므로
+    이벤트 루프가 막혀 호출 자체가 늦어진 시간도 포함된다 (coordinated omission 보정).
+    """
+    latencies = []
+    scheduled = time.perf_counter()
+    while scheduled < stop_at:
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        await client.get("/health")
+        now = time.perf_counter()
+        latencies.append((now - scheduled) * 1000)
+        # 지연된 호출은 건너뛰지 않고 밀린 만큼 바로 이어서 보냄
+        scheduled += interval
+    return latencies
+
+
+async def run(workers: int, concurrency: int, batch_size: int, duration: float) -> dict:
+    compute.configure(max_workers=workers)
+    await compute.start()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            stop_at = time.perf_counter() + duration
+            counter = [0, 0]
+            loads = [load_worker(client, batch_size, stop_at, counter) for _ in range(concurrency)]
+            results = await asyncio.gather(probe_health(client, stop_at, 0.01), *loads)
+    finally:
+        await compute.stop()
+
+    latencies = np.asarray(results[0])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "workers": workers,
+        "health_p50_ms": p50,
+        "health_p95_ms": p95,
+        "health_p99_ms": p99,
+        "health_max_ms": latencies.max(),
+        "batches_ok": counter[0],
+        "batches_rejected": counter[1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4])
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 부하 요청 수")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    # 같은 분자가 캐시에서 바로 응답되지 않도록 캐시 비활성화
+    prediction_cache.max_size = 0
+
+    print(f"{'workers':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'batches':>8} {'503s':>6}")
+    for workers in args.workers:
+        r = asyncio.run(run(workers, args.concurrency, args.batch_size, args.duration))
+        print(f"{r['workers']:>8} {r['health_p50_ms']:>8.1f} {r['health_p95_ms']:>8.1f} "
+              f"{r['health_p99_ms']:>8.1f} {r['health_max_ms']:>8.1f} {r['batches_ok']:>8} {r['batches_rejected']:>6}")
+
+
+if __name__ == "__main__":
+    main()
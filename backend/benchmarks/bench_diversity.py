@@ -0,0 +1,109 @@
+"""
+다양성 선택 벤치마크: lazy MaxMin vs 매 선택 전체 갱신, Butina 클러스터링
+
+합성 fingerprint에서 --picks개를 고르며 다음을 비교한다:
+
+    lazy (pool=P)   ml.diversity.maxmin_pick (하한이 낮은 P개만 최신 상태로 유지)
+    full update     매 선택마다 모든 후보와 새로 고른 분자를 비교 (n × picks 번 계산)
+    butina          앞쪽 --butina-size개 Butina 클러스터링 (이웃 그래프 + 클러스터링)
+
+데이터:
+    random      균일 무작위 희소 비트 (최근접 유사도가 모두 비슷한 최악의 경우)
+    clustered   --clusters개 중심을 변형한 분자 (실제 라이브러리처럼 계열이 있는 경우)
+
+시간, 유사도 계산 횟수, 추가 메모리 최대치 (tracemalloc)를 출력한다. 전체 거리 행렬이
+필요했다면 차지했을 메모리 (n²/2 float32)도 함께 출력한다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_diversity --size 1000000 --picks 1000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.bench_similarity_index import synthetic_fingerprints
+from ml import diversity
+from ml.fingerprint_index import DEFAULT_N_BITS, popcount_rows
+
+
+def clustered_fingerprints(n: int, num_clusters: int, seed: int = 0) -> np.ndarray:
+    """중심 fingerprint의 비트를 20% 지우고 0.5% 새로 켠 변형 분자"""
+    rng = np.random.default_rng(seed)
+    centers = synthetic_fingerprints(num_clusters, seed=seed + 1)
+    packed = np.empty((n, DEFAULT_N_BITS // 64), dtype=np.uint64)
+    chunk = 16384
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        keep = np.packbits(rng.random((stop - start, DEFAULT_N_BITS), dtype=np.float32) < 0.8, axis=1, bitorder="little")
+        noise = np.packbits(rng.random((stop - start, DEFAULT_N_BITS), dtype=np.float32) < 0.005, axis=1, bitorder="little")
+        members = centers[rng.integers(num_clusters, size=stop - start)]
+        packed[start:stop] = (members & keep.view(np.uint64)) | noise.view(np.uint64)
+    return packed
+
+
+def full_update_pick(fingerprints: np.ndarray, num_picks: int) -> np.ndarray:
+    """기준 구현: 매 선택마다 모든 후보의 최근접 유사도 갱신"""
+    counts = popcount_rows(fingerprints)
+    nearest = np.zeros(len(fingerprints))
+    picks = [0]
+    for _ in range(num_picks):
+        last = picks[-1]
+        nearest = np.maximum(nearest, diversity._similarities_to(fingerprints, counts, fingerprints[last], int(counts[last])))
+        nearest[picks] = np.inf
+        if len(picks) == num_picks:
+            break
+        picks.append(int(np.argmin(nearest)))
+    return np.array(picks)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--picks", type=int, default=1000)
+    parser.add_argument("--pools", type=int, nargs="+", default=[1024, 4096])
+    parser.add_argument("--clusters", type=int, default=5000)
+    parser.add_argument("--full-max", type=int, default=200_000, help="전체 갱신 방식을 실행할 최대 후보 수")
+    parser.add_argument("--butina-size", type=int, default=20_000)
+    parser.add_argument("--butina-cutoff", type=float, default=diversity.DEFAULT_BUTINA_CUTOFF)
+    args = parser.parse_args()
+
+    matrix_bytes = args.size * (args.size - 1) // 2 * 4
+    print(f"candidates={args.size:,} picks={args.picks} (full distance matrix would need {matrix_bytes / 2**30:,.1f} GiB)")
+    for label, make in (
+        ("random", lambda: synthetic_fingerprints(args.size)),
+        ("clustered", lambda: clustered_fingerprints(args.size, args.clusters)),
+    ):
+        fingerprints = make()
+        print(f"\n[{label}]")
+        print(f"{'method':<18} {'seconds':>8} {'evaluations':>14} {'peak MiB':>9} {'last nearest':>13}")
+        for pool in args.pools:
+            result, seconds, peak = measure(diversity.maxmin_pick, fingerprints, args.picks, 0, None, pool)
+            print(f"{f'lazy (pool={pool})':<18} {seconds:>8.2f} {result.num_evaluations:>14,} "
+                  f"{peak / 2**20:>9.1f} {result.nearest_similarities[-1]:>13.3f}")
+        if args.size <= args.full_max:
+            _, seconds, peak = measure(full_update_pick, fingerprints, args.picks)
+            print(f"{'full update':<18} {seconds:>8.2f} {args.size * args.picks:>14,} {peak / 2**20:>9.1f}")
+
+        subset = fingerprints[:args.butina_size]
+        (indptr, _), graph_seconds, _ = measure(diversity.neighbor_graph, subset, args.butina_cutoff)
+        clusters, seconds, peak = measure(diversity.butina_clusters, subset, args.butina_cutoff)
+        print(f"butina {len(subset):,} (cutoff {args.butina_cutoff}): {seconds:.2f} s "
+              f"(neighbor graph {graph_seconds:.2f} s, {indptr[-1]:,} edges), "
+              f"{len(clusters.centroids):,} clusters, peak {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
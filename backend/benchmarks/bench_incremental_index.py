@@ -0,0 +1,123 @@
+"""
+세그먼트 인덱스 벤치마크: 추가 처리량, 병합 중 검색 지연, 전체 재구성 비용 비교
+
+합성 fingerprint를 배치 단위로 SegmentedFingerprintIndex에 추가하면서
+다음을 측정한다:
+
+    ingest     추가 처리량 (행/초, 봉인 포함 - 병합은 백그라운드)
+    quiet      추가/병합이 없을 때 검색 지연 p50/p99 (절반 크기, 전체 크기)
+    ingesting  추가 배치 사이사이 검색 지연 (병합 없음)
+    merging    추가 중 백그라운드 병합이 진행 중일 때 검색 지연
+    single     같은 행 수의 단일 FingerprintIndex 검색 지연 (세그먼트 분할 비용 비교용)
+    rebuild    같은 크기의 FingerprintIndex를 처음부터 만드는 시간 (추가마다 재구성하는 방식의 비용)
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_incremental_index --size 500000 --batch 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_similarity_index import synthetic_fingerprints
+from ml.fingerprint_index import DEFAULT_N_BITS, FingerprintIndex
+from ml.segmented_index import SegmentedFingerprintIndex
+
+
+def _percentiles(latencies) -> str:
+    if not latencies:
+        return f"{'-':>8} {'-':>8} {0:>6}"
+    p50, p99 = np.percentile(np.array(latencies) * 1e3, [50, 99])
+    return f"{p50:>8.2f} {p99:>8.2f} {len(latencies):>6}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=500_000)
+    parser.add_argument("--batch", type=int, default=1000, help="추가 한 번의 행 수")
+    parser.add_argument("--delta-capacity", type=int, default=4096)
+    parser.add_argument("--max-segments", type=int, default=8)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    fingerprints = synthetic_fingerprints(args.size)
+    ids = np.arange(args.size, dtype=np.int64)
+    rng = np.random.default_rng(1)
+
+    half = args.size // 2
+    index = SegmentedFingerprintIndex(
+        DEFAULT_N_BITS, delta_capacity=args.delta_capacity, max_segments=args.max_segments
+    )
+
+    def ingest(begin: int, end: int) -> float:
+        start = time.perf_counter()
+        for offset in range(begin, end, args.batch):
+            stop = min(offset + args.batch, end)
+            index.add(fingerprints[offset:stop], ids[offset:stop])
+        return time.perf_counter() - start
+
+    def wait_for_merges():
+        while index.stats()["sealed_segments"] > args.max_segments or index.stats()["merging"]:
+            time.sleep(0.01)
+
+    def search_once(latencies: dict, inserted: int):
+        query = fingerprints[rng.integers(inserted)]
+        merging = index.stats()["merging"]
+        start = time.perf_counter()
+        index.search(query, threshold=args.threshold, limit=args.limit)
+        latencies["merging" if merging else "ingesting"].append(time.perf_counter() - start)
+
+    # 1) 추가 처리량 (앞 절반, 검색 없음)
+    seconds = ingest(0, half)
+    wait_for_merges()
+    print(f"ingest: {half:,} rows in {seconds:.2f} s ({half / seconds:,.0f} rows/s)")
+
+    def quiet_latencies(inserted: int) -> list:
+        latencies = {"merging": [], "ingesting": []}
+        for _ in range(args.queries):
+            search_once(latencies, inserted)
+        return latencies["ingesting"]
+
+    # 2) 추가/병합이 없을 때 검색 지연
+    quiet = quiet_latencies(half)
+
+    # 3) 뒤 절반을 추가하면서 배치마다 검색 (병합은 백그라운드 스레드에서 진행)
+    during = {"merging": [], "ingesting": []}
+    for offset in range(half, args.size, args.batch):
+        ingest(offset, min(offset + args.batch, args.size))
+        search_once(during, offset)
+    wait_for_merges()
+    quiet_full = quiet_latencies(args.size)
+    index.close()
+
+    stats = index.stats()
+    print(f"final: {len(index):,} rows, seals {stats['seals']}, merges {stats['merges']}, "
+          f"segments {stats['segment_sizes']} + delta {stats['delta_rows']}")
+    print(f"{'search':<22} {'p50 ms':>8} {'p99 ms':>8} {'count':>6}")
+    print(f"{'quiet (half)':<22} {_percentiles(quiet)}")
+    print(f"{'quiet (full)':<22} {_percentiles(quiet_full)}")
+    print(f"{'while ingesting':<22} {_percentiles(during['ingesting'])}")
+    print(f"{'while merging':<22} {_percentiles(during['merging'])}")
+
+    single = FingerprintIndex(fingerprints)
+    latencies = []
+    for _ in range(args.queries):
+        query = fingerprints[rng.integers(args.size)]
+        start = time.perf_counter()
+        single.search(query, threshold=args.threshold, limit=args.limit)
+        latencies.append(time.perf_counter() - start)
+    print(f"{'single index (full)':<22} {_percentiles(latencies)}")
+
+    start = time.perf_counter()
+    FingerprintIndex(fingerprints)
+    rebuild = time.perf_counter() - start
+    per_batch = args.size / args.batch
+    print(f"full rebuild of {args.size:,} rows: {rebuild * 1e3:.0f} ms "
+          f"(rebuilding after each of {per_batch:,.0f} batches would cost ~{rebuild * per_batch / 2:,.0f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+ADMET 단건 요청 micro-batching 벤치마크
+
+결과 페이지처럼 POST /api/v1/admet/predict 단건 요청을 동시에 보내고
+(캐시는 매 회차 비움) 처리량과 요청 지연 p50/p99를 비교한다.
+
+    max_batch_size=1   배치 없이 요청마다 모델 호출 (single-flight 병합만 유지)
+    window=0/2/5 ms    같은 창 안에 들어온 요청을 한 번의 벡터화 호출로 처리
+
+--duplicates는 같은 분자를 요청하는 비율이다 (single-flight 병합 효과).
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_microbatch --requests 200 --concurrency 50 --workers 2
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from core.cache import prediction_cache
+from core.executor import compute
+from main import app
+from routers.admet import single_batcher
+
+RING_SUBSTITUENTS = ("O", "N", "F", "Cl", "C(=O)O", "C(N)=O", "OC", "C#N")
+
+
+def request_smiles(n: int, duplicates: float, seed: int = 0) -> list:
+    """서로 다른 분자 + duplicates 비율만큼 앞쪽 분자 반복"""
+    rng = np.random.default_rng(seed)
+    unique = [
+        f"{'C' * (i // len(RING_SUBSTITUENTS) + 1)}c1ccc({RING_SUBSTITUENTS[i % len(RING_SUBSTITUENTS)]})cc1"
+        for i in range(n)
+    ]
+    return [unique[rng.integers(max(1, i))] if rng.random() < duplicates else unique[i] for i in range(n)]
+
+
+async def run(client: httpx.AsyncClient, smiles: list, concurrency: int) -> dict:
+    prediction_cache.clear()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(text: str):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/api/v1/admet/predict", params={"smiles": text})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    before = dict(single_batcher.stats())
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in smiles))
+    elapsed = time.perf_counter() - start
+    after = single_batcher.stats()
+    batches = after["batches"] - before["batches"]
+    p50, p99 = np.percentile(np.array(latencies) * 1e3, [50, 99])
+    return {
+        "rps": len(smiles) / elapsed,
+        "p50": p50,
+        "p99": p99,
+        "batches": batches,
+        "coalesced": after["coalesced"] - before["coalesced"],
+    }
+
+
+async def main_async(args):
+    compute.configure(max_workers=args.workers)
+    await compute.start()
+    settings = [("no batching", 0.0, 1)] + [(f"window {ms:g} ms", ms / 1000, args.max_batch_size) for ms in args.windows]
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for duplicates in args.duplicates:
+                smiles = request_smiles(args.requests, duplicates)
+                # 워밍업 (모델 로드, 워커 import)
+                await run(client, smiles[:10], args.concurrency)
+                print(f"\nrequests={args.requests} concurrency={args.concurrency} duplicates={duplicates:.0%}")
+                print(f"{'setting':<14} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'batches':>8} {'coalesced':>10}")
+                for label, window, max_batch_size in settings:
+                    single_batcher.window, single_batcher.max_batch_size = window, max_batch_size
+                    r = await run(client, smiles, args.concurrency)
+                    print(f"{label:<14} {r['rps']:>8.0f} {r['p50']:>8.1f} {r['p99']:>8.1f} "
+                          f"{r['batches']:>8} {r['coalesced']:>10}")
+    finally:
+        await compute.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 2, 5])
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--duplicates", type=float, nargs="+", default=[0.0, 0.5])
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
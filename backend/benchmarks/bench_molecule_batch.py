@@ -0,0 +1,88 @@
+"""
+분자 표현별 메모리 벤치마크: 1M 분자당 메모리 (dict / pydantic / MoleculeBatch)
+
+같은 생성 분자(카탈로그 시드 + 변동)를 세 가지 형태로 만들고 tracemalloc으로
+할당량을 잰다. NumPy 배열 할당도 tracemalloc에 잡힌다. --size가 1M보다 작으면
+1M 기준으로 선형 환산한 값을 함께 출력한다.
+
+    dicts     분자마다 dict (변경 전 _iter_generated_molecules 출력)
+    pydantic  분자마다 MoleculeProperty
+    batch     MoleculeBatch (컬럼 배열 + 연결 SMILES/이름 버퍼)
+
+필터링(logp <= 3) 한 단계 시간도 함께 측정한다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_molecule_batch --size 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+from ml.generator import sample_candidates
+from services.catalog import get_catalog
+from schemas import MoleculeProperty
+
+PER = 1_000_000
+
+
+def _measure(build):
+    """build()가 반환한 객체가 붙잡고 있는 메모리 (bytes)"""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200_000, help="분자 수")
+    parser.add_argument("--skip-pydantic", action="store_true", help="pydantic 측정 생략 (가장 느림)")
+    args = parser.parse_args()
+
+    catalog = get_catalog()
+    seed_rows = np.arange(len(catalog))
+
+    def build_batch():
+        return sample_candidates(catalog, seed_rows, args.size, np.random.default_rng(0)).to_molecules(catalog)
+
+    batch, batch_bytes = _measure(build_batch)
+    results = {"batch": batch_bytes}
+    records, results["dicts"] = _measure(batch.records)
+    if not args.skip_pydantic:
+        models, results["pydantic"] = _measure(lambda: [MoleculeProperty(**record) for record in records])
+        del models
+
+    scale = PER / args.size
+    print(f"molecules: {args.size:,} (1M 환산 x{scale:g})")
+    print(f"{'repr':<10} {'MiB':>10} {'MiB / 1M':>10} {'bytes/mol':>10}")
+    for name in ("dicts", "pydantic", "batch"):
+        if name in results:
+            nbytes = results[name]
+            print(f"{name:<10} {nbytes / 2**20:>10.1f} {nbytes * scale / 2**20:>10.1f} {nbytes / args.size:>10.1f}")
+    print(f"batch.nbytes: {batch.nbytes / 2**20:.1f} MiB")
+    print(f"build: batch {_timed(build_batch):.3f} s, dicts (batch.records) {_timed(batch.records):.3f} s")
+
+    start = time.perf_counter()
+    kept = [record for record in records if record["logp"] <= 3]
+    dict_filter = time.perf_counter() - start
+    start = time.perf_counter()
+    kept_batch = batch.take(batch.columns["logp"] <= 3)
+    batch_filter = time.perf_counter() - start
+    assert len(kept) == len(kept_batch)
+    print(f"filter logp<=3: dicts {dict_filter * 1e3:.1f} ms, batch {batch_filter * 1e3:.1f} ms ({len(kept):,} kept)")
+
+
+if __name__ == "__main__":
+    main()
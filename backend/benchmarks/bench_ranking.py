@@ -0,0 +1,51 @@
+"""
+다목적 순위 벤치마크: Pareto top-k / 가중합 top-k 시간
+
+균등 분포 합성 목표값(클수록 좋음)을 사용한다. pareto는 top_k를 채우는
+front까지만 계산하므로 k가 클수록 느려진다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_ranking --sizes 100000 300000 --objectives 2 3 --k 100 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ml.ranking import pareto_fronts, top_k, weighted_scores
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 300_000])
+    parser.add_argument("--objectives", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--k", type=int, nargs="+", default=[100, 1000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>8} {'m':>2} {'k':>6} {'pareto s':>9} {'fronts':>7} {'weighted s':>11}")
+    for n in args.sizes:
+        for m in args.objectives:
+            values = rng.random((n, m))
+            weights = np.ones(m)
+            for k in args.k:
+                fronts = None
+
+                def pareto():
+                    nonlocal fronts
+                    fronts = pareto_fronts(values, limit=k)
+
+                pareto_seconds = _timed(pareto)
+                weighted_seconds = _timed(lambda: top_k(weighted_scores(values, weights), k))
+                print(f"{n:>8} {m:>2} {k:>6} {pareto_seconds:>9.3f} {int(fronts.max()) + 1:>7} {weighted_seconds:>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
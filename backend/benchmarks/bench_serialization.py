@@ -0,0 +1,154 @@
+"""
+응답 직렬화 벤치마크: 분자당 직렬화 비용 (검증 경로 vs 신뢰 dict + orjson)
+
+before: 분자마다 MoleculeProperty / ADMETPredictionResponse 생성 →
+        FastAPI response_model 재검증(serialize_response) → JSONResponse
+after:  스키마와 같은 모양의 dict → FastJSONResponse (orjson)
+
+FastAPI 라우트의 실제 response_field로 serialize_response를 호출하므로
+"before"는 변경 전 엔드포인트가 하던 일과 같다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_serialization --sizes 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from core.responses import FastJSONResponse, orjson
+from main import app
+from ml.admet_predictor import score_smiles
+from routers.admet import ADMETBatchItem, ADMETBatchResponse, ADMETPredictionResponse
+from schemas import MoleculeGenerationResponse, MoleculeProperty
+from services.admet import build_prediction
+
+SAMPLE_SMILES = [
+    "CC(=O)Nc1ccc(O)cc1",
+    "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
+    "COc1ccc2nc(sc2c1)S(=O)(=O)N",
+    "CC(C)(C)c1ccc(O)c(CC(=O)O)c1",
+    "O=C(O)c1ccccc1",
+]
+
+GENERATION_STATS = {
+    "num_requested": 0,
+    "num_sampled": 0,
+    "num_accepted": 0,
+    "acceptance_rate": 1.0,
+    "rounds": 1,
+    "sample_budget": 1000,
+    "budget_exhausted": False,
+}
+
+
+def _response_field(path: str):
+    for route in app.routes:
+        if getattr(route, "path", None) == path:
+            return route.response_field
+    raise LookupError(path)
+
+
+def _molecule_rows(n: int):
+    return [
+        {
+            "name": f"Compound-{i}",
+            "smiles": SAMPLE_SMILES[i % len(SAMPLE_SMILES)],
+            "molecular_weight": 151.16 + i % 7,
+            "logp": 1.35,
+            "tpsa": 49.33,
+            "hbd": 2,
+            "hba": 2,
+            "binding_affinity": 0.81,
+            "synthesis_score": 0.74,
+        }
+        for i in range(n)
+    ]
+
+
+def _timed(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_generation(n: int) -> tuple:
+    field = _response_field("/api/v1/molecules/generate")
+    rows = _molecule_rows(n)
+
+    def before():
+        response = MoleculeGenerationResponse(
+            status="success",
+            target_disease="hepatitis_b",
+            num_generated=n,
+            molecules=[MoleculeProperty(**row) for row in rows],
+            generation_stats=GENERATION_STATS,
+        )
+        content = asyncio.run(serialize_response(field=field, response_content=response, is_coroutine=True))
+        return JSONResponse(content).body
+
+    def after():
+        return FastJSONResponse({
+            "status": "success",
+            "target_disease": "hepatitis_b",
+            "num_generated": n,
+            "molecules": rows,
+            "generation_stats": GENERATION_STATS,
+        }).body
+
+    return _timed(before), _timed(after)
+
+
+def bench_admet_batch(n: int) -> tuple:
+    field = _response_field("/api/v1/admet/predict/batch")
+    smiles = [SAMPLE_SMILES[i % len(SAMPLE_SMILES)] for i in range(n)]
+    result = score_smiles(smiles)
+    timestamp = datetime.utcnow().isoformat()
+
+    def before():
+        items = [
+            ADMETBatchItem(
+                index=i,
+                smiles=s,
+                prediction=ADMETPredictionResponse(**build_prediction(result, i, s, timestamp)),
+            )
+            for i, s in enumerate(smiles)
+        ]
+        response = ADMETBatchResponse(num_requested=n, num_succeeded=n, num_failed=0, results=items, timestamp=timestamp)
+        content = asyncio.run(serialize_response(field=field, response_content=response, is_coroutine=True))
+        return JSONResponse(content).body
+
+    def after():
+        items = [
+            {"index": i, "smiles": s, "prediction": build_prediction(result, i, s, timestamp), "error": None}
+            for i, s in enumerate(smiles)
+        ]
+        return FastJSONResponse({
+            "num_requested": n, "num_succeeded": n, "num_failed": 0, "results": items, "timestamp": timestamp,
+        }).body
+
+    return _timed(before), _timed(after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    print(f"serializer: {'orjson' if orjson is not None else 'json (orjson 미설치)'}")
+    print(f"{'case':<14} {'n':>7} {'before us/item':>15} {'after us/item':>14} {'speedup':>8}")
+    for name, bench in (("generate", bench_generation), ("admet_batch", bench_admet_batch)):
+        for n in args.sizes:
+            before, after = bench(n)
+            print(f"{name:<14} {n:>7} {before / n * 1e6:>15.2f} {after / n * 1e6:>14.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Fingerprint 인덱스 벤치마크: 1M fingerprint 대상 Tanimoto 검색 QPS 및 메모리
+
+합성 fingerprint (행마다 비트 밀도가 다른 2048비트 벡터)를 사용한다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_similarity_index --size 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ml.fingerprint_index import DEFAULT_N_BITS, FingerprintIndex
+
+
+def synthetic_fingerprints(n: int, n_bits: int = DEFAULT_N_BITS, seed: int = 0) -> np.ndarray:
+    """Morgan fingerprint와 비슷한 희소 비트 벡터 생성 (1-6% 밀도)"""
+    rng = np.random.default_rng(seed)
+    packed = np.empty((n, n_bits // 64), dtype=np.uint64)
+    chunk = 16384
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        density = rng.uniform(0.01, 0.06, size=(stop - start, 1))
+        bits = rng.random((stop - start, n_bits), dtype=np.float32) < density
+        packed[start:stop] = np.packbits(bits, axis=1, bitorder="little").view(np.uint64)
+    return packed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.9, 0.7, 0.5, 0.3])
+    args = parser.parse_args()
+
+    print(f"Generating {args.size:,} synthetic fingerprints...")
+    fingerprints = synthetic_fingerprints(args.size)
+
+    start = time.perf_counter()
+    index = FingerprintIndex(fingerprints)
+    build_time = time.perf_counter() - start
+    print(f"Build: {build_time:.2f} s, index memory: {index.nbytes / 2**20:.1f} MiB "
+          f"({index.nbytes / len(index):.0f} bytes/fingerprint)")
+
+    # 인덱스 내 분자에 약간의 비트 변화를 준 query (실제 검색과 유사하게 높은 유사도 존재)
+    rng = np.random.default_rng(1)
+    queries = fingerprints[rng.integers(0, args.size, size=args.queries)].copy()
+    queries ^= (rng.random(queries.shape) < 0.02).astype(np.uint64) << rng.integers(0, 64, size=queries.shape, dtype=np.uint64)
+
+    print(f"{'threshold':>10} {'QPS':>8} {'ms/query':>10} {'candidates':>12} {'pruned':>8}")
+    for threshold in args.thresholds:
+        candidates = 0
+        start = time.perf_counter()
+        for query in queries:
+            result = index.search(query, threshold=threshold, limit=args.limit)
+            candidates += result.num_candidates
+        elapsed = time.perf_counter() - start
+        avg_candidates = candidates / len(queries)
+        print(f"{threshold:>10.2f} {len(queries) / elapsed:>8.1f} {elapsed / len(queries) * 1000:>10.1f} "
+              f"{avg_candidates:>12,.0f} {1 - avg_candidates / len(index):>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
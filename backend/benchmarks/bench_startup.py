@@ -0,0 +1,126 @@
+"""
+기동 시간 벤치마크: import 시간, /health 응답(liveness), /ready(readiness)까지 시간
+
+새 파이썬 프로세스로 측정하므로 매번 콜드 스타트다. 예산(초)을 넘기면
+종료 코드 1을 반환한다 (CI 회귀 검사용).
+
+측정 항목:
+    import_main      python -c "import main" (라우터의 무거운 모듈은 지연 로드)
+    dev_*            uvicorn main:app 단일 프로세스 (백그라운드 워밍업)
+    serve_*          python serve.py (부모 preload 후 fork)
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_startup --workers 2 --ready-budget 15
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _status(url: str) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=0.5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def measure_import(repeat: int) -> float:
+    """import main 최소 시간 (초)"""
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    times = [
+        float(subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeat)
+    ]
+    return min(times)
+
+
+def measure_server(command: List[str], port: int, timeout: float) -> dict:
+    """프로세스 시작부터 /health 200, /ready 200까지 걸린 시간 (초)"""
+    env = {**os.environ, "COMPUTE_WORKERS": os.getenv("COMPUTE_WORKERS", "0")}
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    live = ready = None
+    try:
+        while time.perf_counter() - start < timeout:
+            if live is None and _status(f"http://127.0.0.1:{port}/health") == 200:
+                live = time.perf_counter() - start
+            if live is not None and _status(f"http://127.0.0.1:{port}/ready") == 200:
+                ready = time.perf_counter() - start
+                break
+            time.sleep(0.01)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"live_seconds": live, "ready_seconds": ready}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="serve.py 워커 수")
+    parser.add_argument("--repeat", type=int, default=3, help="import 측정 반복 횟수")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--import-budget", type=float, default=2.0, help="import main 예산 (초)")
+    parser.add_argument("--live-budget", type=float, default=3.0, help="/health 200까지 예산 (초)")
+    parser.add_argument("--ready-budget", type=float, default=15.0, help="/ready 200까지 예산 (초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = {"import_main_seconds": measure_import(args.repeat)}
+    port = _free_port()
+    dev = measure_server(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"], port, args.timeout
+    )
+    results.update({f"dev_{name}": value for name, value in dev.items()})
+    port = _free_port()
+    serve = measure_server(
+        [sys.executable, "serve.py", "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"],
+        port,
+        args.timeout,
+    )
+    results.update({f"serve_{name}": value for name, value in serve.items()})
+
+    for name, value in results.items():
+        print(f"{name:<24} {value:>8.3f} s" if value is not None else f"{name:<24} {'timeout':>8}")
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+    budgets = {
+        "import_main_seconds": args.import_budget,
+        "dev_live_seconds": args.live_budget,
+        "dev_ready_seconds": args.ready_budget,
+        "serve_live_seconds": args.live_budget,
+        "serve_ready_seconds": args.ready_budget,
+    }
+    over = [name for name, budget in budgets.items() if results[name] is None or results[name] > budget]
+    if over:
+        print(f"예산 초과: {', '.join(over)}")
+        sys.exit(1)
+    print("모든 항목 예산 이내")
+
+
+if __name__ == "__main__":
+    main()
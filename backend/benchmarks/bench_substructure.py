@@ -0,0 +1,96 @@
+"""
+부분구조 검색 벤치마크: pattern fingerprint 사전 선별 vs 전체 그래프 매칭
+
+골격(core) × 치환기 조합으로 만든 합성 카탈로그를 임시 저장소 파일로 기록한 뒤
+query마다 다음을 비교한다:
+
+    brute     모든 분자를 파싱해 HasSubstructMatch
+    screened  비트셋 상위집합 검사(screen) → 살아남은 후보만 매칭(match)
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_substructure --size 50000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from database.compound_store import CompoundStore, write_compound_store
+from ml.chem import parse_smiles
+from ml.molecule_batch import MoleculeBatch
+from ml.substructure_index import match_rows, parse_query
+
+CORES = (
+    "{a}c1ccc({b})cc1",
+    "{a}c1ccc({b})nc1",
+    "{a}C1CCN({b})CC1",
+    "{a}c1ccc2cc({b})ccc2c1",
+    "{a}c1cnc({b})s1",
+    "{a}C(=O)N{b}",
+    "{a}c1ccc2[nH]c({b})cc2c1",
+    "{a}N1CCOCC1",
+)
+SUBSTITUENTS = ("C", "CC", "O", "N", "F", "Cl", "C(=O)O", "C(F)(F)F", "OC", "c1ccccc1", "C#N", "S(=O)(=O)N", "CCO")
+
+QUERIES = (
+    ("smiles", "c1ccccc1C(=O)O"),
+    ("smiles", "C1CCNCC1"),
+    ("smiles", "c1ccc2ccccc2c1"),
+    ("smiles", "S(=O)(=O)N"),
+    ("smarts", "[OX2H]c1ccccc1"),
+    ("smiles", "c1ccncc1"),
+)
+
+
+def synthetic_records(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    records = []
+    while len(records) < n:
+        core = CORES[rng.integers(len(CORES))]
+        a, b = (SUBSTITUENTS[i] for i in rng.integers(len(SUBSTITUENTS), size=2))
+        smiles = core.format(a=a, b=b)
+        if parse_smiles(smiles) is None:
+            continue
+        records.append({"name": f"Synthetic-{len(records)}", "smiles": smiles})
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "substructure-bench.cstore")
+    start = time.perf_counter()
+    write_compound_store(path, synthetic_records(args.size))
+    print(f"store: {args.size:,} molecules, build {time.perf_counter() - start:.1f} s")
+    store = CompoundStore(path)
+    index = store.substructure_index
+    all_rows = np.arange(len(store))
+    all_smiles = MoleculeBatch.from_catalog(store, all_rows).smiles_list()
+
+    print(f"{'query':<22} {'brute ms':>9} {'screen ms':>10} {'match ms':>9} {'screen-out':>11} {'hits':>7} {'speedup':>8}")
+    for query_format, text in QUERIES:
+        query = parse_query(text, query_format)
+
+        start = time.perf_counter()
+        expected = match_rows(query, all_smiles, all_rows)
+        brute = time.perf_counter() - start
+
+        screen = index.screen(index.query_fingerprint(query))
+        start = time.perf_counter()
+        smiles = MoleculeBatch.from_catalog(store, screen.rows).smiles_list()
+        hits = match_rows(query, smiles, screen.rows)
+        match = time.perf_counter() - start
+        assert hits == expected, text
+
+        total = screen.seconds + match
+        print(f"{text:<22} {brute * 1e3:>9.1f} {screen.seconds * 1e3:>10.2f} {match * 1e3:>9.1f} "
+              f"{screen.screen_out_ratio:>10.1%} {len(hits):>7,} {brute / total:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
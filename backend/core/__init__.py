@@ -0,0 +1,3 @@
+"""
+공통 인프라 모듈 (캐시 등)
+"""
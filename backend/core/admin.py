@@ -0,0 +1,33 @@
+"""
+운영용 엔드포인트 보호 (관리 토큰)
+
+캐시 비우기처럼 모든 클라이언트에 영향을 주는 작업은 ADMIN_TOKEN 환경변수가
+설정된 경우에만 허용하고, 요청은 "Authorization: Bearer <토큰>" 헤더를 보내야 한다.
+ADMIN_TOKEN이 없으면 해당 엔드포인트는 비활성화된다 (403).
+
+    @router.delete("", dependencies=[Depends(require_admin)])
+
+환경변수:
+    ADMIN_TOKEN: 운영용 엔드포인트 관리 토큰 (미설정 시 비활성)
+"""
+
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+
+def require_admin(authorization: Optional[str] = Header(default=None, description="Bearer <ADMIN_TOKEN>")) -> None:
+    """
+    관리 토큰 확인 (FastAPI 의존성)
+
+    Raises:
+        HTTPException: ADMIN_TOKEN 미설정 시 403, 토큰이 없거나 틀리면 401
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="관리 토큰(ADMIN_TOKEN)이 설정되지 않아 비활성화된 엔드포인트입니다")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="관리 토큰이 필요합니다", headers={"WWW-Authenticate": "Bearer"})
@@ -0,0 +1,148 @@
+"""
+동시 단건 요청 micro-batching + single-flight 병합
+
+짧은 시간(window) 동안 들어온 단건 요청을 모아 한 번의 벡터화 호출로 처리하고
+결과를 각 호출자에게 돌려준다. 같은 키(예: canonical SMILES)가 이미 대기 중이거나
+처리 중이면 새로 넣지 않고 그 결과를 함께 기다린다 (single-flight).
+
+    submit(key)  →  대기열에 추가 (첫 요청이 window 타이머 시작)
+                 →  max_batch_size에 도달하거나 window가 지나면 process(keys) 한 번 실행
+                 →  키별 결과를 각 Future에 전달
+
+배치 크기와 대기 시간(큐에 들어온 뒤 처리 시작까지)은 히스토그램으로 기록하므로
+/metrics에서 window를 조정할 근거로 사용할 수 있다.
+
+환경변수 (from_env):
+    {PREFIX}_BATCH_WINDOW_MS: 모으는 최대 시간 (ms, 기본 2, 0이면 같은 이벤트 루프 턴에 들어온 요청만 묶음)
+    {PREFIX}_BATCH_MAX_SIZE: 한 번에 처리하는 최대 키 수 (기본 64)
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+from core.metrics import BATCH_COALESCED, BATCH_QUEUE_DELAY, BATCH_SIZE
+
+
+class MicroBatcher:
+    """키 단위 micro-batcher (asyncio 이벤트 루프 안에서만 사용)"""
+
+    def __init__(
+        self,
+        name: str,
+        process: Callable[[List[Hashable]], Awaitable[Sequence[Any]]],
+        window: float = 0.002,
+        max_batch_size: int = 64,
+    ):
+        """
+        Args:
+            name: 메트릭 라벨
+            process: 키 리스트를 받아 같은 순서의 결과를 돌려주는 코루틴 함수
+                     (키별 실패는 결과 자리에 Exception 인스턴스를 넣으면 그 호출자에게만 전달됨)
+            window: 첫 요청 후 기다리는 최대 시간 (초)
+            max_batch_size: 한 번에 처리하는 최대 키 수
+        """
+        self.name = name
+        self.process = process
+        self.window = window
+        self.max_batch_size = max(1, max_batch_size)
+        # 대기 중이거나 처리 중인 키 → 결과 Future (single-flight)
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._pending: List[tuple] = []  # (키, Future, 대기열 진입 시각)
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.batches = 0
+        self.submitted = 0
+        self.coalesced = 0
+
+    @classmethod
+    def from_env(cls, name: str, process: Callable, prefix: str) -> "MicroBatcher":
+        return cls(
+            name,
+            process,
+            window=float(os.getenv(f"{prefix}_BATCH_WINDOW_MS", "2")) / 1000,
+            max_batch_size=int(os.getenv(f"{prefix}_BATCH_MAX_SIZE", "64")),
+        )
+
+    async def submit(self, key: Hashable) -> Any:
+        """
+        키 하나의 결과를 기다림
+
+        호출자가 취소되어도 같은 키를 기다리는 다른 호출자의 결과에는 영향이 없다.
+
+        Raises:
+            process가 던진 예외 (배치 전체 실패) 또는 이 키의 결과 자리에 들어 있던 예외
+        """
+        self.submitted += 1
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            BATCH_COALESCED.inc(self.name)
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # 모든 호출자가 취소된 뒤 실패해도 "exception was never retrieved" 경고가 나지 않도록 조회
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        self._pending.append((key, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        """대기열의 키를 max_batch_size씩 잘라 처리 태스크로 넘김"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[tuple]) -> None:
+        started = time.perf_counter()
+        self.batches += 1
+        BATCH_SIZE.observe(len(batch), self.name)
+        for _, _, enqueued in batch:
+            BATCH_QUEUE_DELAY.observe(started - enqueued, self.name)
+
+        keys = [key for key, _, _ in batch]
+        try:
+            results = await self.process(keys)
+        except BaseException as e:
+            for key, future, _ in batch:
+                self._in_flight.pop(key, None)
+                if future.done():
+                    continue
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                else:
+                    future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for (key, future, _), result in zip(batch, results):
+            self._in_flight.pop(key, None)
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "mean_batch_size": (self.submitted - self.coalesced) / self.batches if self.batches else None,
+            "in_flight": len(self._in_flight),
+        }
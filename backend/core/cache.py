@@ -0,0 +1,221 @@
+"""
+예측 결과 캐시
+
+정규화(canonical) SMILES + 모델 버전을 키로 사용하는 LRU/TTL 캐시.
+선택적으로 SQLite 파일에 write-through 하여 재시작 후에도 결과를 유지한다.
+
+환경변수:
+    PREDICTION_CACHE_SIZE: 메모리 LRU 최대 항목 수 (기본 10000)
+    PREDICTION_CACHE_TTL: 항목 유효 시간 (초, 0이면 만료 없음, 기본 3600)
+    PREDICTION_CACHE_PATH: 디스크 저장 SQLite 파일 경로 (비우면 메모리 전용)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+def make_key(namespace: str, canonical_smiles: str, version: str) -> str:
+    """
+    캐시 키 생성
+
+    Args:
+        namespace: 결과 종류 (예: "admet", "properties")
+        canonical_smiles: 정규화된 SMILES
+        version: 결과를 만든 모델/계산 버전
+
+    Returns:
+        캐시 키 문자열
+    """
+    return f"{namespace}|{version}|{canonical_smiles}"
+
+
+class PredictionCache:
+    """스레드 안전한 LRU + TTL 캐시 (선택적 SQLite 백업)"""
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: Optional[float] = 3600,
+        disk_path: Optional[str] = None,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds or None
+        self.disk_path = disk_path or None
+
+        # key -> (저장 시각, 값)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+        self.disk_errors = 0
+
+        if self.disk_path:
+            self._open_db()
+
+    def _open_db(self) -> None:
+        # 여러 워커 프로세스가 같은 파일을 공유하므로 core/jobs.py와 같이 잠금 대기 + WAL
+        self._db = sqlite3.connect(self.disk_path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def reopen_after_fork(self) -> None:
+        """fork된 자식 프로세스에서 락과 SQLite 연결을 새로 만듦 (부모 연결 공유 금지)"""
+        self._lock = threading.Lock()
+        if self.disk_path:
+            self._open_db()
+
+    @classmethod
+    def from_env(cls) -> "PredictionCache":
+        """환경변수 설정으로 캐시 생성"""
+        return cls(
+            max_size=int(os.getenv("PREDICTION_CACHE_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL", "3600")),
+            disk_path=os.getenv("PREDICTION_CACHE_PATH", ""),
+        )
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        캐시 조회 (메모리 → 디스크 순)
+
+        Args:
+            key: make_key()로 만든 키
+
+        Returns:
+            캐시된 값 (없거나 만료된 경우 None)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at, now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        if not self._expired(row[1], now):
+                            value = json.loads(row[0])
+                            self._insert(key, row[1], value)
+                            self.hits += 1
+                            self.disk_hits += 1
+                            return value
+                        self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                        self._db.commit()
+                        self.expirations += 1
+                except sqlite3.Error as exc:
+                    # 디스크 계층 오류는 캐시 미스로 취급
+                    self._disk_failed("read", exc)
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        캐시 저장 (디스크 저장소가 있으면 write-through)
+
+        Args:
+            key: make_key()로 만든 키
+            value: JSON 직렬화 가능한 값
+        """
+        now = time.time()
+        with self._lock:
+            self._insert(key, now, value)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), now),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as exc:
+                    # 이미 계산된 결과는 메모리 계층에 남기고 디스크 저장만 건너뜀
+                    self._disk_failed("write", exc)
+
+    def _disk_failed(self, operation: str, exc: sqlite3.Error) -> None:
+        """디스크 계층 오류 기록 (self._lock 보유 상태에서 호출)"""
+        self.disk_errors += 1
+        logger.warning("prediction cache disk %s failed: %s", operation, exc)
+        try:
+            self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _insert(self, key: str, created_at: float, value: Any) -> None:
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """메모리/디스크 항목 및 카운터 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = self.disk_hits = 0
+            self.disk_errors = 0
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM cache")
+                    self._db.commit()
+                except sqlite3.Error as exc:
+                    self._disk_failed("clear", exc)
+
+    def stats(self) -> dict:
+        """히트/미스/축출 카운터 및 설정"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            disk_entries = None
+            if self._db is not None:
+                try:
+                    disk_entries = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+                except sqlite3.Error as exc:
+                    self._disk_failed("count", exc)
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "disk_path": self.disk_path,
+                "disk_hits": self.disk_hits,
+                "disk_entries": disk_entries,
+                "disk_errors": self.disk_errors,
+            }
+
+
+# 프로세스 전역 공유 캐시 (ADMET 예측, 분자 속성)
+prediction_cache = PredictionCache.from_env()
+
+# pre-fork 런처(serve.py)에서 워커로 fork될 때 연결 재생성
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=prediction_cache.reopen_after_fork)
@@ -0,0 +1,207 @@
+"""
+CPU 집약 계산용 프로세스 풀 실행기
+
+기술자 계산, 3D 좌표 생성, 모델 추론처럼 이벤트 루프를 막는 작업을
+미리 초기화된 워커 프로세스(RDKit/모델 import 및 로드 완료)로 보낸다.
+동시에 처리 중인 작업 수가 한도를 넘으면 잠시 대기한 뒤 거부하여
+(ComputeSaturatedError → 503) 요청이 무한히 쌓이지 않게 한다.
+
+모델 추론은 워커에서 일어나므로, 워커는 ADMET 모델 통계가 바뀌었으면 작업 결과와
+함께 돌려보내고 부모는 워커(pid)별 최신 통계를 보관한다 (/admet/models/stats에서 병합).
+
+환경변수:
+    COMPUTE_WORKERS: 워커 프로세스 수 (기본: CPU 수, 0이면 이벤트 루프에서 직접 실행)
+    COMPUTE_MAX_PENDING: 동시에 제출 가능한 최대 작업 수 (기본: 워커 수 × 4)
+    COMPUTE_QUEUE_TIMEOUT: 슬롯을 기다리는 최대 시간 (초, 기본 2)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class ComputeSaturatedError(Exception):
+    """실행기가 포화 상태라 작업을 받을 수 없음"""
+
+
+def init_compute_worker() -> None:
+    """워커 초기화: 무거운 라이브러리 import 및 모델 로드"""
+    import rdkit.Chem.AllChem  # noqa: F401
+
+    import ml.conformers  # noqa: F401
+    from ml.model_registry import registry
+    import routers.admet  # noqa: F401
+    from services.catalog import get_catalog
+
+    registry.warmup()
+    get_catalog()
+
+
+# 이 워커가 마지막으로 보낸 모델 통계 버전 (워커 프로세스 안에서만 사용)
+_reported_revision: Optional[int] = None
+
+
+def _model_stats_update() -> Optional[dict]:
+    """마지막 보고 이후 바뀐 경우에만 모델 레지스트리 통계 (레지스트리를 import하지 않은 워커는 None)"""
+    global _reported_revision
+    model_registry = sys.modules.get("ml.model_registry")
+    if model_registry is None or model_registry.registry.revision == _reported_revision:
+        return None
+    _reported_revision = model_registry.registry.revision
+    return model_registry.registry.stats_snapshot()
+
+
+def call_in_worker(func: Callable, args: Tuple) -> Tuple[int, Optional[dict], Any]:
+    """
+    워커에서 func(*args) 실행
+
+    Returns:
+        (워커 pid, 바뀐 모델 통계 또는 None, func의 반환값)
+    """
+    result = func(*args)
+    return os.getpid(), _model_stats_update(), result
+
+
+def unpack_reply(reply: Tuple[int, Optional[dict], Any], model_stats: Dict[int, dict]) -> Any:
+    """call_in_worker 결과의 모델 통계를 model_stats(pid → 통계)에 반영하고 func의 반환값 반환"""
+    pid, update, result = reply
+    if update is not None:
+        model_stats[pid] = update
+    return result
+
+
+def _ready() -> int:
+    """워커 기동 확인용 작업"""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+class ComputeExecutor:
+    """backpressure가 있는 프로세스 풀 실행기"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        queue_timeout: float = 2.0,
+    ):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        # 워커 pid → 최신 모델 통계 (ModelRegistry.stats_snapshot)
+        self.worker_model_stats: Dict[int, dict] = {}
+        self.configure(max_workers, max_pending, queue_timeout)
+
+    def configure(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        queue_timeout: float = 2.0,
+    ) -> None:
+        """풀 크기/대기 한도 설정 (start() 전에 호출)"""
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_pending = max_pending or max(1, self.max_workers * 4)
+        self.queue_timeout = queue_timeout
+
+    def configure_from_env(self) -> None:
+        workers = os.getenv("COMPUTE_WORKERS")
+        pending = os.getenv("COMPUTE_MAX_PENDING")
+        self.configure(
+            max_workers=int(workers) if workers else None,
+            max_pending=int(pending) if pending else None,
+            queue_timeout=float(os.getenv("COMPUTE_QUEUE_TIMEOUT", "2")),
+        )
+
+    @property
+    def inline(self) -> bool:
+        """워커 없이 호출한 곳에서 직접 실행하는 모드"""
+        return self._pool is None
+
+    async def start(self) -> None:
+        """워커 프로세스를 띄우고 초기화가 끝날 때까지 대기"""
+        if self.max_workers <= 0:
+            return
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_compute_worker,
+        )
+        # 첫 요청이 워커 기동 비용을 내지 않도록 모든 워커를 미리 띄움
+        # (워밍업에서 로드한 모델 통계도 이때 받음)
+        loop = asyncio.get_running_loop()
+        replies = await asyncio.gather(
+            *(loop.run_in_executor(self._pool, call_in_worker, _ready, ()) for _ in range(self.max_workers))
+        )
+        for reply in replies:
+            unpack_reply(reply, self.worker_model_stats)
+
+    async def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.worker_model_stats.clear()
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        워커 프로세스에서 func(*args) 실행 (inline 모드면 직접 실행)
+
+        Args:
+            func: pickle 가능한 모듈 수준 함수
+            args: pickle 가능한 인자
+
+        Returns:
+            func의 반환값
+
+        Raises:
+            ComputeSaturatedError: queue_timeout 안에 슬롯을 얻지 못한 경우
+        """
+        if self._pool is None:
+            return func(*args)
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ComputeSaturatedError(
+                f"계산 워커가 포화 상태입니다 (처리 중 {self.in_flight}/{self.max_pending})"
+            ) from None
+
+        self.in_flight += 1
+        try:
+            reply = await asyncio.get_running_loop().run_in_executor(self._pool, call_in_worker, func, args)
+            return unpack_reply(reply, self.worker_model_stats)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "mode": "inline" if self.inline else "process_pool",
+            "workers": self.max_workers if not self.inline else 0,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+# 전역 실행기 (애플리케이션 시작 시 설정/기동, 그 전에는 inline 모드로 동작)
+compute = ComputeExecutor(max_workers=0)
+
+
+async def start_compute_executor() -> ComputeExecutor:
+    compute.configure_from_env()
+    await compute.start()
+    return compute
+
+
+async def stop_compute_executor() -> None:
+    await compute.stop()
@@ -0,0 +1,253 @@
+"""
+HTTP 캐시 검증자 (ETag, Cache-Control, 조건부 GET) + 응답 압축 협상
+
+입력과 계산 버전만으로 결과가 정해지는 엔드포인트(속성, 3D SDF)는 계산 전에
+ETag를 만들 수 있으므로, If-None-Match가 맞으면 계산 없이 304를 돌려준다.
+
+    encoding, etag = negotiate_representation(strong_etag("properties", ...), accept_encoding)
+    headers = cache_headers(etag)
+    if etag_matches(if_none_match, etag):
+        return not_modified(headers)
+    ...
+    return encoded_response(body, "application/json", encoding, headers)
+
+압축된 표현은 바이트가 다르므로 strong ETag 뒤에 "-br"/"-gzip"을 붙인다. 304도
+클라이언트가 가진 표현의 ETag를 그대로 돌려줘야 하므로, ETag를 쓰는 엔드포인트는
+본문을 만들기 전에 압축 방식을 정하고 (negotiate_representation) 그 표현의 ETag로
+비교/응답한 뒤 직접 압축한다 (encoded_response).
+
+CompressionMiddleware는 그 밖의 큰 JSON/SDF 응답(Content-Encoding이 없는 응답)을
+Accept-Encoding에 따라 br(brotli 설치 시) 또는 gzip으로 압축한다.
+스트리밍 응답(본문이 여러 조각)은 그대로 전달한다.
+
+환경변수:
+    HTTP_CACHE_MAX_AGE: 결정적 응답의 Cache-Control max-age (초, 기본 3600)
+    COMPRESS_MIN_BYTES: CompressionMiddleware가 이보다 작은 응답은 압축하지 않음 (기본 1024)
+"""
+
+import gzip
+import hashlib
+import os
+from typing import Optional, Tuple
+
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+# 압축할 Content-Type (파라미터 제외)
+COMPRESSIBLE_TYPES = ("application/json", "chemical/x-mdl-sdfile", "text/plain", "text/csv")
+
+# 압축 강도 (응답 지연 대비 압축률 절충)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def default_max_age() -> int:
+    return int(os.getenv("HTTP_CACHE_MAX_AGE", "3600"))
+
+
+def strong_etag(*parts) -> str:
+    """
+    입력 값들로 strong ETag 생성
+
+    Args:
+        *parts: 응답을 결정하는 값 (canonical SMILES, 계산/모델 버전, 옵션 등)
+
+    Returns:
+        따옴표로 감싼 ETag (예: "3f2a...")
+    """
+    digest = hashlib.blake2b("\x1f".join(str(part) for part in parts).encode("utf-8"), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    """W/ 접두사를 뗀 ETag (If-None-Match는 약한 비교)"""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag (응답할 표현의 ETag)와 맞는지"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque_tag(tag) == _opaque_tag(etag) for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str, max_age: Optional[int] = None) -> dict:
+    """
+    캐시 헤더 (ETag, Cache-Control, Vary)
+
+    Args:
+        etag: 응답할 표현의 ETag (negotiate_representation() 결과)
+        max_age: 캐시 유효 시간 (초, 생략 시 HTTP_CACHE_MAX_AGE, 0이면 매번 재검증)
+    """
+    max_age = default_max_age() if max_age is None else max_age
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+
+def not_modified(headers: dict) -> Response:
+    """304 Not Modified (본문 없음, 캐시 헤더 유지)"""
+    return Response(status_code=304, headers=headers)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Accept-Encoding에서 사용할 압축 선택
+
+    Returns:
+        "br" (brotli 설치 시), "gzip" 또는 None (압축 안 함). q값이 같으면 br 우선.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """압축 표현의 strong ETag ("abc" → "abc-gzip")"""
+    if not encoding or not etag.endswith('"') or etag.startswith("W/"):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def negotiate_representation(
+    etag: str, accept_encoding: Optional[str], encoding: Optional[str] = None
+) -> Tuple[Optional[str], str]:
+    """
+    응답할 표현 (압축 방식과 그 ETag)을 본문을 만들기 전에 결정
+
+    Args:
+        etag: 압축 전 본문의 strong ETag
+        accept_encoding: 요청 Accept-Encoding 헤더
+        encoding: 협상과 상관없이 사용할 압축 방식 (예: ?compress=true → "gzip")
+
+    Returns:
+        (압축 방식 또는 None, 그 표현의 ETag) - 200과 304 모두 이 ETag를 사용
+    """
+    if encoding is None:
+        encoding = negotiate_encoding(accept_encoding)
+    return encoding, encoded_etag(etag, encoding)
+
+
+def encoded_response(body: bytes, media_type: str, encoding: Optional[str], headers: dict) -> Response:
+    """negotiate_representation()으로 정한 방식으로 압축한 응답 (미들웨어는 다시 압축하지 않음)"""
+    if encoding is not None:
+        body = compress(body, encoding)
+        headers = {**headers, "Content-Encoding": encoding}
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding 협상 응답 압축 ASGI 미들웨어 (br / gzip)
+
+    한 번에 전송되는 응답 본문만 압축한다. 이미 Content-Encoding이 있는 응답
+    (예: 캐시된 gzip SDF), 작은 응답, 압축 대상이 아닌 Content-Type은 그대로 둔다.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = int(os.getenv("COMPRESS_MIN_BYTES", "1024")) if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+        encoding = negotiate_encoding(accept)
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = {name.lower(): value for name, value in start_message["headers"]}
+            content_type = headers.get(b"content-type", b"").split(b";")[0].strip().decode("latin-1")
+            eligible = (
+                content_type in COMPRESSIBLE_TYPES
+                and b"content-encoding" not in headers
+                and start_message["status"] == 200
+            )
+            # 스트리밍 응답이거나 대상이 아니면 그대로 전달
+            if not eligible or message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                if eligible and len(body) >= self.minimum_size:
+                    start_message = _with_vary(start_message)
+                await send(start_message)
+                await send(message)
+                return
+
+            start_message = _with_vary(start_message)
+            if encoding is not None:
+                body = compress(body, encoding)
+                raw = [(name, value) for name, value in start_message["headers"]
+                       if name.lower() not in (b"content-length", b"etag")]
+                raw.append((b"content-encoding", encoding.encode("latin-1")))
+                raw.append((b"content-length", str(len(body)).encode("latin-1")))
+                if b"etag" in headers:
+                    raw.append((b"etag", encoded_etag(headers[b"etag"].decode("latin-1"), encoding).encode("latin-1")))
+                start_message = {**start_message, "headers": raw}
+            passthrough = True
+            await send(start_message)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _with_vary(start_message: dict) -> dict:
+    """압축 여부가 Accept-Encoding에 따라 달라지는 응답에 Vary 추가 (중복 없이)"""
+    headers = list(start_message["headers"])
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[i] = (name, value + b", Accept-Encoding")
+            break
+    else:
+        headers.append((b"vary", b"Accept-Encoding"))
+    return {**start_message, "headers": headers}
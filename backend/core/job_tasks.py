@@ -0,0 +1,65 @@
+"""
+작업 큐 워커 함수 (프로세스 풀에서 실행)
+
+각 함수는 작업의 한 청크를 처리하며, 인자와 반환값은 pickle 가능한
+기본 타입(또는 NumPy 배열로만 이루어진 MoleculeBatch)이어야 한다.
+"""
+
+from typing import List, Optional
+
+
+def init_worker() -> None:
+    """워커 프로세스 초기화: 무거운 모듈을 미리 import"""
+    import ml.admet_predictor  # noqa: F401
+    import ml.generator  # noqa: F401
+    import services.admet  # noqa: F401
+    import services.generation  # noqa: F401
+
+
+def generation_chunk(
+    target_disease: str,
+    num_molecules: int,
+    constraints: Optional[dict],
+    start_index: int,
+    seed: int,
+) -> dict:
+    """
+    분자 생성 청크 (난수는 요청 시드 + 청크 시작 위치에서 유도)
+
+    Returns:
+        {"molecules": MoleculeBatch, "stats": 생성 통계 dict}
+        (분자별 dict 대신 배열로 반환해 프로세스 간 전송량을 줄임)
+    """
+    from services.generation import generate
+
+    molecules, stats = generate(target_disease, num_molecules, constraints, seed, start_index)
+    return {"molecules": molecules, "stats": stats.to_dict()}
+
+
+def admet_chunk(smiles_list: List[str], start_index: int) -> List[dict]:
+    """
+    배치 ADMET 예측 청크
+
+    Returns:
+        ADMETBatchItem dict 리스트 (index는 전체 요청 기준)
+    """
+    from services.admet import predict_many
+
+    items = predict_many(smiles_list)["results"]
+    for item in items:
+        item["index"] += start_index
+    return items
+
+
+def catalog_import_chunk(source: str, output: str, options: dict, stop_offset: Optional[int]) -> dict:
+    """
+    카탈로그 가져오기 한 단계 (stop_offset까지 읽고 체크포인트 저장, None이면 끝까지 읽고 저장소 기록)
+
+    각 단계는 이전 단계가 남긴 체크포인트에서 이어서 읽는다.
+
+    Returns:
+        ingest_file() 결과 dict
+    """
+    from database.ingest import IngestOptions, ingest_file
+
+    return ingest_file(source, output, IngestOptions(**options), stop_offset=stop_offset)
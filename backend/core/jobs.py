@@ -0,0 +1,392 @@
+"""
+비동기 작업 큐 (대량 분자 생성 / 배치 ADMET 스크리닝)
+
+작업은 청크 단위로 나뉘어 제한된 크기의 프로세스 풀에서 실행된다.
+청크 사이마다 진행률을 기록하고 취소 요청을 확인한다. 작업 상태와 결과는
+SQLite에 저장되며 기본값은 프로세스 내 메모리 DB라 Redis 없이 동작한다.
+
+여러 웹 워커(serve.py)가 같은 SQLite 파일을 쓰면 어느 워커로 온 요청이든
+작업 상태/결과 조회와 취소가 가능하다. 작업은 제출받은 워커(owner)가 실행하고,
+취소 요청은 저장소의 플래그로 전달된다. 재시작 시 실패 처리는 자기 owner의
+미완료 작업에만 적용한다.
+
+환경변수:
+    JOB_WORKERS: 프로세스 풀 크기 = 동시에 실행되는 작업 수 (기본: CPU 수 - 1, 최소 1)
+    JOB_QUEUE_MAX: 대기열 최대 작업 수 (초과 시 제출 거부, 기본 100)
+    JOB_DB_PATH: 작업 저장 SQLite 파일 경로 (비우면 메모리)
+    JOB_RESULT_TTL: 종료된 작업 보관 시간 (초, 기본 3600)
+    JOB_WORKER_ID: 작업 owner (serve.py가 워커 슬롯 번호로 설정, 기본 "0")
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .executor import call_in_worker, unpack_reply
+from .job_tasks import init_worker
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+# 대기/실행 시간 통계에 사용하는 최근 작업 수
+TIMING_WINDOW = 1000
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+
+@dataclass
+class JobChunk:
+    """프로세스 풀에서 실행할 작업 한 조각"""
+
+    func: Callable
+    args: Tuple
+    num_items: int
+
+
+@dataclass
+class JobSpec:
+    """작업 정의: 청크 목록과 청크 결과 병합 함수"""
+
+    job_type: str
+    chunks: List[JobChunk]
+    combine: Callable[[List[Any]], Any]
+
+    @property
+    def num_items(self) -> int:
+        return sum(chunk.num_items for chunk in self.chunks)
+
+
+class JobStore:
+    """SQLite 작업 저장소 (기본: 프로세스 내 메모리 DB)"""
+
+    _COLUMNS = (
+        "id", "type", "status", "created_at", "started_at", "finished_at",
+        "items_done", "items_total", "error", "cancel_requested",
+    )
+
+    def __init__(self, path: Optional[str] = None, owner: str = "0", recover: bool = True):
+        """
+        Args:
+            path: SQLite 파일 경로 (None이면 메모리 DB)
+            owner: 이 저장소로 만드는 작업의 owner (워커 식별자)
+            recover: owner가 같은 미완료 작업을 실패 처리 (이전 프로세스가 남긴 작업)
+        """
+        self.owner = owner
+        self._lock = threading.Lock()
+        # 파일 DB는 여러 워커 프로세스가 함께 쓰므로 잠금 대기 시간을 두고 WAL 모드 사용
+        self._db = sqlite3.connect(path or ":memory:", timeout=30, check_same_thread=False)
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, type TEXT NOT NULL, status TEXT NOT NULL, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+            "items_done INTEGER NOT NULL DEFAULT 0, items_total INTEGER NOT NULL, "
+            "error TEXT, result TEXT, owner TEXT NOT NULL DEFAULT '0', "
+            "cancel_requested INTEGER NOT NULL DEFAULT 0)"
+        )
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, definition in (("owner", "TEXT NOT NULL DEFAULT '0'"),
+                                   ("cancel_requested", "INTEGER NOT NULL DEFAULT 0")):
+            if column not in existing:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        self._db.commit()
+        if recover:
+            self.fail_unfinished(owner)
+
+    def fail_unfinished(self, owner: Optional[str] = None) -> int:
+        """
+        재시작 전에 끝나지 못한 작업을 실패 처리
+
+        Args:
+            owner: 이 owner의 작업만 (None이면 전체 - 모든 워커가 내려간 상태에서만 사용)
+
+        Returns:
+            실패 처리한 작업 수
+        """
+        query = "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)"
+        params = [FAILED, "서버 재시작으로 중단됨", time.time(), QUEUED, RUNNING]
+        if owner is not None:
+            query += " AND owner = ?"
+            params.append(owner)
+        with self._lock:
+            cursor = self._db.execute(query, params)
+            self._db.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def create(self, job_id: str, job_type: str, items_total: int) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, type, status, created_at, items_total, owner) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, QUEUED, time.time(), items_total, self.owner),
+            )
+            self._db.commit()
+
+    def transition(self, job_id: str, from_status: str, **fields) -> bool:
+        """
+        상태가 from_status일 때만 갱신 (다른 워커의 취소와 경쟁하지 않도록 조건부 UPDATE)
+
+        Returns:
+            갱신했으면 True
+        """
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            cursor = self._db.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status = ?",
+                (*fields.values(), job_id, from_status),
+            )
+            self._db.commit()
+        return cursor.rowcount == 1
+
+    def update(self, job_id: str, **fields) -> None:
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._db.commit()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(self._COLUMNS, row)) if row else None
+
+    def result(self, job_id: str) -> Any:
+        with self._lock:
+            row = self._db.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def purge_finished(self, older_than: float) -> int:
+        with self._lock:
+            cursor = self._db.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED_STATUSES))}) "
+                "AND finished_at < ?",
+                (*FINISHED_STATUSES, older_than),
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+
+def _percentiles(values) -> Optional[dict]:
+    if not values:
+        return None
+    import numpy as np
+
+    p50, p95, p99 = np.percentile(np.asarray(values), [50, 95, 99])
+    return {"avg": round(float(np.mean(values)), 4), "p50": round(float(p50), 4),
+            "p95": round(float(p95), 4), "p99": round(float(p99), 4)}
+
+
+class JobManager:
+    """제한된 프로세스 풀 위의 작업 큐"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queued: int = 100,
+        store: Optional[JobStore] = None,
+        result_ttl: float = 3600,
+    ):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.store = store or JobStore()
+
+        self._specs: Dict[str, JobSpec] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._runners: List[asyncio.Task] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # 워커 pid → 최신 ADMET 모델 통계 (배치 ADMET 작업의 추론)
+        self.worker_model_stats: Dict[int, dict] = {}
+        self._wait_times = deque(maxlen=TIMING_WINDOW)
+        self._run_times = deque(maxlen=TIMING_WINDOW)
+        self._running = 0
+
+    @classmethod
+    def from_env(cls) -> "JobManager":
+        workers = os.getenv("JOB_WORKERS")
+        return cls(
+            max_workers=int(workers) if workers else None,
+            max_queued=int(os.getenv("JOB_QUEUE_MAX", "100")),
+            store=JobStore(os.getenv("JOB_DB_PATH") or None, owner=os.getenv("JOB_WORKER_ID", "0")),
+            result_ttl=float(os.getenv("JOB_RESULT_TTL", "3600")),
+        )
+
+    async def start(self) -> None:
+        """프로세스 풀과 작업 실행 태스크 시작"""
+        self._queue = asyncio.Queue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+        self._runners = [asyncio.create_task(self._runner()) for _ in range(self.max_workers)]
+
+    async def stop(self) -> None:
+        """실행 태스크 취소 및 프로세스 풀 종료"""
+        for task in self._runners:
+            task.cancel()
+        await asyncio.gather(*self._runners, return_exceptions=True)
+        self._runners = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.worker_model_stats.clear()
+        self.store.close()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, spec: JobSpec) -> str:
+        """
+        작업 제출
+
+        Args:
+            spec: 작업 정의
+
+        Returns:
+            작업 ID
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        if self._queue is None:
+            raise RuntimeError("JobManager가 시작되지 않았습니다")
+        if self.queue_depth >= self.max_queued:
+            raise QueueFullError(f"작업 대기열이 가득 찼습니다 (최대 {self.max_queued})")
+
+        self.store.purge_finished(time.time() - self.result_ttl)
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, spec.job_type, spec.num_items)
+        self._specs[job_id] = spec
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        작업 취소 요청 (대기 중이면 즉시, 실행 중이면 현재 청크가 끝난 뒤 취소)
+
+        다른 워커가 가진 작업도 취소할 수 있다 (저장소 상태/플래그를 실행 워커가 확인).
+
+        Returns:
+            갱신된 작업 상태 (없는 작업이면 None)
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        if job["status"] == QUEUED and self.store.transition(
+            job_id, QUEUED, status=CANCELLED, finished_at=time.time()
+        ):
+            self._specs.pop(job_id, None)
+        elif job["status"] in (QUEUED, RUNNING):
+            # 대기 → 실행으로 막 바뀐 경우 포함
+            self.store.update(job_id, cancel_requested=1)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """작업 상태 (진행률 포함)"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        job["progress"] = round(job["items_done"] / job["items_total"], 4) if job["items_total"] else 1.0
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def result(self, job_id: str) -> Any:
+        return self.store.result(job_id)
+
+    def stats(self) -> dict:
+        """워커 크기 산정용 통계: 대기열 길이, 대기/실행 시간 분포"""
+        return {
+            "workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "max_queued": self.max_queued,
+            "running": self._running,
+            "jobs_by_status": self.store.count_by_status(),
+            "wait_time_seconds": _percentiles(self._wait_times),
+            "run_time_seconds": _percentiles(self._run_times),
+        }
+
+    async def _runner(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            spec = self._specs.pop(job_id, None)
+            if spec is None:
+                continue  # 대기 중에 취소됨
+            self._running += 1
+            try:
+                await self._run(job_id, spec)
+            finally:
+                self._running -= 1
+
+    async def _run(self, job_id: str, spec: JobSpec) -> None:
+        loop = asyncio.get_running_loop()
+        started_at = time.time()
+        # 대기 중에 다른 워커에서 취소됐으면 실행하지 않음
+        if not self.store.transition(job_id, QUEUED, status=RUNNING, started_at=started_at):
+            return
+        job = self.store.get(job_id)
+        self._wait_times.append(started_at - job["created_at"])
+
+        results, items_done = [], 0
+        try:
+            for chunk in spec.chunks:
+                if self.store.get(job_id)["cancel_requested"]:
+                    self.store.update(job_id, status=CANCELLED, finished_at=time.time())
+                    return
+                reply = await loop.run_in_executor(self._pool, call_in_worker, chunk.func, chunk.args)
+                results.append(unpack_reply(reply, self.worker_model_stats))
+                items_done += chunk.num_items
+                self.store.update(job_id, items_done=items_done)
+            self.store.update(
+                job_id, status=COMPLETED, finished_at=time.time(), result=spec.combine(results)
+            )
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, finished_at=time.time(), error=str(e))
+        finally:
+            self._run_times.append(time.time() - started_at)
+
+
+# 애플리케이션 시작 시 생성되는 전역 작업 관리자
+job_manager: Optional[JobManager] = None
+
+
+async def start_job_manager() -> JobManager:
+    global job_manager
+    job_manager = JobManager.from_env()
+    await job_manager.start()
+    return job_manager
+
+
+async def stop_job_manager() -> None:
+    global job_manager
+    if job_manager is not None:
+        await job_manager.stop()
+        job_manager = None
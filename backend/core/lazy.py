@@ -0,0 +1,65 @@
+"""
+무거운 모듈(RDKit, numpy 기반 ml/database 모듈) 지연 import
+
+라우터가 모듈 수준에서 lazy_module()로 참조만 만들어 두면, 실제 import는
+첫 속성 접근(첫 요청 또는 워밍업) 때 일어난다. 덕분에 앱 import와 /health
+응답이 화학 라이브러리 로딩을 기다리지 않는다.
+
+프로덕션 런처(serve.py)는 fork 전에 부모에서 preload()로 전부 import하므로
+워커는 이미 로드된 모듈을 copy-on-write로 공유한다.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+# 지연 import 대상 (preload()가 미리 로드하는 목록)
+HEAVY_MODULES = (
+    "ml.chem",
+    "ml.admet_predictor",
+    "ml.model_registry",
+    "ml.conformers",
+    "ml.descriptors",
+    "ml.diversity",
+    "ml.fingerprint_index",
+    "ml.generator",
+    "ml.molecule_batch",
+    "ml.ranking",
+    "ml.seeding",
+    "ml.segmented_index",
+    "ml.substructure_index",
+    "database.compound_store",
+    "database.ingest",
+)
+
+
+def lazy_module(name: str) -> ModuleType:
+    """
+    첫 속성 접근 시 로드되는 모듈 반환 (이미 로드된 경우 그대로 반환)
+
+    Args:
+        name: 모듈 이름 (예: "ml.chem")
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def load(name: str) -> ModuleType:
+    """모듈을 실제로 로드 (지연 모듈이면 첫 속성 접근으로 실행시킴)"""
+    module = importlib.import_module(name)
+    getattr(module, "__file__")
+    return module
+
+
+def preload() -> None:
+    """무거운 모듈을 모두 실제로 로드 (fork 전 부모 프로세스 / 워밍업용)"""
+    for name in HEAVY_MODULES:
+        load(name)
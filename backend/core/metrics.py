@@ -0,0 +1,327 @@
+"""
+요청/단계별 성능 계측 및 Prometheus 텍스트 포맷 출력
+
+- TimingMiddleware: 라우트 템플릿별 요청 지연시간 히스토그램, 처리 중 요청 게이지
+- timed_stage: 요청 안의 단계(parse, descriptor, inference, serialization 등) 시간 측정
+- BATCH_*: micro-batcher 배치 크기/대기 시간 히스토그램, single-flight 병합 수
+- render_metrics: /metrics 응답 본문 (캐시/계산 풀 상태는 수집 시점에 읽음)
+
+외부 의존성 없이 Prometheus text exposition format 0.0.4를 직접 출력한다.
+"""
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 지연시간 버킷 상한 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# micro-batch 크기 버킷 (키 수) / 대기열 지연 버킷 (초)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_DELAY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+# 현재 요청의 ASGI scope (단계 측정 시 라우트 템플릿을 읽기 위함)
+current_scope: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("current_scope", default=None)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """라벨별 누적 버킷 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, List] = {}  # labels -> [버킷별 카운트, 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class Counter:
+    """라벨별 단조 증가 카운터 (collect: 수집 시점에 더할 외부 카운터 값)"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str],
+        collect: Optional[Callable[[], Dict[Labels, float]]] = None,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.collect = collect
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def values(self) -> Dict[Labels, float]:
+        with self._lock:
+            values = dict(self._values)
+        if self.collect is not None:
+            for labels, value in self.collect().items():
+                values[labels] = values.get(labels, 0) + value
+        return values
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        snapshot = sorted(self.values().items())
+        lines.extend(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in snapshot)
+        return lines
+
+
+class Gauge:
+    """라벨별 현재값 게이지 (inc/dec 또는 수집 시점 콜백)"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        collect: Optional[Callable[[], Dict[Labels, float]]] = None,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.collect = collect
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        if self.collect is not None:
+            values = self.collect()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            if value is None:
+                continue
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+def _cache_stats() -> Dict[str, dict]:
+    from core.cache import prediction_cache
+
+    return {"prediction": prediction_cache.stats()}
+
+
+def _collect_cache_lookups() -> Dict[Labels, float]:
+    values = {}
+    for name, stats in _cache_stats().items():
+        values[(name, "hit")] = stats["hits"]
+        values[(name, "miss")] = stats["misses"]
+    return values
+
+
+def _collect_cache_ratio() -> Dict[Labels, float]:
+    lookups: Dict[str, List[float]] = {}
+    for (cache, result), value in CACHE_LOOKUPS.values().items():
+        lookups.setdefault(cache, [0, 0])[result == "miss"] += value
+    return {(cache,): hits / (hits + misses) for cache, (hits, misses) in lookups.items() if hits + misses}
+
+
+def _collect_compute_in_flight() -> Dict[Labels, float]:
+    from core.executor import compute
+
+    return {(): compute.stats()["in_flight"]}
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency (until the last response byte) by route template",
+    ("method", "route", "status"),
+)
+STAGE_LATENCY = Histogram(
+    "request_stage_duration_seconds",
+    "Latency of instrumented stages inside a request",
+    ("route", "stage"),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed",
+    ("method",),
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ("cache", "result"),
+    collect=_collect_cache_lookups,
+)
+CACHE_HIT_RATIO = Gauge(
+    "cache_hit_ratio",
+    "Cache hit ratio since process start",
+    ("cache",),
+    collect=_collect_cache_ratio,
+)
+COMPUTE_IN_FLIGHT = Gauge(
+    "compute_tasks_in_flight",
+    "Tasks currently dispatched to the compute process pool",
+    collect=_collect_compute_in_flight,
+)
+BATCH_SIZE = Histogram(
+    "microbatch_size",
+    "Keys processed per micro-batch (after single-flight coalescing)",
+    ("batcher",),
+    buckets=BATCH_SIZE_BUCKETS,
+)
+BATCH_QUEUE_DELAY = Histogram(
+    "microbatch_queue_delay_seconds",
+    "Time a key waited in the micro-batch queue before its batch started",
+    ("batcher",),
+    buckets=QUEUE_DELAY_BUCKETS,
+)
+BATCH_COALESCED = Counter(
+    "microbatch_coalesced_total",
+    "Requests that joined an identical in-flight key instead of being scored again",
+    ("batcher",),
+)
+
+METRICS = (
+    REQUEST_LATENCY,
+    STAGE_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    CACHE_LOOKUPS,
+    CACHE_HIT_RATIO,
+    COMPUTE_IN_FLIGHT,
+    BATCH_SIZE,
+    BATCH_QUEUE_DELAY,
+    BATCH_COALESCED,
+)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """
+    요청 안의 한 단계 시간 측정 (현재 라우트 라벨로 기록)
+
+    Args:
+        stage: 단계 이름 (parse, descriptor, inference, serialization 등)
+
+    Example:
+        with timed_stage("inference"):
+            result = await compute.run(score_smiles, [smiles])
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        scope = current_scope.get()
+        route = _route_template(scope) if scope is not None else "none"
+        STAGE_LATENCY.observe(time.perf_counter() - start, route, stage)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """캐시 조회 결과 기록 (PredictionCache 외 캐시용)"""
+    CACHE_LOOKUPS.inc(cache, "hit" if hit else "miss")
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition format 본문"""
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _route_template(scope: dict) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class TimingMiddleware:
+    """
+    요청 지연시간 측정 ASGI 미들웨어
+
+    마지막 응답 바이트 전송 시점까지 측정하므로 스트리밍 응답도 전체 시간이
+    기록된다. 라우트 라벨은 실제 경로가 아닌 템플릿(/api/v1/molecules/{smiles}/sdf)
+    이라 라벨 수가 라우트 수로 제한된다.
+    """
+
+    def __init__(self, app, profiler=None):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = ["500"]
+        start = time.perf_counter()
+        start_wall = time.time()
+        token = current_scope.set(scope)
+        REQUESTS_IN_FLIGHT.inc(method)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec(method)
+            route = _route_template(scope)
+            REQUEST_LATENCY.observe(elapsed, method, route, status[0])
+            current_scope.reset(token)
+            if self.profiler is not None:
+                self.profiler.maybe_dump(method, route, start_wall, elapsed)
@@ -0,0 +1,132 @@
+"""
+느린 요청용 샘플링 프로파일러 (opt-in)
+
+백그라운드 스레드가 이벤트 루프 스레드의 콜 스택을 주기적으로 샘플링해
+링 버퍼에 쌓아 두고, 임계값보다 오래 걸린 요청이 끝나면 그 요청 구간의
+샘플을 flame graph용 collapsed stack 포맷("a;b;c 개수")으로 파일에 쓴다.
+(flamegraph.pl, speedscope, inferno 등에서 바로 열 수 있음)
+요청 경로에서는 저장 요청만 큐에 넣고, 샘플 집계와 파일 쓰기는 샘플러 스레드가
+하므로 프로파일링이 요청에 디스크 지연을 더하지 않는다.
+
+계산 워커 프로세스 안의 시간은 샘플링 대상이 아니므로 /metrics의 단계별
+히스토그램과 함께 본다.
+
+환경변수:
+    PROFILE_SLOW_MS: 이 시간(ms)보다 느린 요청의 프로파일 저장 (미설정 시 비활성)
+    PROFILE_INTERVAL_MS: 샘플링 간격 (기본 5ms)
+    PROFILE_DIR: 저장 디렉토리 (기본: 임시 디렉토리/ai-drug-discovery/profiles)
+"""
+
+import collections
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+# 링 버퍼에 보관할 최대 샘플 수 (5ms 간격이면 약 5분)
+MAX_SAMPLES = 60_000
+
+
+def _folded_stack(frame) -> str:
+    """프레임 체인을 root;...;leaf 문자열로 변환"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """이벤트 루프 스레드 스택 샘플러"""
+
+    def __init__(self, slow_ms: float, interval_ms: float = 5.0, output_dir: Optional[str] = None):
+        self.slow_seconds = slow_ms / 1000
+        self.interval = interval_ms / 1000
+        self.output_dir = Path(output_dir or Path(tempfile.gettempdir()) / "ai-drug-discovery" / "profiles")
+        self._samples: Deque[Tuple[float, str]] = collections.deque(maxlen=MAX_SAMPLES)
+        # (요청 시작 시각, 끝 시각, 저장 경로) - 샘플러 스레드가 처리
+        self._pending: "queue.SimpleQueue[Tuple[float, float, Path]]" = queue.SimpleQueue()
+        self._target_thread: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dumps = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["SamplingProfiler"]:
+        """PROFILE_SLOW_MS가 설정된 경우에만 생성"""
+        slow_ms = os.getenv("PROFILE_SLOW_MS")
+        if not slow_ms:
+            return None
+        return cls(
+            slow_ms=float(slow_ms),
+            interval_ms=float(os.getenv("PROFILE_INTERVAL_MS", "5")),
+            output_dir=os.getenv("PROFILE_DIR"),
+        )
+
+    def start(self) -> None:
+        """현재 스레드(이벤트 루프)를 대상으로 샘플링 시작"""
+        if self._thread is not None:
+            return
+        self._target_thread = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is not None:
+                self._samples.append((time.time(), _folded_stack(frame)))
+            self._write_pending()
+        self._write_pending()
+
+    def _write_pending(self) -> None:
+        """큐에 쌓인 저장 요청 처리 (샘플러 스레드)"""
+        while True:
+            try:
+                start, end, path = self._pending.get_nowait()
+            except queue.Empty:
+                return
+            counts: Dict[str, int] = collections.Counter(
+                stack for timestamp, stack in list(self._samples) if start <= timestamp <= end
+            )
+            if not counts:
+                continue
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text("".join(f"{stack} {count}\n" for stack, count in counts.items()))
+            self.dumps += 1
+
+    def maybe_dump(self, method: str, route: str, start: float, elapsed: float) -> Optional[Path]:
+        """
+        느린 요청이면 요청 구간 샘플을 collapsed stack 파일로 저장하도록 예약
+
+        집계와 파일 쓰기는 샘플러 스레드가 다음 샘플 뒤에 수행한다. 동시에 처리 중이던
+        다른 요청의 샘플도 같은 스레드에서 나온 것이므로 함께 포함된다.
+
+        Args:
+            method: HTTP 메서드
+            route: 라우트 템플릿
+            start: 요청 시작 시각 (time.time())
+            elapsed: 요청 처리 시간 (초)
+
+        Returns:
+            저장될 파일 경로 (느리지 않으면 None, 구간에 샘플이 없으면 파일을 만들지 않음)
+        """
+        if self._thread is None or elapsed < self.slow_seconds:
+            return None
+        slug = route.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+        path = self.output_dir / f"{int(start * 1000)}-{method}-{slug}-{int(elapsed * 1000)}ms.folded"
+        self._pending.put((start, start + elapsed, path))
+        return path
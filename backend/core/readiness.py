@@ -0,0 +1,50 @@
+"""
+준비 상태(readiness) 추적
+
+/health(liveness)는 프로세스가 살아 있으면 항상 200이고, /ready는 기동 시
+워밍업 단계(모듈 로드, 모델 로드, 카탈로그, 계산 풀)가 모두 끝나야 200을
+반환한다. 로드밸런서는 /ready로 트래픽 투입 시점을 판단한다.
+"""
+
+import time
+from typing import Dict, Optional
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+class Readiness:
+    """단계별 준비 상태"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+        self._checks: Dict[str, dict] = {}
+
+    def register(self, *names: str) -> None:
+        for name in names:
+            self._checks.setdefault(name, {"status": PENDING})
+
+    def mark_ready(self, name: str) -> None:
+        self._checks[name] = {"status": READY, "seconds": round(time.time() - self.started_at, 3)}
+        if self.is_ready and self.ready_at is None:
+            self.ready_at = time.time()
+
+    def mark_failed(self, name: str, error: str) -> None:
+        self._checks[name] = {"status": FAILED, "error": error}
+
+    @property
+    def is_ready(self) -> bool:
+        return all(check["status"] == READY for check in self._checks.values())
+
+    def snapshot(self) -> dict:
+        return {
+            "status": "ready" if self.is_ready else "starting",
+            "startup_seconds": round(self.ready_at - self.started_at, 3) if self.ready_at else None,
+            "checks": dict(self._checks),
+        }
+
+
+# 프로세스 전역 준비 상태
+readiness = Readiness()
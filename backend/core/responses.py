@@ -0,0 +1,35 @@
+"""
+빠른 JSON 응답 (orjson)
+
+서버가 직접 만든 데이터(모델 출력, 카탈로그 레코드)는 pydantic 모델로
+다시 검증할 필요가 없으므로, 라우터는 응답 스키마와 같은 모양의 dict를
+만들어 FastJSONResponse로 바로 반환한다. Response 객체를 반환하면 FastAPI가
+response_model 검증/변환을 건너뛰지만, 데코레이터의 response_model은
+그대로 OpenAPI 스키마에 쓰인다.
+
+orjson이 없으면 표준 json으로 직렬화한다.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes 직렬화 (numpy 스칼라/배열 지원은 orjson 사용 시에만)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """검증 없이 dict를 바로 직렬화하는 JSON 응답"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,3 @@
+"""
+데이터 저장소 모듈
+"""
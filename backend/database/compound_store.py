@@ -0,0 +1,489 @@
+"""
+메모리 매핑 컬럼형 화합물 저장소
+
+단일 바이너리 파일 레이아웃:
+    [8 bytes]  매직 "CMPDSTR1"
+    [8 bytes]  헤더 길이 (little-endian uint64)
+    [N bytes]  JSON 헤더 (레코드 수, 질환 목록, 컬럼별 dtype/offset/shape)
+    [...]      64바이트 정렬된 컬럼 데이터
+
+컬럼:
+    smiles_data / smiles_offsets      연결된 UTF-8 SMILES 버퍼 + (n+1) 오프셋
+    name_data / name_offsets          연결된 이름 버퍼 + 오프셋
+    molecular_weight, logp, tpsa,
+    hbd, hba                          float32 기술자 컬럼
+    disease_rows / disease_offsets    질환별 레코드 행 번호 (CSR 인덱스, 행 번호 오름차순)
+    <기술자>_order / <기술자>_sorted   기술자별 정렬 인덱스 (행 번호 순열 + 정렬된 값)
+    fp_words / fp_counts / fp_ids     popcount 정렬된 Morgan fingerprint (유사성 검색용)
+    ss_words                          행 순서 pattern fingerprint (부분구조 검색 사전 선별용)
+
+모든 컬럼은 numpy.memmap(mode="r")으로 열리므로, 여러 uvicorn 워커가 같은
+페이지 캐시를 공유하고 시작 시간이 카탈로그 크기에 비례하지 않는다.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ml.chem import parse_smiles
+from ml.fingerprint_index import DEFAULT_N_BITS, DEFAULT_RADIUS, FingerprintIndex, morgan_fingerprints, popcount_rows
+from ml.substructure_index import DEFAULT_SCREEN_BITS, SubstructureIndex, pattern_fingerprints
+
+MAGIC = b"CMPDSTR1"
+FORMAT_VERSION = 3
+ALIGNMENT = 64
+
+DESCRIPTOR_COLUMNS = ("molecular_weight", "logp", "tpsa", "hbd", "hba")
+
+# 파일 안의 컬럼 순서
+COLUMN_ORDER = (
+    "smiles_data", "smiles_offsets", "name_data", "name_offsets",
+    *DESCRIPTOR_COLUMNS,
+    *(f"{name}_{suffix}" for name in DESCRIPTOR_COLUMNS for suffix in ("order", "sorted")),
+    "disease_rows", "disease_offsets",
+    "fp_words", "fp_counts", "fp_ids",
+    "ss_words",
+)
+
+
+def _encode_strings(values: Sequence[str]):
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def write_compound_store(
+    path: str,
+    records: Sequence[dict],
+    radius: int = DEFAULT_RADIUS,
+    n_bits: int = DEFAULT_N_BITS,
+    screen_bits: int = DEFAULT_SCREEN_BITS,
+) -> None:
+    """
+    화합물 레코드를 저장소 파일로 기록 (임시 파일에 쓴 뒤 원자적으로 교체)
+
+    Args:
+        path: 출력 파일 경로
+        records: name, smiles, molecular_weight, logp, tpsa, hbd, hba,
+            disease(선택) 키를 가진 dict 리스트
+        radius: Morgan fingerprint 반경
+        n_bits: Morgan fingerprint 비트 수
+        screen_bits: 부분구조 pattern fingerprint 비트 수
+    """
+    mols = [parse_smiles(r["smiles"]) for r in records]
+    chunk = {
+        "smiles": [r["smiles"] for r in records],
+        "name": [r["name"] for r in records],
+        "disease": [r.get("disease") for r in records],
+        **{name: np.array([r.get(name, 0) for r in records], dtype=np.float32) for name in DESCRIPTOR_COLUMNS},
+        "fp_words": morgan_fingerprints(mols, radius, n_bits),
+        "ss_words": pattern_fingerprints(mols, screen_bits),
+    }
+    write_compound_store_chunks(path, lambda: iter([chunk]), radius, n_bits, screen_bits)
+
+
+def write_compound_store_chunks(
+    path: str,
+    chunks: Callable[[], Iterable[dict]],
+    radius: int = DEFAULT_RADIUS,
+    n_bits: int = DEFAULT_N_BITS,
+    screen_bits: int = DEFAULT_SCREEN_BITS,
+) -> None:
+    """
+    청크 단위로 저장소 파일 기록 (대량 가져오기용, 임시 파일에 쓴 뒤 원자적으로 교체)
+
+    청크를 두 번 읽는다. 1차에서는 행 수만큼의 작은 배열(기술자, 질환 코드,
+    popcount, 문자열 길이)만 모아 정렬 인덱스와 파일 레이아웃을 정하고,
+    2차에서 문자열 버퍼와 fingerprint 행렬을 memmap에 바로 써 넣는다.
+    fingerprint 행렬 전체를 메모리에 올리지 않는다.
+
+    Args:
+        path: 출력 파일 경로
+        chunks: 호출할 때마다 같은 청크를 처음부터 내주는 함수. 청크는 smiles,
+            name, disease(값 또는 None) 리스트와 기술자 배열, fp_words
+            (Morgan, radius/n_bits와 같은 설정), ss_words (pattern) 행렬을 가진 dict
+        radius, n_bits, screen_bits: 헤더에 기록할 fingerprint 설정
+    """
+    # 1차: 행 단위 작은 배열
+    smiles_lengths, name_lengths, counts, chunk_codes = [], [], [], []
+    descriptors: Dict[str, list] = {name: [] for name in DESCRIPTOR_COLUMNS}
+    first_seen: Dict[str, int] = {}
+    for chunk in chunks():
+        smiles_lengths.append(np.diff(_encode_strings(chunk["smiles"])[1]))
+        name_lengths.append(np.diff(_encode_strings(chunk["name"])[1]))
+        for name in DESCRIPTOR_COLUMNS:
+            descriptors[name].append(np.asarray(chunk[name], dtype=np.float32))
+        chunk_codes.append(np.array(
+            [first_seen.setdefault(d, len(first_seen)) if d else -1 for d in chunk["disease"]], dtype=np.int64
+        ))
+        fp_words = np.asarray(chunk["fp_words"], dtype=np.uint64)
+        counts.append(popcount_rows(fp_words) if len(fp_words) else np.empty(0, dtype=np.int32))
+
+    diseases: List[str] = sorted(first_seen)
+    # 처음 나온 순서의 코드를 이름 정렬 순서 코드로 변환
+    remap = np.array([diseases.index(name) for name in first_seen] + [-1], dtype=np.int64)
+    codes = remap[np.concatenate(chunk_codes)] if chunk_codes else np.empty(0, dtype=np.int64)
+    num_records = len(codes)
+
+    columns: Dict[str, np.ndarray] = {}
+    streamed: Dict[str, Tuple[np.dtype, tuple]] = {}
+
+    def offsets_of(lengths: list) -> np.ndarray:
+        offsets = np.zeros(num_records + 1, dtype=np.int64)
+        if num_records:
+            np.cumsum(np.concatenate(lengths), out=offsets[1:])
+        return offsets
+
+    smiles_offsets, name_offsets = offsets_of(smiles_lengths), offsets_of(name_lengths)
+    streamed["smiles_data"] = (np.dtype(np.uint8), (int(smiles_offsets[-1]),))
+    columns["smiles_offsets"] = smiles_offsets
+    streamed["name_data"] = (np.dtype(np.uint8), (int(name_offsets[-1]),))
+    columns["name_offsets"] = name_offsets
+    for name in DESCRIPTOR_COLUMNS:
+        columns[name] = np.concatenate(descriptors[name]) if descriptors[name] else np.empty(0, dtype=np.float32)
+
+    for name in DESCRIPTOR_COLUMNS:
+        order = np.argsort(columns[name], kind="stable")
+        columns[f"{name}_order"], columns[f"{name}_sorted"] = order, columns[name][order]
+
+    rows = np.flatnonzero(codes >= 0)
+    columns["disease_rows"] = rows[np.argsort(codes[rows], kind="stable")]
+    columns["disease_offsets"] = np.zeros(len(diseases) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[rows], minlength=len(diseases)), out=columns["disease_offsets"][1:])
+
+    # FingerprintIndex와 같은 popcount 안정 정렬 (fp_words는 2차에서 정렬 위치로 흩어 씀)
+    counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.int32)
+    fp_order = np.argsort(counts, kind="stable")
+    fp_rank = np.empty(num_records, dtype=np.int64)
+    fp_rank[fp_order] = np.arange(num_records)
+    streamed["fp_words"] = (np.dtype(np.uint64), (num_records, n_bits // 64))
+    columns["fp_counts"] = counts[fp_order]
+    columns["fp_ids"] = fp_order.astype(np.int64)
+    streamed["ss_words"] = (np.dtype(np.uint64), (num_records, screen_bits // 64))
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "num_records": num_records,
+        "diseases": diseases,
+        "fingerprint": {"type": "morgan", "radius": radius, "n_bits": n_bits},
+        "substructure": {"type": "pattern", "n_bits": screen_bits},
+        "columns": {},
+    }
+    # 컬럼 offset은 data_start 기준 상대값 (순서는 COLUMN_ORDER)
+    offset = 0
+    for name in COLUMN_ORDER:
+        dtype, shape = streamed[name] if name in streamed else (columns[name].dtype, columns[name].shape)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        header["columns"][name] = {"dtype": dtype.str, "shape": list(shape), "offset": offset}
+        offset += -(-nbytes // ALIGNMENT) * ALIGNMENT
+    # 자리 표시값으로 헤더 길이 상한을 구한 뒤 실제 data_start를 채움
+    header["data_start"] = 10 ** 15
+    header_length = len(json.dumps(header).encode("utf-8"))
+    data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+    header["data_start"] = data_start
+    header_bytes = json.dumps(header).encode("utf-8").ljust(data_start - len(MAGIC) - 8)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(MAGIC)
+            fh.write(np.uint64(len(header_bytes)).tobytes())
+            fh.write(header_bytes)
+            for name, array in columns.items():
+                fh.seek(data_start + header["columns"][name]["offset"])
+                fh.write(np.ascontiguousarray(array).tobytes())
+            fh.truncate(data_start + offset)
+
+        # 2차: 문자열 버퍼와 fingerprint 행렬을 파일에 직접 기록
+        targets = {
+            name: np.memmap(tmp_path, dtype=dtype, mode="r+", offset=data_start + header["columns"][name]["offset"], shape=shape)
+            for name, (dtype, shape) in streamed.items()
+            if np.prod(shape)
+        }
+        row = 0
+        positions = {"smiles": 0, "name": 0}
+        for chunk in chunks():
+            size = len(chunk["smiles"])
+            for field in ("smiles", "name"):
+                data = _encode_strings(chunk[field])[0]
+                if len(data):
+                    targets[f"{field}_data"][positions[field]:positions[field] + len(data)] = data
+                positions[field] += len(data)
+            if size:
+                targets["fp_words"][fp_rank[row:row + size]] = np.asarray(chunk["fp_words"], dtype=np.uint64)
+                targets["ss_words"][row:row + size] = np.asarray(chunk["ss_words"], dtype=np.uint64)
+            row += size
+        for target in targets.values():
+            target.flush()
+        del targets
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _sorted_contains(sorted_values: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """values의 각 원소가 정렬된 배열 sorted_values에 있는지 (boolean 마스크)"""
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_values, values).clip(max=len(sorted_values) - 1)
+    return sorted_values[positions] == values
+
+
+class CompoundStore:
+    """읽기 전용 메모리 매핑 화합물 저장소"""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"화합물 저장소 파일이 아닙니다: {self.path}")
+            header_length = int(np.frombuffer(fh.read(8), dtype=np.uint64)[0])
+            self.header = json.loads(fh.read(header_length))
+
+        if self.header["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 저장소 버전: {self.header['format_version']}")
+
+        self.diseases: List[str] = self.header["diseases"]
+        self._disease_codes = {name: code for code, name in enumerate(self.diseases)}
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, spec in self.header["columns"].items():
+            shape = tuple(spec["shape"])
+            if 0 in shape:
+                self.columns[name] = np.empty(shape, dtype=spec["dtype"])
+                continue
+            self.columns[name] = np.memmap(
+                self.path,
+                dtype=spec["dtype"],
+                mode="r",
+                offset=self.header["data_start"] + spec["offset"],
+                shape=shape,
+            )
+        self._fingerprint_index: Optional[FingerprintIndex] = None
+        self._substructure_index: Optional[SubstructureIndex] = None
+
+    def __len__(self) -> int:
+        return self.header["num_records"]
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    @staticmethod
+    def _string(data: np.ndarray, offsets: np.ndarray, row: int) -> str:
+        return bytes(data[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def smiles(self, row: int) -> str:
+        """행의 SMILES 문자열"""
+        return self._string(self.columns["smiles_data"], self.columns["smiles_offsets"], row)
+
+    def name(self, row: int) -> str:
+        """행의 화합물 이름"""
+        return self._string(self.columns["name_data"], self.columns["name_offsets"], row)
+
+    def record(self, row: int) -> dict:
+        """
+        행을 dict로 변환 (응답 생성 시점에만 사용)
+
+        Args:
+            row: 레코드 행 번호
+
+        Returns:
+            name, smiles 및 기술자 값을 가진 dict
+        """
+        record = {"name": self.name(row), "smiles": self.smiles(row)}
+        for column in DESCRIPTOR_COLUMNS:
+            value = self.columns[column][row]
+            record[column] = int(value) if column in ("hbd", "hba") else round(float(value), 2)
+        return record
+
+    def has_disease(self, disease: str) -> bool:
+        return disease in self._disease_codes
+
+    def rows_for_disease(self, disease: str) -> np.ndarray:
+        """
+        질환에 속한 레코드 행 번호 (저장소 순서, 복사 없는 memmap 슬라이스)
+
+        Args:
+            disease: 질환 키
+
+        Returns:
+            int64 행 번호 배열 (알 수 없는 질환이면 빈 배열)
+        """
+        code = self._disease_codes.get(disease)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        offsets = self.columns["disease_offsets"]
+        return self.columns["disease_rows"][offsets[code]:offsets[code + 1]]
+
+    def _range_rows(self, column: str, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        """정렬 인덱스에서 low <= 값 <= high 인 구간 [start, stop) (이진 탐색)"""
+        values = self.columns[f"{column}_sorted"]
+        start = 0 if low is None else int(np.searchsorted(values, np.float32(low), side="left"))
+        stop = len(values) if high is None else int(np.searchsorted(values, np.float32(high), side="right"))
+        return start, max(start, stop)
+
+    def select(
+        self,
+        disease: Optional[str] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        after: Optional[int] = None,
+        limit: int = 10,
+        skip: int = 0,
+        exclude: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        질환 + 기술자 범위 조건으로 레코드 조회 (행 번호 오름차순, keyset 페이지네이션)
+
+        가장 선택도가 높은 인덱스(질환 CSR 또는 기술자 정렬 인덱스 구간)에서
+        후보를 꺼낸 뒤 나머지 조건만 후보에 대해 벡터화 검사하므로
+        전체 카탈로그를 스캔하지 않는다.
+
+        Args:
+            disease: 질환 필터 (None이면 전체)
+            ranges: {기술자 컬럼: (최소값, 최대값)} - None인 경계는 제한 없음
+            after: 이 행 번호 다음부터 반환 (이전 페이지의 next_cursor)
+            limit: 반환할 최대 개수
+            skip: after 이후 추가로 건너뛸 개수 (offset 방식 호환)
+            exclude: 결과와 전체 개수에서 뺄 행 번호 (오름차순, 삭제된 화합물)
+
+        Returns:
+            (행 번호 배열, 조건을 만족하는 전체 개수)
+        """
+        ranges = {
+            column: bounds for column, bounds in (ranges or {}).items()
+            if bounds[0] is not None or bounds[1] is not None
+        }
+        for column in ranges:
+            if column not in DESCRIPTOR_COLUMNS:
+                raise ValueError(f"범위 검색을 지원하지 않는 컬럼: {column}")
+
+        disease_rows = self.rows_for_disease(disease) if disease is not None else None
+        spans = {column: self._range_rows(column, *bounds) for column, bounds in ranges.items()}
+        if exclude is not None and not len(exclude):
+            exclude = None
+
+        if not spans and exclude is not None:
+            return self._select_excluding(disease_rows, exclude, after, limit, skip)
+
+        if not spans:
+            # 질환 CSR 행(또는 전체 행)이 이미 정렬되어 있으므로 cursor 위치는 이진 탐색 한 번
+            total = len(disease_rows) if disease_rows is not None else len(self)
+            start = 0
+            if after is not None:
+                start = (
+                    int(np.searchsorted(disease_rows, after, side="right"))
+                    if disease_rows is not None else min(after + 1, total)
+                )
+            start = min(start + max(skip, 0), total)
+            stop = min(start + max(limit, 0), total)
+            rows = disease_rows[start:stop] if disease_rows is not None else np.arange(start, stop)
+            return np.asarray(rows, dtype=np.int64), total
+
+        # 가장 작은 후보 집합(질환 CSR 행 또는 기술자 정렬 구간)에서 시작
+        driver = min(spans, key=lambda column: spans[column][1] - spans[column][0])
+        start, stop = spans[driver]
+        if disease_rows is not None and len(disease_rows) <= stop - start:
+            candidates = np.asarray(disease_rows)
+            driver = None
+        else:
+            candidates = np.asarray(self.columns[f"{driver}_order"][start:stop])
+            if disease_rows is not None:
+                candidates = candidates[_sorted_contains(disease_rows, candidates)]
+
+        for column, (low, high) in ranges.items():
+            if column == driver:
+                continue
+            values = self.columns[column][candidates]
+            keep = np.ones(len(candidates), dtype=bool)
+            if low is not None:
+                keep &= values >= np.float32(low)
+            if high is not None:
+                keep &= values <= np.float32(high)
+            candidates = candidates[keep]
+
+        candidates = np.sort(candidates)
+        if exclude is not None:
+            candidates = candidates[~_sorted_contains(exclude, candidates)]
+        total = len(candidates)
+        start = int(np.searchsorted(candidates, after, side="right")) if after is not None else 0
+        start = min(start + max(skip, 0), total)
+        return candidates[start:start + max(limit, 0)], total
+
+    def _select_excluding(
+        self, disease_rows: Optional[np.ndarray], exclude: np.ndarray, after: Optional[int], limit: int, skip: int
+    ) -> Tuple[np.ndarray, int]:
+        """
+        범위 조건 없는 select()에서 제외 행을 뺀 페이지 (후보 전체를 만들지 않음)
+
+        제외 행의 위치만으로 k번째 남은 행의 위치를 계산하므로 비용은 제외 행 수 + limit에 비례한다.
+        """
+        size = len(disease_rows) if disease_rows is not None else len(self)
+        if disease_rows is not None:
+            excluded = np.searchsorted(disease_rows, exclude[_sorted_contains(disease_rows, exclude)])
+        else:
+            excluded = exclude[(exclude >= 0) & (exclude < size)]
+        total = size - len(excluded)
+
+        # after 다음 위치까지 남은 행 수 + skip = 반환할 첫 행의 (제외 후) 순번
+        start = 0
+        if after is not None:
+            start = (
+                int(np.searchsorted(disease_rows, after, side="right"))
+                if disease_rows is not None else min(after + 1, size)
+            )
+        live = min(start - int(np.searchsorted(excluded, start)) + max(skip, 0), total)
+        # k번째 남은 행의 위치 = k + (앞에 남은 행이 k개 이하인 제외 행 수)
+        first = live + int(np.searchsorted(excluded - np.arange(len(excluded)), live, side="right"))
+        stop = min(first + max(limit, 0) + len(excluded), size)
+        positions = np.arange(first, stop)
+        positions = positions[~_sorted_contains(excluded, positions)][:max(limit, 0)]
+        rows = disease_rows[positions] if disease_rows is not None else positions
+        return np.asarray(rows, dtype=np.int64), total
+
+    @property
+    def fingerprint_index(self) -> FingerprintIndex:
+        """저장된 popcount 정렬 fingerprint 위에 만든 인덱스 (복사 없음)"""
+        if self._fingerprint_index is None:
+            self._fingerprint_index = FingerprintIndex.from_sorted(
+                self.columns["fp_words"], self.columns["fp_counts"], self.columns["fp_ids"]
+            )
+        return self._fingerprint_index
+
+    @property
+    def substructure_index(self) -> SubstructureIndex:
+        """부분구조 사전 선별 인덱스 (저장된 pattern fingerprint 위, 복사 없음)"""
+        if self._substructure_index is None:
+            self._substructure_index = SubstructureIndex(self.columns["ss_words"])
+        return self._substructure_index
+
+    def fingerprint_params(self) -> dict:
+        """저장된 fingerprint 설정 (radius, n_bits) - query fingerprint 생성 시 동일하게 사용"""
+        params = self.header["fingerprint"]
+        return {"radius": params["radius"], "n_bits": params["n_bits"]}
+
+
+def seed_store_path(records: Sequence[dict]) -> str:
+    """
+    시드 레코드로 만든 저장소 파일 경로 (없으면 임시 디렉토리에 생성)
+
+    파일명에 내용 해시를 포함하므로 시드 데이터가 바뀌면 새 파일이 만들어진다.
+
+    Args:
+        records: write_compound_store()와 같은 형식의 레코드 리스트
+
+    Returns:
+        저장소 파일 경로
+    """
+    digest = hashlib.sha256(json.dumps(records, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    path = Path(tempfile.gettempdir()) / "ai-drug-discovery" / f"seed-{FORMAT_VERSION}-{digest}.cstore"
+    if not path.exists():
+        write_compound_store(str(path), records)
+    return str(path)
@@ -0,0 +1,146 @@
+"""
+실행 중 추가/삭제된 화합물 변경 로그 (SQLite)
+
+웹 워커(serve.py)마다 세그먼트 인덱스를 메모리에 따로 들고 있으므로, 추가와
+삭제는 먼저 이 로그에 기록하고 각 워커가 seq 순서대로 재생(replay)해 같은
+인덱스 상태를 만든다. 화합물 ID는 로그에 기록할 때 트랜잭션 안에서 부여하므로
+워커 사이에서도 유일하고, seq 순서와 ID 순서가 같다.
+
+로그는 카탈로그 크기(first_id)에 묶여 있다. 다른 카탈로그로 열면 이전 기록을 지운다.
+
+환경변수:
+    INDEX_DB_PATH: 공유 로그 SQLite 파일 경로 (비우면 프로세스 내 메모리 DB)
+"""
+
+import json
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+
+ADD = "add"
+DELETE = "delete"
+
+
+class IndexLog:
+    """추가/삭제 변경 로그 (기본: 프로세스 내 메모리 DB)"""
+
+    def __init__(self, path: Optional[str], first_id: int):
+        """
+        Args:
+            path: SQLite 파일 경로 (None이면 메모리 DB)
+            first_id: 첫 추가 화합물 ID (카탈로그 크기)
+        """
+        self.first_id = first_id
+        self._lock = threading.Lock()
+        # 파일 DB는 여러 워커 프로세스가 함께 쓰므로 core/jobs.py와 같이 잠금 대기 + WAL
+        self._db = sqlite3.connect(path or ":memory:", timeout=30, check_same_thread=False)
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS index_log ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, op TEXT NOT NULL, "
+            "compound_id INTEGER NOT NULL, count INTEGER NOT NULL, "
+            "records TEXT, fingerprints BLOB)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS index_log_id ON index_log (op, compound_id)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._db.commit()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            row = self._db.execute("SELECT value FROM index_meta WHERE key = 'first_id'").fetchone()
+            if row is None or row[0] != first_id:
+                self._clear_locked()
+            self._db.commit()
+
+    def _clear_locked(self) -> None:
+        self._db.execute("DELETE FROM index_log")
+        self._db.execute(
+            "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('first_id', ?)", (self.first_id,)
+        )
+
+    def clear(self) -> None:
+        """모든 기록 삭제 (seq는 이어짐)"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._clear_locked()
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _next_id_locked(self) -> int:
+        row = self._db.execute(
+            "SELECT MAX(compound_id + count) FROM index_log WHERE op = ?", (ADD,)
+        ).fetchone()
+        return row[0] if row[0] is not None else self.first_id
+
+    def append_add(self, records: dict, fingerprints: bytes, count: int) -> int:
+        """
+        추가 기록 (ID 부여)
+
+        Args:
+            records: 열 단위 레코드 (JSON 직렬화 가능)
+            fingerprints: (count, n_words) uint64 fingerprint 바이트
+            count: 추가하는 화합물 수
+
+        Returns:
+            첫 화합물 ID (first ~ first + count - 1 부여)
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                first = self._next_id_locked()
+                self._db.execute(
+                    "INSERT INTO index_log (op, compound_id, count, records, fingerprints) VALUES (?, ?, ?, ?, ?)",
+                    (ADD, first, count, json.dumps(records), fingerprints),
+                )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return first
+
+    def append_delete(self, compound_id: int) -> bool:
+        """
+        삭제 기록
+
+        Returns:
+            카탈로그 또는 추가된 ID이고 아직 삭제되지 않았으면 True (기록함)
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                known = 0 <= compound_id < self._next_id_locked()
+                deleted = self._db.execute(
+                    "SELECT 1 FROM index_log WHERE op = ? AND compound_id = ?", (DELETE, compound_id)
+                ).fetchone()
+                if not known or deleted:
+                    self._db.rollback()
+                    return False
+                self._db.execute(
+                    "INSERT INTO index_log (op, compound_id, count) VALUES (?, ?, 1)", (DELETE, compound_id)
+                )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return True
+
+    def read_since(self, seq: int) -> List[Tuple[int, str, int, int, Optional[dict], Optional[bytes]]]:
+        """
+        seq 이후 기록 (seq 오름차순)
+
+        Returns:
+            (seq, op, compound_id, count, records, fingerprints) 리스트
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, op, compound_id, count, records, fingerprints FROM index_log "
+                "WHERE seq > ? ORDER BY seq",
+                (seq,),
+            ).fetchall()
+        return [
+            (seq, op, compound_id, count, json.loads(records) if records is not None else None, fingerprints)
+            for seq, op, compound_id, count, records, fingerprints in rows
+        ]
@@ -0,0 +1,480 @@
+"""
+SDF/CSV/SMILES 파일 대량 가져오기 → 화합물 저장소
+
+    읽기      파일을 한 레코드씩 스트리밍 (구조 파싱은 하지 않음, .gz 지원)
+    계산      chunk_size 레코드씩 프로세스 풀로 보내 파싱, canonical SMILES,
+              기술자, Morgan/pattern fingerprint 계산 (청크 안 중복 제거)
+    스풀      청크 결과를 작업 디렉토리에 .npz로 저장한 뒤 체크포인트 갱신
+              (다음에 읽을 바이트 위치, 읽은 레코드 수)
+    마무리    청크 간 중복을 canonical SMILES 해시로 제거하고
+              write_compound_store_chunks()로 저장소를 한 번에 기록
+
+메모리에는 처리 중인 청크(워커 수 × 2)와 행 단위 작은 배열만 올라간다.
+중단되면 같은 명령을 다시 실행할 때 체크포인트부터 이어서 읽는다
+(원본 파일의 경로/크기/수정 시각과 옵션이 같을 때만).
+
+사용법 (backend 디렉토리에서):
+    python -m database.ingest library.sdf.gz -o catalog.cstore --disease hepatitis_b
+    python -m database.ingest export.csv -o catalog.cstore --smiles-column SMILES --name-column ID
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from rdkit import Chem
+from rdkit.Chem import Crippen, Descriptors, Lipinski, rdMolDescriptors
+
+from database.compound_store import DESCRIPTOR_COLUMNS, _encode_strings, write_compound_store_chunks
+from ml.chem import canonical_smiles, parse_smiles
+from ml.fingerprint_index import DEFAULT_N_BITS, DEFAULT_RADIUS, morgan_fingerprints
+from ml.molecule_batch import decode_strings
+from ml.substructure_index import DEFAULT_SCREEN_BITS, pattern_fingerprints
+
+FORMATS = ("sdf", "csv", "smiles")
+DEFAULT_CHUNK_SIZE = 5000
+CHECKPOINT_VERSION = 1
+
+# (구조 텍스트 - SMILES 또는 MolBlock, 이름, 질환)
+RawRecord = Tuple[str, str, Optional[str]]
+
+
+@dataclass
+class IngestOptions:
+    """가져오기 옵션 (체크포인트 호환성 판단에 사용)"""
+
+    format: str
+    disease: Optional[str] = None
+    smiles_column: str = "smiles"
+    name_column: str = "name"
+    disease_column: str = "disease"
+    name_field: Optional[str] = None
+    radius: int = DEFAULT_RADIUS
+    n_bits: int = DEFAULT_N_BITS
+    screen_bits: int = DEFAULT_SCREEN_BITS
+
+
+@dataclass
+class IngestProgress:
+    """진행 상황 (progress 콜백과 최종 결과에 사용)"""
+
+    records_read: int = 0
+    num_parsed: int = 0
+    num_failed: int = 0
+    chunks: int = 0
+    offset: int = 0
+    resumed_from: int = 0
+    seconds: float = 0.0
+
+    @property
+    def records_per_sec(self) -> float:
+        """이번 실행에서 읽은 레코드 기준 처리 속도"""
+        return (self.records_read - self.resumed_from) / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "records_per_sec": round(self.records_per_sec, 1)}
+
+
+def detect_format(path: str) -> str:
+    """확장자로 형식 추정 (.gz는 무시)"""
+    suffixes = [s.lower() for s in Path(path).suffixes if s.lower() != ".gz"]
+    suffix = suffixes[-1] if suffixes else ""
+    if suffix in (".sdf", ".sd", ".mol"):
+        return "sdf"
+    if suffix in (".csv", ".tsv"):
+        return "csv"
+    if suffix in (".smi", ".smiles", ".txt", ".ism"):
+        return "smiles"
+    raise ValueError(f"형식을 알 수 없는 파일입니다 (sdf/csv/smiles 중 지정 필요): {path}")
+
+
+def _open_binary(path: str):
+    return gzip.open(path, "rb") if path.lower().endswith(".gz") else open(path, "rb")
+
+
+def _iter_smiles_lines(fh, stem: str, options: IngestOptions, index: int) -> Iterator[Tuple[int, RawRecord]]:
+    while True:
+        line = fh.readline()
+        if not line:
+            return
+        text = line.decode("utf-8", errors="replace").strip()
+        if not text or text.startswith("#"):
+            continue
+        tokens = text.split(None, 1)
+        index += 1
+        name = tokens[1].strip() if len(tokens) > 1 else f"{stem}-{index}"
+        yield fh.tell(), (tokens[0], name, options.disease)
+
+
+def _iter_csv_rows(
+    fh, stem: str, options: IngestOptions, index: int, header: List[str], delimiter: str
+) -> Iterator[Tuple[int, RawRecord]]:
+    columns = {name.strip(): i for i, name in enumerate(header)}
+    if options.smiles_column not in columns:
+        raise ValueError(f"SMILES 컬럼이 없습니다: {options.smiles_column} (헤더: {', '.join(columns)})")
+    smiles_at = columns[options.smiles_column]
+    name_at = columns.get(options.name_column)
+    disease_at = columns.get(options.disease_column)
+    while True:
+        line = fh.readline()
+        if not line:
+            return
+        text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+        if not text.strip():
+            continue
+        row = next(csv.reader([text], delimiter=delimiter))
+        index += 1
+        smiles = row[smiles_at].strip() if smiles_at < len(row) else ""
+        name = row[name_at].strip() if name_at is not None and name_at < len(row) else ""
+        disease = row[disease_at].strip() if disease_at is not None and disease_at < len(row) else ""
+        yield fh.tell(), (smiles, name or f"{stem}-{index}", disease or options.disease)
+
+
+def _sdf_record(lines: List[str], stem: str, options: IngestOptions, index: int) -> RawRecord:
+    """SDF 레코드 한 개 (MolBlock은 "M  END"까지, 이후는 "> <필드>" + 값 줄로 된 데이터 필드)"""
+    end = next((i for i, value in enumerate(lines) if value.startswith("M  END")), len(lines) - 1)
+    fields = {}
+    for i in range(end + 1, len(lines) - 1):
+        if lines[i].startswith(">") and "<" in lines[i]:
+            fields[lines[i].split("<", 1)[1].split(">", 1)[0]] = lines[i + 1].strip()
+    title = lines[0].strip() if lines else ""
+    name = fields.get(options.name_field, "") if options.name_field else title
+    disease = fields.get(options.disease_column) or options.disease
+    return "\n".join(lines[:end + 1]), name or f"{stem}-{index}", disease
+
+
+def _iter_sdf_blocks(fh, stem: str, options: IngestOptions, index: int) -> Iterator[Tuple[int, RawRecord]]:
+    lines: List[str] = []
+    while True:
+        line = fh.readline()
+        if not line:
+            # 마지막 레코드 뒤에 "$$$$"가 없는 파일
+            if any(value.startswith("M  END") for value in lines):
+                yield fh.tell(), _sdf_record(lines, stem, options, index + 1)
+            return
+        text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+        if text.strip() != "$$$$":
+            lines.append(text)
+            continue
+        index += 1
+        yield fh.tell(), _sdf_record(lines, stem, options, index)
+        lines = []
+
+
+def iter_records(path: str, options: IngestOptions, offset: int = 0, index: int = 0) -> Iterator[Tuple[int, RawRecord]]:
+    """
+    파일을 한 레코드씩 읽음 (구조는 파싱하지 않음)
+
+    Args:
+        path: 원본 파일 (.gz 가능)
+        options: 형식/컬럼 옵션
+        offset: 이어서 읽을 바이트 위치 (체크포인트, 압축 해제 기준)
+        index: offset 전까지 읽은 레코드 수 (이름 없는 레코드의 일련번호용)
+
+    Yields:
+        (이 레코드 다음 바이트 위치, (구조 텍스트, 이름, 질환))
+    """
+    stem = Path(path).name.split(".")[0]
+    with _open_binary(path) as fh:
+        if options.format == "csv":
+            header_line = fh.readline().decode("utf-8-sig", errors="replace").rstrip("\r\n")
+            delimiter = "\t" if "\t" in header_line else ","
+            header = next(csv.reader([header_line], delimiter=delimiter))
+            if offset > fh.tell():
+                fh.seek(offset)
+            yield from _iter_csv_rows(fh, stem, options, index, header, delimiter)
+            return
+        if offset:
+            fh.seek(offset)
+        if options.format == "sdf":
+            yield from _iter_sdf_blocks(fh, stem, options, index)
+        else:
+            yield from _iter_smiles_lines(fh, stem, options, index)
+
+
+def canonical_hashes(smiles: List[str]) -> np.ndarray:
+    """canonical SMILES의 64비트 해시 (청크 간 중복 제거용)"""
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in smiles],
+        dtype=np.uint64,
+    )
+
+
+def process_chunk(records: List[RawRecord], options: IngestOptions) -> dict:
+    """
+    레코드 청크 파싱 + 기술자/fingerprint 계산 (프로세스 풀에서 실행)
+
+    Returns:
+        스풀 형식 배열 dict (문자열은 data/offsets로 인코딩) + num_failed
+    """
+    smiles, names, diseases, mols = [], [], [], []
+    seen = set()
+    num_failed = 0
+    for structure, name, disease in records:
+        mol = Chem.MolFromMolBlock(structure) if options.format == "sdf" else parse_smiles(structure)
+        if mol is None:
+            num_failed += 1
+            continue
+        canonical = canonical_smiles(mol)
+        if canonical in seen:
+            continue
+        seen.add(canonical)
+        smiles.append(canonical)
+        names.append(name)
+        diseases.append(disease or "")
+        mols.append(mol)
+
+    chunk = {
+        "molecular_weight": np.array([Descriptors.MolWt(m) for m in mols], dtype=np.float32),
+        "logp": np.array([Crippen.MolLogP(m) for m in mols], dtype=np.float32),
+        "tpsa": np.array([rdMolDescriptors.CalcTPSA(m) for m in mols], dtype=np.float32),
+        "hbd": np.array([Lipinski.NumHDonors(m) for m in mols], dtype=np.float32),
+        "hba": np.array([Lipinski.NumHAcceptors(m) for m in mols], dtype=np.float32),
+        "fp_words": morgan_fingerprints(mols, options.radius, options.n_bits),
+        "ss_words": pattern_fingerprints(mols, options.screen_bits),
+        "hashes": canonical_hashes(smiles),
+        "num_failed": np.int64(num_failed),
+    }
+    for key, values in (("smiles", smiles), ("name", names), ("disease", diseases)):
+        chunk[f"{key}_data"], chunk[f"{key}_offsets"] = _encode_strings(values)
+    return chunk
+
+
+class Checkpoint:
+    """작업 디렉토리 (스풀 청크 + checkpoint.json)"""
+
+    def __init__(self, work_dir: str):
+        self.work_dir = Path(work_dir)
+        self.path = self.work_dir / "checkpoint.json"
+
+    def load(self) -> Optional[dict]:
+        if not self.path.exists():
+            return None
+        with open(self.path) as fh:
+            return json.load(fh)
+
+    def save(self, state: dict) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as fh:
+            json.dump(state, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+
+    def chunk_path(self, number: int) -> Path:
+        return self.work_dir / f"chunk-{number:06d}.npz"
+
+    def write_chunk(self, number: int, chunk: dict) -> None:
+        tmp = self.work_dir / f"chunk-{number:06d}.tmp.npz"
+        np.savez(tmp, **chunk)
+        os.replace(tmp, self.chunk_path(number))
+
+    def reset(self) -> None:
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self.work_dir.mkdir(parents=True)
+
+
+def _source_identity(path: str, options: IngestOptions) -> dict:
+    stat = os.stat(path)
+    return {
+        "version": CHECKPOINT_VERSION,
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "options": asdict(options),
+    }
+
+
+def _iter_chunks(records: Iterator[Tuple[int, RawRecord]], chunk_size: int) -> Iterator[Tuple[int, List[RawRecord]]]:
+    """(청크 마지막 레코드 다음 바이트 위치, 레코드 리스트)"""
+    batch: List[RawRecord] = []
+    offset = 0
+    for offset, record in records:
+        batch.append(record)
+        if len(batch) == chunk_size:
+            yield offset, batch
+            batch = []
+    if batch:
+        yield offset, batch
+
+
+def _spooled_chunks(checkpoint: Checkpoint, num_chunks: int) -> Tuple[Callable[[], Iterator[dict]], int]:
+    """
+    스풀 청크를 저장소 기록용 청크로 읽는 함수 (청크 간 중복은 첫 등장만 유지)
+
+    Returns:
+        (write_compound_store_chunks용 청크 함수, 기록될 행 수)
+    """
+    hashes = [np.load(checkpoint.chunk_path(i))["hashes"] for i in range(num_chunks)]
+    sizes = [len(h) for h in hashes]
+    all_hashes = np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+    _, first = np.unique(all_hashes, return_index=True)
+    keep = np.zeros(len(all_hashes), dtype=bool)
+    keep[first] = True
+    bounds = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    def chunks() -> Iterator[dict]:
+        for i in range(num_chunks):
+            mask = keep[bounds[i]:bounds[i + 1]]
+            if not mask.any():
+                continue
+            with np.load(checkpoint.chunk_path(i)) as spooled:
+                chunk = {name: spooled[name][mask] for name in (*DESCRIPTOR_COLUMNS, "fp_words", "ss_words")}
+                for key in ("smiles", "name", "disease"):
+                    values = decode_strings(spooled[f"{key}_data"], spooled[f"{key}_offsets"])
+                    chunk[key] = [value for value, kept in zip(values, mask.tolist()) if kept]
+            chunk["disease"] = [value or None for value in chunk["disease"]]
+            yield chunk
+
+    return chunks, len(first)
+
+
+def ingest_file(
+    source: str,
+    output: str,
+    options: IngestOptions,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    work_dir: Optional[str] = None,
+    stop_offset: Optional[int] = None,
+    progress: Optional[Callable[[IngestProgress], None]] = None,
+) -> dict:
+    """
+    파일을 가져와 화합물 저장소로 기록 (체크포인트에서 재개 가능)
+
+    Args:
+        source: 원본 파일
+        output: 출력 저장소 경로
+        options: 형식/컬럼/fingerprint 옵션
+        chunk_size: 청크당 레코드 수 (체크포인트 단위)
+        workers: 프로세스 수 (기본: CPU 수, 0이면 현재 프로세스에서 계산)
+        work_dir: 스풀/체크포인트 디렉토리 (기본: output + ".ingest")
+        stop_offset: 이 바이트 위치를 넘으면 체크포인트만 남기고 중단 (작업 큐에서 나눠 실행할 때 사용)
+        progress: 청크마다 호출되는 콜백
+
+    Returns:
+        IngestProgress.to_dict() + complete, output, num_duplicates, num_written
+    """
+    if options.format not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {options.format} (가능: {', '.join(FORMATS)})")
+    checkpoint = Checkpoint(work_dir or f"{output}.ingest")
+    identity = _source_identity(source, options)
+    state = checkpoint.load()
+    if state is None or state["identity"] != identity:
+        checkpoint.reset()
+        state = {"identity": identity, "offset": 0, "records_read": 0, "num_parsed": 0,
+                 "num_failed": 0, "chunks": 0, "eof": False}
+        checkpoint.save(state)
+
+    status = IngestProgress(
+        records_read=state["records_read"], num_parsed=state["num_parsed"], num_failed=state["num_failed"],
+        chunks=state["chunks"], offset=state["offset"], resumed_from=state["records_read"],
+    )
+    start = time.perf_counter()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) if workers > 0 else None
+    try:
+        chunks = _iter_chunks(iter_records(source, options, state["offset"], state["records_read"]), chunk_size)
+        in_flight: deque = deque()
+        exhausted = state["eof"]
+        while True:
+            # 순서대로 기록하기 위해 앞선 청크부터 결과를 기다리며, 대기 중인 청크 수를 제한
+            while not exhausted and len(in_flight) < max(1, workers * 2):
+                if stop_offset is not None and (in_flight[-1][0] if in_flight else status.offset) >= stop_offset:
+                    break
+                item = next(chunks, None)
+                if item is None:
+                    exhausted = True
+                    break
+                offset, records = item
+                future = pool.submit(process_chunk, records, options) if pool else None
+                in_flight.append((offset, len(records), future or process_chunk(records, options)))
+            if not in_flight:
+                break
+
+            offset, num_records, result = in_flight.popleft()
+            chunk = result if isinstance(result, dict) else result.result()
+            checkpoint.write_chunk(status.chunks, chunk)
+            status.chunks += 1
+            status.offset = offset
+            status.records_read += num_records
+            status.num_failed += int(chunk["num_failed"])
+            status.num_parsed += num_records - int(chunk["num_failed"])
+            status.seconds = time.perf_counter() - start
+            checkpoint.save({**state, "offset": status.offset, "records_read": status.records_read,
+                             "num_parsed": status.num_parsed, "num_failed": status.num_failed,
+                             "chunks": status.chunks, "eof": exhausted and not in_flight})
+            if progress is not None:
+                progress(status)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    status.seconds = time.perf_counter() - start
+    if not exhausted:
+        return {**status.to_dict(), "complete": False, "output": None}
+
+    chunk_iter, num_written = _spooled_chunks(checkpoint, status.chunks)
+    write_compound_store_chunks(output, chunk_iter, options.radius, options.n_bits, options.screen_bits)
+    status.seconds = time.perf_counter() - start
+    shutil.rmtree(checkpoint.work_dir, ignore_errors=True)
+    return {
+        **status.to_dict(),
+        "complete": True,
+        "output": os.path.abspath(output),
+        # 청크 안 중복은 워커에서, 청크 간 중복은 마무리 단계에서 제거
+        "num_duplicates": status.num_parsed - num_written,
+        "num_written": num_written,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="SDF / CSV / SMILES 파일 (.gz 가능)")
+    parser.add_argument("-o", "--output", required=True, help="출력 저장소 경로 (.cstore)")
+    parser.add_argument("--format", choices=FORMATS, help="파일 형식 (기본: 확장자로 추정)")
+    parser.add_argument("--disease", help="모든 레코드에 붙일 질환 (파일의 질환 컬럼/필드가 우선)")
+    parser.add_argument("--smiles-column", default="smiles")
+    parser.add_argument("--name-column", default="name")
+    parser.add_argument("--disease-column", default="disease", help="CSV 컬럼 또는 SDF 데이터 필드")
+    parser.add_argument("--name-field", help="SDF 이름 데이터 필드 (기본: MolBlock 제목 줄)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--work-dir", help="스풀/체크포인트 디렉토리 (기본: 출력 경로 + .ingest)")
+    args = parser.parse_args()
+
+    options = IngestOptions(
+        format=args.format or detect_format(args.source),
+        disease=args.disease,
+        smiles_column=args.smiles_column,
+        name_column=args.name_column,
+        disease_column=args.disease_column,
+        name_field=args.name_field,
+    )
+    last_report = [0.0]
+
+    def report(status: IngestProgress):
+        if status.seconds - last_report[0] >= 2:
+            last_report[0] = status.seconds
+            print(f"{status.records_read:,} records ({status.records_per_sec:,.0f}/s), "
+                  f"{status.num_failed:,} failed, {status.chunks} chunks", file=sys.stderr)
+
+    result = ingest_file(args.source, args.output, options, args.chunk_size, args.workers, args.work_dir, progress=report)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
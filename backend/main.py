@@ -2,10 +2,17 @@
 AI Drug Discovery Platform - FastAPI Backend
 """
 
+import asyncio
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
+from core.executor import ComputeSaturatedError, start_compute_executor, stop_compute_executor
+from core.http_cache import CompressionMiddleware
+from core.metrics import TimingMiddleware, render_metrics
+from core.profiler import SamplingProfiler
+from core.readiness import readiness
 from routers import api_router
 
 # 환경변수 로드
@@ -29,10 +36,106 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Accept-Encoding 협상 압축 (br/gzip, COMPRESS_MIN_BYTES 이상의 JSON/SDF 응답)
+app.add_middleware(CompressionMiddleware)
+
+# 요청 지연시간 계측 (가장 바깥 미들웨어). PROFILE_SLOW_MS 설정 시 느린 요청 프로파일 저장
+profiler = SamplingProfiler.from_env()
+app.add_middleware(TimingMiddleware, profiler=profiler)
+
 # 라우터 통합
 app.include_router(api_router)
 
 
+@app.on_event("startup")
+async def start_profiler():
+    """샘플링 프로파일러 시작 (이벤트 루프 스레드 대상, opt-in)"""
+    if profiler is not None:
+        profiler.start()
+
+
+@app.on_event("shutdown")
+async def stop_profiler():
+    if profiler is not None:
+        profiler.stop()
+
+
+async def _warm_up():
+    """
+    기동 워밍업 (백그라운드): 무거운 모듈, ADMET 모델, 카탈로그, 계산 풀
+
+    /health는 워밍업과 무관하게 바로 응답하고, /ready는 모든 단계가 끝나야 200이다.
+    모듈 import는 이벤트 루프에서 하나씩 진행해 요청 처리와 번갈아 실행된다.
+    """
+    from core.lazy import HEAVY_MODULES, load
+    from services.catalog import get_catalog
+
+    step = "modules"
+    try:
+        for name in HEAVY_MODULES:
+            load(name)
+            await asyncio.sleep(0)
+        readiness.mark_ready(step)
+        from ml.model_registry import registry
+
+        # ADMET_WARM_MODELS에 지정된 모델을 미리 로드 (기본: 첫 사용 시 로드)
+        step = "models"
+        warm = os.getenv("ADMET_WARM_MODELS", "").strip()
+        if warm == "all":
+            await asyncio.to_thread(registry.warmup)
+        elif warm:
+            await asyncio.to_thread(registry.warmup, [name.strip() for name in warm.split(",")])
+        readiness.mark_ready(step)
+
+        step = "catalog"
+        await asyncio.to_thread(get_catalog)
+        readiness.mark_ready(step)
+
+        # CPU 집약 계산용 프로세스 풀 (COMPUTE_WORKERS=0이면 inline 실행)
+        step = "compute"
+        await start_compute_executor()
+        readiness.mark_ready(step)
+    except Exception as e:
+        readiness.mark_failed(step, str(e))
+        raise
+
+
+@app.on_event("startup")
+async def start_warm_up():
+    """워밍업을 백그라운드로 시작 (서버는 바로 요청을 받음)"""
+    readiness.register("modules", "models", "catalog", "compute")
+    app.state.warm_up = asyncio.create_task(_warm_up())
+
+
+@app.on_event("shutdown")
+async def stop_compute():
+    """계산 프로세스 풀 종료"""
+    app.state.warm_up.cancel()
+    await stop_compute_executor()
+
+
+@app.exception_handler(ComputeSaturatedError)
+async def compute_saturated_handler(request: Request, exc: ComputeSaturatedError):
+    """계산 워커 포화 시 503 + Retry-After로 클라이언트 재시도 유도"""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.on_event("startup")
+async def start_jobs():
+    """비동기 작업 큐 (프로세스 풀) 시작"""
+    from core.jobs import start_job_manager
+
+    await start_job_manager()
+
+
+@app.on_event("shutdown")
+async def stop_jobs():
+    """비동기 작업 큐 종료"""
+    from core.jobs import stop_job_manager
+
+    await stop_job_manager()
+
+
 # 기본 라우트
 @app.get("/", tags=["Health"])
 async def root():
@@ -46,11 +149,24 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """헬스체크 엔드포인트"""
+    """헬스체크 엔드포인트 (liveness: 프로세스가 응답 가능하면 항상 200)"""
     return {"status": "healthy", "service": "drug-discovery-backend"}
 
 
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """준비 상태 엔드포인트 (readiness: 워밍업 완료 전에는 503)"""
+    return JSONResponse(status_code=200 if readiness.is_ready else 503, content=readiness.snapshot())
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 텍스트 포맷 메트릭 (라우트/단계별 지연시간, 캐시 히트율, 처리 중 요청 수)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
+    # 개발용 단일 프로세스 + 자동 리로드 (프로덕션은 serve.py)
     import uvicorn
 
     uvicorn.run(
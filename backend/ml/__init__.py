@@ -0,0 +1,3 @@
+"""
+ML/화학 계산 모듈
+"""
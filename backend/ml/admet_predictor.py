@@ -0,0 +1,120 @@
+"""
+Vectorized ADMET scoring.
+
+All five category scores and every ``ADMETDetails`` field are computed as
+NumPy arrays over the whole batch: each endpoint model from the registry is
+called once per batch with the full descriptor matrix.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .chem import parse_smiles
+from .featurization import FEATURE_NAMES, descriptor_matrix
+from .model_registry import ADMET_ENDPOINTS, ModelRegistry, registry
+from .molecule_batch import MoleculeBatch
+
+CYP_ENZYMES = ("CYP1A2", "CYP2C9", "CYP2C19", "CYP2D6", "CYP3A4")
+
+# Continuous ADMETDetails fields
+DETAIL_VALUES = (
+    "caco2_permeability",
+    "bioavailability",
+    "bbb_penetration",
+    "half_life",
+    "clearance",
+    "ld50",
+)
+
+# Boolean ADMETDetails fields (risk flags)
+DETAIL_FLAGS = ("pgp_substrate", "herg_inhibition", "hepatotoxicity", "skin_sensitization")
+
+
+@dataclass
+class ADMETBatchResult:
+    """Column-oriented ADMET predictions for a batch of molecules."""
+
+    scores: Dict[str, np.ndarray]
+    overall: np.ndarray
+    details: Dict[str, np.ndarray]
+    cyp_mask: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.overall)
+
+    def cyp_inhibition(self, index: int) -> List[str]:
+        """CYP enzymes flagged as inhibited for the molecule at ``index``."""
+        return [CYP_ENZYMES[j] for j in np.flatnonzero(self.cyp_mask[index])]
+
+
+def predict_batch(
+    features: np.ndarray, model_registry: Optional[ModelRegistry] = None
+) -> ADMETBatchResult:
+    """
+    Score a batch of molecules in one vectorized pass.
+
+    Args:
+        features: Descriptor matrix of shape (n, len(FEATURE_NAMES))
+        model_registry: Registry to take endpoint models from (process-wide default when omitted)
+
+    Returns:
+        ADMETBatchResult with one array entry per molecule
+    """
+    model_registry = model_registry if model_registry is not None else registry
+    features = np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURE_NAMES))
+
+    outputs: Dict[str, np.ndarray] = {}
+    for endpoint in ADMET_ENDPOINTS:
+        outputs.update(model_registry.predict(endpoint, features))
+
+    scores = {name: outputs[name] for name in ADMET_ENDPOINTS}
+    overall = np.mean(np.stack([scores[name] for name in ADMET_ENDPOINTS]), axis=0)
+    details = {name: outputs[name] for name in DETAIL_VALUES + DETAIL_FLAGS}
+    cyp_mask = np.stack([outputs[f"cyp_{enzyme}"] for enzyme in CYP_ENZYMES], axis=1)
+
+    return ADMETBatchResult(scores=scores, overall=overall, details=details, cyp_mask=cyp_mask)
+
+
+def score_smiles(smiles_list: List[str]) -> ADMETBatchResult:
+    """
+    Parse, featurize and score valid SMILES strings.
+
+    Module-level and picklable so it can run in a compute worker process.
+
+    Args:
+        smiles_list: SMILES strings already known to parse
+
+    Returns:
+        ADMETBatchResult in input order
+    """
+    return predict_batch(descriptor_matrix([parse_smiles(smiles) for smiles in smiles_list]))
+
+
+def score_batch(batch: MoleculeBatch) -> MoleculeBatch:
+    """
+    Score a MoleculeBatch and return it with ADMET columns attached.
+
+    Identical SMILES (e.g. generated variants of one seed) are parsed and
+    scored once. Adds one column per category plus ``overall_score``.
+
+    Args:
+        batch: Molecules to score
+
+    Returns:
+        New MoleculeBatch sharing the input's string buffers and columns
+
+    Raises:
+        ValueError: A SMILES string does not parse
+    """
+    smiles_list = batch.smiles_list()
+    unique: Dict[str, int] = {}
+    inverse = np.fromiter((unique.setdefault(s, len(unique)) for s in smiles_list), dtype=np.int64, count=len(smiles_list))
+    mols = [parse_smiles(smiles) for smiles in unique]
+    for smiles, mol in zip(unique, mols):
+        if mol is None:
+            raise ValueError(f"Invalid SMILES: {smiles}")
+    result = predict_batch(descriptor_matrix(mols))
+    columns = {name: result.scores[name][inverse] for name in ADMET_ENDPOINTS}
+    return batch.with_columns(**columns, overall_score=result.overall[inverse])
@@ -0,0 +1,76 @@
+"""
+SMILES 파싱 및 검증 유틸리티 (RDKit)
+"""
+
+from typing import List, Optional, Tuple
+
+from rdkit import Chem, RDLogger
+
+# 잘못된 SMILES 입력마다 stderr로 출력되는 RDKit 경고 억제
+RDLogger.DisableLog("rdApp.*")
+
+
+def parse_smiles(smiles: str) -> Optional[Chem.Mol]:
+    """
+    SMILES 문자열을 RDKit Mol 객체로 파싱
+
+    Args:
+        smiles: SMILES 문자열
+
+    Returns:
+        Mol 객체 (파싱 실패 시 None)
+    """
+    if not smiles or not smiles.strip():
+        return None
+    return Chem.MolFromSmiles(smiles.strip())
+
+
+def parse_smiles_batch(smiles_list: List[str]) -> Tuple[List[Optional[Chem.Mol]], List[Optional[str]]]:
+    """
+    SMILES 리스트를 한 번에 파싱/검증
+
+    Args:
+        smiles_list: SMILES 문자열 리스트
+
+    Returns:
+        (Mol 리스트 - 실패 항목은 None, 항목별 오류 메시지 리스트 - 정상 항목은 None)
+    """
+    mols: List[Optional[Chem.Mol]] = [None] * len(smiles_list)
+    errors: List[Optional[str]] = [None] * len(smiles_list)
+
+    for i, smiles in enumerate(smiles_list):
+        if not smiles or not smiles.strip():
+            errors[i] = "빈 SMILES 문자열"
+            continue
+        mols[i] = parse_smiles(smiles)
+        if mols[i] is None:
+            errors[i] = f"유효하지 않은 SMILES: {smiles}"
+
+    return mols, errors
+
+
+def canonical_smiles(mol: Chem.Mol) -> str:
+    """
+    정규화(canonical) SMILES 반환 - 표기만 다른 같은 분자는 같은 문자열이 됨
+
+    Args:
+        mol: RDKit Mol 객체
+
+    Returns:
+        canonical SMILES 문자열
+    """
+    return Chem.MolToSmiles(mol)
+
+
+def canonicalize_batch(smiles_list: List[str]) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    """
+    SMILES 리스트를 파싱해 canonical SMILES로 변환 (계산 워커에서 실행 가능)
+
+    Args:
+        smiles_list: SMILES 문자열 리스트
+
+    Returns:
+        (canonical SMILES 리스트 - 실패 항목은 None, 항목별 오류 메시지 리스트)
+    """
+    mols, errors = parse_smiles_batch(smiles_list)
+    return [canonical_smiles(mol) if mol is not None else None for mol in mols], errors
@@ -0,0 +1,146 @@
+"""
+3D 배좌(conformer) 생성 및 content-addressed 디스크 캐시
+
+배좌는 (canonical SMILES, 방법, 시드, 배좌 수, 최적화 여부)의 해시를 키로
+gzip 압축 SDF 파일로 저장된다. 같은 분자를 다시 보면 임베딩 없이
+캐시 파일만 읽어서 응답한다. 캐시 파일은 원자적으로 쓰이므로 여러 워커
+프로세스가 같은 디렉토리를 공유해도 안전하다.
+
+환경변수:
+    CONFORMER_CACHE_DIR: 캐시 디렉토리 (기본: 임시 디렉토리/ai-drug-discovery/conformers)
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from rdkit import Chem
+from rdkit.Chem import AllChem
+
+# 생성 로직이 바뀌면 올려서 기존 캐시 무효화
+CONFORMER_VERSION = "1"
+
+EMBEDDING_METHODS = {
+    "etkdgv3": AllChem.ETKDGv3,
+    "etkdgv2": AllChem.ETKDGv2,
+    "etdg": AllChem.ETDG,
+}
+
+
+def conformer_key(canonical: str, method: str, seed: int, num_conformers: int, optimize: bool) -> str:
+    """배좌 캐시 키 (SHA-256 hex)"""
+    content = f"{CONFORMER_VERSION}|{canonical}|{method}|{seed}|{num_conformers}|{int(optimize)}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def embed_conformers(
+    canonical: str,
+    num_conformers: int = 1,
+    method: str = "etkdgv3",
+    seed: int = 42,
+    optimize: bool = True,
+) -> str:
+    """
+    3D 배좌 생성 후 SDF 문자열로 변환
+
+    Args:
+        canonical: canonical SMILES
+        num_conformers: 생성할 배좌 수
+        method: 임베딩 방법 (etkdgv3, etkdgv2, etdg)
+        seed: 난수 시드 (같은 시드면 같은 좌표)
+        optimize: MMFF 힘장으로 구조 최적화 여부
+
+    Returns:
+        배좌마다 레코드 하나씩 ($$$$ 구분) 담긴 SDF 문자열
+
+    Raises:
+        ValueError: 잘못된 SMILES/방법이거나 임베딩 실패
+    """
+    if method not in EMBEDDING_METHODS:
+        raise ValueError(f"지원하지 않는 임베딩 방법: {method}")
+    mol = Chem.MolFromSmiles(canonical)
+    if mol is None:
+        raise ValueError(f"유효하지 않은 SMILES: {canonical}")
+
+    mol = Chem.AddHs(mol)
+    params = EMBEDDING_METHODS[method]()
+    params.randomSeed = seed
+    conformer_ids = list(AllChem.EmbedMultipleConfs(mol, numConfs=num_conformers, params=params))
+    if not conformer_ids:
+        # 고리가 복잡한 분자 등은 랜덤 초기 좌표로 재시도
+        params.useRandomCoords = True
+        conformer_ids = list(AllChem.EmbedMultipleConfs(mol, numConfs=num_conformers, params=params))
+    if not conformer_ids:
+        raise ValueError(f"3D 좌표 생성 실패: {canonical}")
+
+    energies = {}
+    if optimize and AllChem.MMFFHasAllMoleculeParams(mol):
+        for conformer_id, (_, energy) in zip(conformer_ids, AllChem.MMFFOptimizeMoleculeConfs(mol)):
+            energies[conformer_id] = energy
+
+    mol.SetProp("_Name", canonical)
+    blocks = []
+    for conformer_id in conformer_ids:
+        block = Chem.MolToMolBlock(mol, confId=conformer_id)
+        fields = f">  <conformer_id>\n{conformer_id}\n\n"
+        if conformer_id in energies:
+            fields += f">  <mmff_energy>\n{energies[conformer_id]:.4f}\n\n"
+        blocks.append(f"{block}{fields}$$$$\n")
+    return "".join(blocks)
+
+
+class ConformerCache:
+    """content-addressed gzip SDF 디스크 캐시"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(
+            directory
+            or os.getenv("CONFORMER_CACHE_DIR")
+            or Path(tempfile.gettempdir()) / "ai-drug-discovery" / "conformers"
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.sdf.gz"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """캐시된 gzip SDF (없으면 None)"""
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, sdf_gz: bytes) -> None:
+        """gzip SDF 저장 (임시 파일 작성 후 원자적 rename)"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(sdf_gz)
+        os.replace(tmp_path, path)
+
+
+conformer_cache = ConformerCache()
+
+
+def generate_and_cache(
+    canonical: str, num_conformers: int, method: str, seed: int, optimize: bool
+) -> bytes:
+    """
+    배좌를 생성해 캐시에 저장 (계산 워커에서 실행)
+
+    Returns:
+        gzip 압축된 SDF
+    """
+    key = conformer_key(canonical, method, seed, num_conformers, optimize)
+    cached = conformer_cache.get(key)
+    if cached is not None:
+        return cached
+    sdf_gz = gzip.compress(
+        embed_conformers(canonical, num_conformers, method, seed, optimize).encode("utf-8"),
+        mtime=0,
+    )
+    conformer_cache.put(key, sdf_gz)
+    return sdf_gz
@@ -0,0 +1,223 @@
+"""
+분자 속성(descriptor) 배치 계산 엔진
+
+SMILES마다 한 번만 파싱하고, 같은 Mol로 모든 기술자를 계산한다.
+QED 계산에 필요한 MW/logP/TPSA/회전 결합 수를 QED.properties에서 한 번
+구해 그대로 재사용하며, Lipinski 규칙 플래그와 위반 수는 계산된 열에서
+numpy 벡터 연산으로 유도한다.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from rdkit.Chem import QED, Lipinski
+
+from ml.chem import canonical_smiles, parse_smiles_batch
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # Arrow 응답은 선택 기능
+    pa = None
+
+# 계산 결과 열 (순서 = 응답 열 순서)
+PROPERTY_COLUMNS = (
+    "molecular_weight",
+    "logp",
+    "tpsa",
+    "hbd",
+    "hba",
+    "rotatable_bonds",
+    "qed",
+)
+INTEGER_COLUMNS = ("hbd", "hba", "rotatable_bonds")
+COLUMN_DECIMALS = {"molecular_weight": 2, "logp": 2, "tpsa": 2, "qed": 3}
+
+# Lipinski rule of five 기준 (열 이름, 상한)
+LIPINSKI_RULES = {
+    "mw_under_500": ("molecular_weight", 500.0),
+    "logp_under_5": ("logp", 5.0),
+    "hbd_under_5": ("hbd", 5.0),
+    "hba_under_10": ("hba", 10.0),
+}
+
+
+@dataclass
+class PropertyTable:
+    """열 단위(column-per-descriptor) 속성 계산 결과"""
+
+    smiles: List[str]
+    canonical: List[Optional[str]]
+    errors: List[Optional[str]]
+    values: np.ndarray  # (n, len(PROPERTY_COLUMNS)) float64, 실패 행은 NaN
+
+    @property
+    def valid(self) -> np.ndarray:
+        """행별 파싱 성공 여부"""
+        return np.array([error is None for error in self.errors], dtype=bool)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, PROPERTY_COLUMNS.index(name)]
+
+    def lipinski_flags(self) -> Dict[str, np.ndarray]:
+        """규칙별 통과 여부 (n,) bool 배열 (실패 행은 False)"""
+        return {
+            rule: self.column(column) <= limit
+            for rule, (column, limit) in LIPINSKI_RULES.items()
+        }
+
+    def lipinski_violations(self) -> np.ndarray:
+        """행별 Lipinski 위반 수"""
+        flags = self.lipinski_flags()
+        return len(flags) - np.sum(list(flags.values()), axis=0, dtype=np.int64)
+
+    def row(self, i: int) -> dict:
+        """i번째 분자의 속성 dict (GET /{smiles}/properties 응답 형식)"""
+        result = {"smiles": self.smiles[i]}
+        for j, name in enumerate(PROPERTY_COLUMNS):
+            value = float(self.values[i, j])
+            result[name] = int(value) if name in INTEGER_COLUMNS else round(value, COLUMN_DECIMALS[name])
+        flags = self.lipinski_flags()
+        result["lipinski_violations"] = int(self.lipinski_violations()[i])
+        result["lipinski_rules"] = {rule: bool(flag[i]) for rule, flag in flags.items()}
+        return result
+
+    def columns(self) -> Dict[str, list]:
+        """열 이름 → 값 리스트 (실패 행은 None)"""
+        invalid = np.flatnonzero(~self.valid).tolist()
+        columns: Dict[str, list] = {
+            "smiles": self.smiles,
+            "canonical_smiles": self.canonical,
+            "valid": self.valid.tolist(),
+        }
+        derived = {
+            **self.lipinski_flags(),
+            "lipinski_violations": self.lipinski_violations(),
+        }
+        for name in PROPERTY_COLUMNS:
+            column = self.column(name)
+            if name in INTEGER_COLUMNS:
+                values = np.nan_to_num(column).astype(np.int64).tolist()
+            else:
+                values = np.round(column, COLUMN_DECIMALS[name]).tolist()
+            for i in invalid:
+                values[i] = None
+            columns[name] = values
+        for name, column in derived.items():
+            values = column.tolist()
+            for i in invalid:
+                values[i] = None
+            columns[name] = values
+        return columns
+
+    def to_json(self) -> bytes:
+        """열 단위 JSON 직렬화"""
+        errors = [
+            {"index": i, "smiles": self.smiles[i], "error": error}
+            for i, error in enumerate(self.errors)
+            if error is not None
+        ]
+        payload = {
+            "status": "success",
+            "num_molecules": len(self.smiles),
+            "num_valid": len(self.smiles) - len(errors),
+            "columns": self.columns(),
+            "errors": errors,
+        }
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def to_arrow(self) -> bytes:
+        """Arrow IPC stream 직렬화 (pyarrow 필요)"""
+        if pa is None:
+            raise RuntimeError("Arrow 포맷을 사용하려면 pyarrow를 설치해야 합니다")
+        valid = self.valid
+        arrays = {
+            "smiles": pa.array(self.smiles, pa.string()),
+            "canonical_smiles": pa.array(self.canonical, pa.string()),
+            "valid": pa.array(valid),
+            "error": pa.array(self.errors, pa.string()),
+        }
+        for name in PROPERTY_COLUMNS:
+            column = self.column(name)
+            if name in INTEGER_COLUMNS:
+                arrays[name] = pa.array(np.nan_to_num(column).astype(np.int32), mask=~valid)
+            else:
+                arrays[name] = pa.array(column, mask=~valid)
+        for rule, flag in self.lipinski_flags().items():
+            arrays[rule] = pa.array(flag, mask=~valid)
+        arrays["lipinski_violations"] = pa.array(self.lipinski_violations().astype(np.int32), mask=~valid)
+
+        table = pa.table(arrays)
+        sink = pa.BufferOutputStream()
+        with pa_ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+def compute_properties(smiles_list: List[str]) -> PropertyTable:
+    """
+    SMILES 리스트의 속성을 한 번에 계산
+
+    Args:
+        smiles_list: SMILES 문자열 리스트
+
+    Returns:
+        PropertyTable (입력 순서 유지, 실패 항목은 errors에 기록)
+
+    Note:
+        QED의 구조 경고(structural alert) 매칭과 파싱이 분자당 비용 대부분을
+        차지하므로 같은 문자열은 한 번만 파싱하고, canonical SMILES가 같은
+        분자는 한 번만 계산한다.
+    """
+    # 같은 문자열은 한 번만 파싱/계산한 뒤 입력 순서대로 펼친다
+    unique_index: Dict[str, int] = {}
+    inverse = np.fromiter(
+        (unique_index.setdefault(smiles, len(unique_index)) for smiles in smiles_list),
+        dtype=np.int64,
+        count=len(smiles_list),
+    )
+    unique_smiles = list(unique_index)
+    mols, unique_errors = parse_smiles_batch(unique_smiles)
+    values = np.full((len(mols), len(PROPERTY_COLUMNS)), np.nan, dtype=np.float64)
+    unique_canonical: List[Optional[str]] = [None] * len(mols)
+
+    # 표기만 다른 중복 분자는 처음 나온 행의 계산 결과를 복사
+    first_row: Dict[str, int] = {}
+    for i, mol in enumerate(mols):
+        if mol is None:
+            continue
+        unique_canonical[i] = canonical_smiles(mol)
+        j = first_row.setdefault(unique_canonical[i], i)
+        if j != i:
+            values[i] = values[j]
+            continue
+        qed_properties = QED.properties(mol)
+        values[i] = (
+            qed_properties.MW,
+            qed_properties.ALOGP,
+            qed_properties.PSA,
+            Lipinski.NumHDonors(mol),
+            Lipinski.NumHAcceptors(mol),
+            qed_properties.ROTB,
+            QED.qed(mol, qedProperties=qed_properties),
+        )
+
+    return PropertyTable(
+        smiles=list(smiles_list),
+        canonical=[unique_canonical[i] for i in inverse.tolist()],
+        errors=[unique_errors[i] for i in inverse.tolist()],
+        values=values[inverse],
+    )
+
+
+def property_row(smiles: str) -> dict:
+    """단일 SMILES 속성 dict (계산 워커에서 실행)"""
+    return compute_properties([smiles]).row(0)
+
+
+def property_payload(smiles_list: List[str], fmt: str = "json") -> bytes:
+    """직렬화까지 마친 열 단위 속성 응답 본문 (계산 워커에서 실행)"""
+    table = compute_properties(smiles_list)
+    return table.to_arrow() if fmt == "arrow" else table.to_json()
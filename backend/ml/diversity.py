@@ -0,0 +1,381 @@
+"""
+다양성 선택 (MaxMin picking, Butina clustering)
+
+비트 패킹 fingerprint (n, n_bits/64) uint64 행렬 위에서 Tanimoto 거리를
+popcount로 벡터화 계산한다. 전체 n×n 거리 행렬은 만들지 않는다.
+
+    maxmin_pick       이미 고른 분자까지의 최근접 유사도가 가장 낮은 후보를 하나씩 추가
+                      (후보별 최근접 유사도 하한만 O(n) 메모리로 유지하고, 하한이 가장 낮은
+                      MAXMIN_POOL_ROWS개만 최신 상태로 갱신하는 lazy 방식 - 고른 순서의 앞부분은
+                      그 자체로 더 적은 개수의 MaxMin 결과)
+    neighbor_graph    유사도 >= cutoff 인 이웃 목록 (CSR, popcount 정렬 + Swamidass–Baldi 상한으로 블록 가지치기)
+    butina_clusters   이웃 수가 많은 분자부터 아직 배정되지 않은 이웃을 묶는 Butina 클러스터링
+    select_batch      MoleculeBatch에서 다양한 부분집합 선택 (같은 SMILES는 한 번만 계산)
+    select_rows       select_batch와 같은 선택의 행 번호 (원래 순서)
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .chem import parse_smiles
+from .fingerprint_index import DEFAULT_N_BITS, DEFAULT_RADIUS, morgan_fingerprints, popcount_rows
+from .molecule_batch import MoleculeBatch
+
+METHODS = ("maxmin", "butina")
+
+# Butina에서 같은 클러스터로 묶는 기본 최소 유사도
+DEFAULT_BUTINA_CUTOFF = 0.6
+
+# Butina 이웃 그래프를 만들 수 있는 최대 후보 수 (계산량이 후보 수의 제곱에 비례)
+BUTINA_MAX_CANDIDATES = 100_000
+
+# MaxMin에서 최신 상태로 유지하는 후보 수
+MAXMIN_POOL_ROWS = 4096
+
+# 한 번에 처리하는 uint64 워드 수 (fingerprint 하나와 비교할 때)
+_PAIR_BLOCK = 1 << 22
+
+# tanimoto_matrix에서 한 번에 풀어 놓는 비트 수 (행 블록당, float32)
+_UNPACKED_BLOCK = 1 << 23
+
+# 이웃 그래프 계산 시 한 번에 비교하는 행/열 수
+_GRAPH_ROWS = 1024
+_GRAPH_COLUMNS = 8192
+
+
+def _unpack(words: np.ndarray) -> np.ndarray:
+    """(n, n_words) uint64 → (n, n_bits) float32 0/1"""
+    return np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1, bitorder="little").astype(np.float32)
+
+
+def tanimoto_matrix(a: np.ndarray, a_counts: np.ndarray, b: np.ndarray, b_counts: np.ndarray) -> np.ndarray:
+    """
+    두 fingerprint 집합 사이의 Tanimoto 유사도 행렬
+
+    공통 비트 수는 0/1 float32 행렬 곱으로 계산한다 (BLAS, 비트 수 <= 2^24이므로 정확).
+    행/열을 블록으로 나눠 풀어 놓은 비트 행렬의 메모리를 제한한다.
+
+    Args:
+        a, b: (n, n_words) / (m, n_words) uint64
+        a_counts, b_counts: 행별 popcount
+
+    Returns:
+        (n, m) float64 (두 fingerprint가 모두 비어 있으면 0 - FingerprintIndex.search와 같음)
+    """
+    out = np.zeros((len(a), len(b)), dtype=np.float64)
+    step = max(1, _UNPACKED_BLOCK // (a.shape[1] * 64))
+    a_counts = np.asarray(a_counts, dtype=np.float64)
+    b_counts = np.asarray(b_counts, dtype=np.float64)
+    for column in range(0, len(b), step):
+        b_bits = _unpack(b[column:column + step])
+        for row in range(0, len(a), step):
+            common = _unpack(a[row:row + step]) @ b_bits.T
+            union = a_counts[row:row + step, None] + b_counts[None, column:column + step] - common
+            np.divide(common, union, out=out[row:row + step, column:column + step], where=union > 0)
+    return out
+
+
+def _similarities_to(fingerprints: np.ndarray, counts: np.ndarray, query: np.ndarray, query_count: int) -> np.ndarray:
+    """모든 행과 fingerprint 하나 사이의 Tanimoto 유사도 (블록 단위)"""
+    out = np.empty(len(fingerprints), dtype=np.float64)
+    step = max(1, _PAIR_BLOCK // fingerprints.shape[1])
+    for start in range(0, len(fingerprints), step):
+        common = popcount_rows(fingerprints[start:start + step] & query)
+        union = counts[start:start + step] + query_count - common
+        out[start:start + step] = np.divide(common, union, out=np.zeros(len(common)), where=union > 0)
+    return out
+
+
+@dataclass
+class MaxMinResult:
+    """MaxMin 선택 결과 (고른 순서)"""
+
+    indices: np.ndarray
+    # 고를 당시 이미 고른 분자 중 가장 가까운 것과의 유사도 (첫 선택은 0)
+    nearest_similarities: np.ndarray
+    # 후보 × 고른 분자 유사도 계산 횟수 (전체 갱신 시 num_candidates × num_picked)
+    num_evaluations: int
+
+
+def maxmin_pick(
+    fingerprints: np.ndarray,
+    num_picks: int,
+    first: int = 0,
+    max_similarity: Optional[float] = None,
+    pool_rows: int = MAXMIN_POOL_ROWS,
+) -> MaxMinResult:
+    """
+    MaxMin 다양성 선택
+
+    매 단계 이미 고른 분자까지의 최근접 유사도가 가장 낮은 후보를 고른다.
+    후보별 최근접 유사도는 고른 분자가 늘수록 커지기만 하므로, 예전에 계산한 값은
+    하한으로 쓸 수 있다. 하한이 가장 낮은 pool_rows개만 새로 고른 분자와 비교해 최신
+    상태로 유지하고, 그 밖의 후보는 하한이 pool의 최솟값보다 낮아질 때만 (pool을 다시
+    뽑을 때) 그 사이에 고른 분자와 비교한다. 매 단계 고르는 후보는 모든 후보를 갱신하는
+    방식과 같다 (최근접 유사도가 같은 후보 사이의 순서만 다를 수 있음).
+
+    Args:
+        fingerprints: (n, n_words) uint64
+        num_picks: 고를 개수
+        first: 첫 선택 행
+        max_similarity: 최근접 유사도가 이 값보다 큰 후보만 남으면 중단 (생략 시 num_picks개까지)
+        pool_rows: 최신 상태로 유지하는 후보 수
+
+    Returns:
+        MaxMinResult
+    """
+    fingerprints = np.ascontiguousarray(fingerprints, dtype=np.uint64)
+    n = len(fingerprints)
+    num_picks = min(num_picks, n)
+    if num_picks <= 0:
+        return MaxMinResult(np.empty(0, dtype=np.int64), np.empty(0), 0)
+    if not 0 <= first < n:
+        raise IndexError(first)
+
+    counts = popcount_rows(fingerprints)
+    picks = np.empty(num_picks, dtype=np.int64)
+    nearest = np.zeros(num_picks, dtype=np.float64)
+    picks[0] = first
+    num_picked = 1
+
+    # 후보별 최근접 유사도 하한과, 그 값이 반영한 고른 분자 수 (고른 후보는 inf)
+    bound = _similarities_to(fingerprints, counts, fingerprints[first], int(counts[first]))
+    seen = np.ones(n, dtype=np.int32)
+    bound[first] = np.inf
+    evaluations = n
+
+    def refresh(rows: np.ndarray) -> int:
+        """rows를 지금까지 고른 모든 분자와 비교해 최신 상태로 (같은 seen끼리 묶어 계산)"""
+        done = 0
+        stale = rows[seen[rows] < num_picked]
+        for start in np.unique(seen[stale]).tolist():
+            group = stale[seen[stale] == start]
+            chosen = picks[start:num_picked]
+            sims = tanimoto_matrix(fingerprints[group], counts[group], fingerprints[chosen], counts[chosen])
+            bound[group] = np.maximum(bound[group], sims.max(axis=1))
+            done += sims.size
+        seen[rows] = num_picked
+        return done
+
+    def rebuild() -> Tuple[np.ndarray, float]:
+        """하한이 가장 낮은 후보로 pool 구성 후 최신 상태로 갱신 (pool 밖 하한의 최솟값도 반환)"""
+        nonlocal evaluations
+        remaining = n - num_picked
+        if remaining <= pool_rows:
+            pool, outside = np.flatnonzero(np.isfinite(bound)), np.inf
+        else:
+            part = np.argpartition(bound, pool_rows)
+            pool, outside = part[:pool_rows], float(bound[part[pool_rows]])
+        evaluations += refresh(pool)
+        return pool, outside
+
+    pool, outside = rebuild()
+    # 매 선택마다 pool 전체와 비교하므로 pool fingerprint는 연속 배열로 복사해 둠
+    pool_fps, pool_counts = fingerprints[pool], counts[pool]
+    while num_picked < num_picks:
+        best = int(np.argmin(bound[pool])) if len(pool) else -1
+        # pool 밖 후보의 실제 값은 하한 이상이므로, pool 최솟값이 그보다 크면 pool을 다시 뽑음
+        if best < 0 or bound[pool[best]] > outside:
+            pool, outside = rebuild()
+            pool_fps, pool_counts = fingerprints[pool], counts[pool]
+            continue
+        candidate = int(pool[best])
+        if max_similarity is not None and bound[candidate] > max_similarity:
+            break
+
+        picks[num_picked], nearest[num_picked] = candidate, bound[candidate]
+        num_picked += 1
+        bound[candidate] = np.inf
+        pool = np.delete(pool, best)
+        pool_fps, pool_counts = np.delete(pool_fps, best, axis=0), np.delete(pool_counts, best)
+        if len(pool):
+            sims = _similarities_to(pool_fps, pool_counts, fingerprints[candidate], int(counts[candidate]))
+            bound[pool] = np.maximum(bound[pool], sims)
+            seen[pool] = num_picked
+            evaluations += len(pool)
+
+    return MaxMinResult(picks[:num_picked], nearest[:num_picked], evaluations)
+
+
+def neighbor_graph(fingerprints: np.ndarray, cutoff: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    유사도 >= cutoff 인 이웃 목록 (자기 자신 제외)
+
+    행을 popcount 순으로 정렬한 뒤 블록마다 Swamidass–Baldi 상한
+    (|B| <= |A|/cutoff) 범위의 열만 비교한다.
+
+    Returns:
+        (indptr, indices) CSR - 행 i의 이웃은 indices[indptr[i]:indptr[i + 1]] (행 번호 오름차순)
+    """
+    if not 0 < cutoff <= 1:
+        raise ValueError(f"cutoff는 0 초과 1 이하여야 합니다: {cutoff}")
+    fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+    n = len(fingerprints)
+    counts = popcount_rows(fingerprints) if n else np.empty(0, dtype=np.int32)
+    order = np.argsort(counts, kind="stable")
+    fps, sorted_counts = np.ascontiguousarray(fingerprints[order]), counts[order]
+
+    # 정렬 위치 p < q 쌍만 계산하고 (q의 popcount는 p 이상이므로 블록 시작 이후 열만 비교) 양방향으로 추가
+    sources, targets = [], []
+    for start in range(0, n, _GRAPH_ROWS):
+        stop = min(start + _GRAPH_ROWS, n)
+        high = np.searchsorted(sorted_counts, np.floor(sorted_counts[stop - 1] / cutoff + 1e-9), side="right")
+        for column in range(start, high, _GRAPH_COLUMNS):
+            column_stop = min(column + _GRAPH_COLUMNS, high)
+            sims = tanimoto_matrix(
+                fps[start:stop], sorted_counts[start:stop], fps[column:column_stop], sorted_counts[column:column_stop]
+            )
+            rows, columns = np.nonzero(sims >= cutoff)
+            keep = column + columns > start + rows
+            rows, columns = order[start + rows[keep]], order[column + columns[keep]]
+            sources += [rows, columns]
+            targets += [columns, rows]
+
+    sources = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+    targets = np.concatenate(targets) if targets else np.empty(0, dtype=np.int64)
+    edge_order = np.lexsort((targets, sources))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return indptr, targets[edge_order]
+
+
+@dataclass
+class ButinaResult:
+    """Butina 클러스터링 결과 (클러스터 번호 = 만들어진 순서)"""
+
+    centroids: np.ndarray
+    labels: np.ndarray
+    sizes: np.ndarray
+
+
+def butina_clusters(fingerprints: np.ndarray, cutoff: float = DEFAULT_BUTINA_CUTOFF) -> ButinaResult:
+    """
+    Butina 클러스터링
+
+    이웃(유사도 >= cutoff) 수가 많은 분자부터 (같으면 행 번호 순) 중심으로 삼고,
+    아직 배정되지 않은 이웃을 같은 클러스터로 묶는다.
+
+    Raises:
+        ValueError: 후보가 BUTINA_MAX_CANDIDATES보다 많거나 cutoff가 범위를 벗어날 때
+    """
+    n = len(fingerprints)
+    if n > BUTINA_MAX_CANDIDATES:
+        raise ValueError(f"Butina 클러스터링은 최대 {BUTINA_MAX_CANDIDATES:,}개 후보까지 지원합니다 (요청: {n:,})")
+    indptr, indices = neighbor_graph(fingerprints, cutoff)
+    degrees = np.diff(indptr)
+    labels = np.full(n, -1, dtype=np.int64)
+    centroids, sizes = [], []
+    for row in np.lexsort((np.arange(n), -degrees)).tolist():
+        if labels[row] >= 0:
+            continue
+        members = indices[indptr[row]:indptr[row + 1]]
+        members = members[labels[members] < 0]
+        labels[row] = len(centroids)
+        labels[members] = len(centroids)
+        centroids.append(row)
+        sizes.append(len(members) + 1)
+    return ButinaResult(np.array(centroids, dtype=np.int64), labels, np.array(sizes, dtype=np.int64))
+
+
+def _select(
+    batch: MoleculeBatch, num_picks: int, method: str, similarity_cutoff: Optional[float], radius: int, n_bits: int
+) -> Tuple[np.ndarray, dict, dict]:
+    """select_batch 본체 - (고른 행 번호 (고른 순서), 추가 컬럼, 통계)"""
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 다양성 방법: {method} (가능: {', '.join(METHODS)})")
+
+    smiles = batch.smiles_list()
+    unique_rows = {}
+    inverse = np.fromiter((unique_rows.setdefault(text, len(unique_rows)) for text in smiles), dtype=np.int64, count=len(smiles))
+    # 고유 SMILES 번호는 처음 나온 순서로 매겨지므로 첫 등장 행이 대표 행
+    representatives = np.unique(inverse, return_index=True)[1]
+
+    mols = []
+    for text in unique_rows:
+        mol = parse_smiles(text)
+        if mol is None:
+            raise ValueError(f"유효하지 않은 SMILES: {text}")
+        mols.append(mol)
+    fingerprints = morgan_fingerprints(mols, radius, n_bits) if mols else np.empty((0, n_bits // 64), dtype=np.uint64)
+    stats = {"method": method, "num_candidates": len(batch), "num_unique": len(unique_rows)}
+
+    if method == "maxmin":
+        result = maxmin_pick(fingerprints, num_picks, max_similarity=similarity_cutoff)
+        rows, nearest = representatives[result.indices], result.nearest_similarities
+        missing = num_picks - len(rows)
+        if missing > 0 and (similarity_cutoff is None or similarity_cutoff >= 1.0):
+            duplicates = np.setdiff1d(np.arange(len(batch)), rows, assume_unique=True)[:missing]
+            rows = np.concatenate([rows, duplicates])
+            nearest = np.concatenate([nearest, np.ones(len(duplicates))])
+        extra = {"nearest_similarity": nearest}
+        stats["num_evaluations"] = result.num_evaluations
+    else:
+        cutoff = DEFAULT_BUTINA_CUTOFF if similarity_cutoff is None else similarity_cutoff
+        clusters = butina_clusters(fingerprints, cutoff)
+        picked = clusters.centroids[:num_picks]
+        rows = representatives[picked]
+        sizes = np.bincount(clusters.labels[inverse], minlength=len(clusters.centroids))
+        extra = {"cluster": np.arange(len(picked), dtype=np.int64), "cluster_size": sizes[:len(picked)]}
+        stats["num_clusters"] = len(clusters.centroids)
+        stats["similarity_cutoff"] = cutoff
+
+    stats["num_picked"] = len(rows)
+    return rows, extra, stats
+
+
+def select_batch(
+    batch: MoleculeBatch,
+    num_picks: int,
+    method: str = "maxmin",
+    similarity_cutoff: Optional[float] = None,
+    radius: int = DEFAULT_RADIUS,
+    n_bits: int = DEFAULT_N_BITS,
+) -> Tuple[MoleculeBatch, dict]:
+    """
+    분자 배치에서 구조적으로 다양한 부분집합 선택
+
+    같은 SMILES는 fingerprint를 한 번만 계산하고 처음 나온 행으로 대표한다.
+
+    method="maxmin": 첫 행의 구조에서 시작해 MaxMin 순서로 고른다. similarity_cutoff가
+        있으면 이미 고른 분자와 그보다 더 유사한 후보만 남았을 때 멈춘다. 서로 다른
+        구조를 모두 고른 뒤에도 모자라면 (cutoff가 없거나 1일 때) 남은 중복 행을 순서대로 채운다.
+    method="butina": similarity_cutoff (기본 DEFAULT_BUTINA_CUTOFF)로 클러스터링한 뒤
+        큰 클러스터부터 중심 분자를 하나씩 고른다 (클러스터 크기는 중복 행 포함).
+
+    Args:
+        batch: 후보 배치
+        num_picks: 고를 최대 개수
+        method: "maxmin" 또는 "butina"
+        similarity_cutoff: 위 설명 참고
+        radius, n_bits: Morgan fingerprint 설정
+
+    Returns:
+        (pick, index (batch 행 번호)[, nearest_similarity | cluster, cluster_size] 컬럼이 붙은
+        선택 배치 (고른 순서), 통계 dict)
+
+    Raises:
+        ValueError: 알 수 없는 방법, 유효하지 않은 SMILES, Butina 후보 수 초과
+    """
+    rows, extra, stats = _select(batch, num_picks, method, similarity_cutoff, radius, n_bits)
+    selected = batch.take(rows).with_columns(pick=np.arange(1, len(rows) + 1, dtype=np.int64), index=rows, **extra)
+    return selected, stats
+
+
+def select_rows(
+    batch: MoleculeBatch,
+    num_picks: int,
+    method: str = "maxmin",
+    similarity_cutoff: Optional[float] = None,
+    radius: int = DEFAULT_RADIUS,
+    n_bits: int = DEFAULT_N_BITS,
+) -> Tuple[np.ndarray, dict]:
+    """
+    select_batch와 같은 선택을 하되 행 번호만 원래 순서로 반환 (생성 순서/유사도 순서 유지용)
+
+    Returns:
+        (선택된 행 번호 오름차순, 통계 dict)
+    """
+    rows, _, stats = _select(batch, num_picks, method, similarity_cutoff, radius, n_bits)
+    return np.sort(rows), stats
@@ -0,0 +1,44 @@
+"""
+분자 → 특성 벡터 변환 (ADMET 모델 입력)
+"""
+
+from typing import Sequence
+
+import numpy as np
+from rdkit import Chem
+from rdkit.Chem import Crippen, Descriptors, Lipinski, rdMolDescriptors
+
+# 모델 입력 특성 순서 (reference 모델 JSON의 "features"와 동일해야 함)
+FEATURE_NAMES = (
+    "molecular_weight",
+    "logp",
+    "tpsa",
+    "hbd",
+    "hba",
+    "rotatable_bonds",
+    "aromatic_rings",
+)
+
+
+def descriptor_matrix(mols: Sequence[Chem.Mol]) -> np.ndarray:
+    """
+    분자 리스트의 기술자(descriptor) 행렬 계산
+
+    Args:
+        mols: 파싱된 RDKit Mol 리스트
+
+    Returns:
+        (분자 수, len(FEATURE_NAMES)) float64 행렬
+    """
+    features = np.empty((len(mols), len(FEATURE_NAMES)), dtype=np.float64)
+    for i, mol in enumerate(mols):
+        features[i] = (
+            Descriptors.MolWt(mol),
+            Crippen.MolLogP(mol),
+            rdMolDescriptors.CalcTPSA(mol),
+            Lipinski.NumHDonors(mol),
+            Lipinski.NumHAcceptors(mol),
+            Lipinski.NumRotatableBonds(mol),
+            rdMolDescriptors.CalcNumAromaticRings(mol),
+        )
+    return features
@@ -0,0 +1,177 @@
+"""
+비트 패킹 fingerprint 인덱스 (Tanimoto 유사도 검색)
+
+Morgan fingerprint를 uint64 행렬 (분자 수 × n_bits/64)에 연속 저장하고,
+popcount 기반으로 Tanimoto를 벡터화 계산한다.
+
+행은 popcount 순으로 정렬해 두어, 임계값 t에 대해 Swamidass–Baldi 상한
+    Tanimoto(A, B) <= min(|A|, |B|) / max(|A|, |B|)
+을 만족할 수 없는 후보 (|B| < t·|A| 또는 |B| > |A|/t)를 이진 탐색 한 번으로
+통째로 건너뛴다.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+from rdkit import Chem, DataStructs
+from rdkit.Chem import rdFingerprintGenerator
+
+DEFAULT_RADIUS = 2
+DEFAULT_N_BITS = 2048
+
+# 한 번에 처리하는 후보 행 수 (임시 배열 메모리 상한)
+SEARCH_CHUNK_ROWS = 65536
+
+# numpy < 2.0에는 np.bitwise_count가 없으므로 16비트 lookup table 사용
+_POPCOUNT_16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+
+
+def popcount_rows(words: np.ndarray) -> np.ndarray:
+    """
+    행 단위 popcount
+
+    Args:
+        words: (n, n_words) uint64 행렬
+
+    Returns:
+        (n,) int32 - 행별 1비트 개수
+    """
+    words = np.ascontiguousarray(words)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int32)
+    halves = words.view(np.uint16).reshape(len(words), -1)
+    return _POPCOUNT_16[halves].sum(axis=1, dtype=np.int32)
+
+
+def morgan_fingerprints(
+    mols: Sequence[Chem.Mol],
+    radius: int = DEFAULT_RADIUS,
+    n_bits: int = DEFAULT_N_BITS,
+) -> np.ndarray:
+    """
+    Morgan fingerprint를 uint64로 패킹
+
+    Args:
+        mols: RDKit Mol 리스트
+        radius: Morgan 반경
+        n_bits: 비트 수 (64의 배수)
+
+    Returns:
+        (분자 수, n_bits // 64) uint64 행렬
+    """
+    if n_bits % 64:
+        raise ValueError("n_bits는 64의 배수여야 합니다")
+
+    generator = rdFingerprintGenerator.GetMorganGenerator(radius=radius, fpSize=n_bits)
+    bits = np.zeros((len(mols), n_bits), dtype=np.uint8)
+    for i, mol in enumerate(mols):
+        DataStructs.ConvertToNumpyArray(generator.GetFingerprint(mol), bits[i])
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+@dataclass
+class SearchResult:
+    """유사도 검색 결과 (유사도 내림차순)"""
+
+    ids: np.ndarray
+    similarities: np.ndarray
+    num_candidates: int
+    num_indexed: int
+
+
+class FingerprintIndex:
+    """popcount 정렬된 메모리 내 fingerprint 인덱스"""
+
+    def __init__(self, fingerprints: np.ndarray, ids: Optional[np.ndarray] = None):
+        """
+        Args:
+            fingerprints: (n, n_words) uint64 패킹된 fingerprint
+            ids: 각 행의 레코드 ID (기본: 0..n-1)
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        if fingerprints.ndim != 2:
+            raise ValueError("fingerprints는 2차원 (n, n_words) 배열이어야 합니다")
+        ids = np.arange(len(fingerprints), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+
+        counts = popcount_rows(fingerprints)
+        order = np.argsort(counts, kind="stable")
+        self.fingerprints = np.ascontiguousarray(fingerprints[order])
+        self.counts = counts[order]
+        self.ids = ids[order]
+        self.n_bits = fingerprints.shape[1] * 64
+
+    @classmethod
+    def from_sorted(cls, fingerprints: np.ndarray, counts: np.ndarray, ids: np.ndarray) -> "FingerprintIndex":
+        """
+        이미 popcount 순으로 정렬된 배열로 인덱스 생성 (복사 없음, memmap 사용 가능)
+
+        Args:
+            fingerprints: popcount 오름차순 (n, n_words) uint64
+            counts: 각 행의 popcount
+            ids: 각 행의 레코드 ID
+        """
+        index = cls.__new__(cls)
+        index.fingerprints = fingerprints
+        index.counts = counts
+        index.ids = ids
+        index.n_bits = fingerprints.shape[1] * 64
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """인덱스가 점유하는 배열 메모리 (bytes)"""
+        return self.fingerprints.nbytes + self.counts.nbytes + self.ids.nbytes
+
+    def search(self, query: np.ndarray, threshold: float = 0.7, limit: int = 10) -> SearchResult:
+        """
+        Tanimoto 유사도 top-k 검색
+
+        Args:
+            query: (n_words,) uint64 패킹된 query fingerprint
+            threshold: 최소 Tanimoto 유사도 (0.0-1.0)
+            limit: 반환할 최대 개수
+
+        Returns:
+            SearchResult (similarity >= threshold 인 상위 limit개)
+        """
+        if limit <= 0:
+            return SearchResult(np.empty(0, dtype=np.int64), np.empty(0), 0, len(self))
+
+        query = np.asarray(query, dtype=np.uint64).reshape(1, -1)
+        query_count = int(popcount_rows(query)[0])
+
+        # Swamidass–Baldi bound: t·|A| <= |B| <= |A|/t 범위 밖은 계산하지 않음
+        if threshold > 0 and query_count > 0:
+            low = np.searchsorted(self.counts, np.ceil(threshold * query_count - 1e-9), side="left")
+            high = np.searchsorted(self.counts, np.floor(query_count / threshold + 1e-9), side="right")
+        else:
+            low, high = 0, len(self)
+
+        best_ids = np.empty(0, dtype=np.int64)
+        best_sims = np.empty(0, dtype=np.float64)
+        for start in range(low, high, SEARCH_CHUNK_ROWS):
+            stop = min(start + SEARCH_CHUNK_ROWS, high)
+            common = popcount_rows(self.fingerprints[start:stop] & query)
+            union = self.counts[start:stop] + query_count - common
+            sims = np.divide(common, union, out=np.zeros(len(common)), where=union > 0)
+
+            hits = np.flatnonzero(sims >= threshold)
+            best_ids = np.concatenate([best_ids, self.ids[start:stop][hits]])
+            best_sims = np.concatenate([best_sims, sims[hits]])
+            # 청크마다 상위 limit개만 유지 (argpartition: 전체 정렬 불필요)
+            if len(best_sims) > limit:
+                keep = np.argpartition(-best_sims, limit - 1)[:limit]
+                best_ids, best_sims = best_ids[keep], best_sims[keep]
+
+        order = np.lexsort((best_ids, -best_sims))[:limit]
+        return SearchResult(
+            ids=best_ids[order],
+            similarities=best_sims[order],
+            num_candidates=int(high - low),
+            num_indexed=len(self),
+        )
@@ -0,0 +1,208 @@
+"""
+제약조건 기반 분자 생성 (벡터화 rejection sampling)
+
+후보를 NumPy 배열 단위로 한꺼번에 뽑고, 제약조건 범위를 boolean 마스크로
+걸러낸 뒤, 부족한 만큼만 다시 뽑는다. 전체 샘플 수(샘플링 예산)에 상한이
+있으므로 좁은 제약조건에서도 무한 루프에 빠지지 않는다.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .molecule_batch import INTEGER_COLUMNS, MoleculeBatch
+
+# 제약조건을 걸 수 있는 컬럼 ("<컬럼>_min", "<컬럼>_max" 키로 지정)
+CONSTRAINT_COLUMNS = ("molecular_weight", "logp", "tpsa", "hbd", "hba")
+
+# 샘플링 예산: 요청 분자 1개당 최대 후보 수 (최소 MIN_SAMPLE_BUDGET)
+SAMPLES_PER_MOLECULE = 50
+MIN_SAMPLE_BUDGET = 1000
+
+# 한 라운드에 뽑는 최대 후보 수 (스트리밍 시 메모리 상한)
+MAX_ROUND_SIZE = 65536
+
+# 시드 분자 대비 기술자 변동 폭 (±)
+JITTER = {"molecular_weight": 5.0, "logp": 0.3, "tpsa": 2.0}
+
+
+def parse_constraints(constraints: Optional[dict]) -> Dict[str, Tuple[float, float]]:
+    """
+    요청 constraints dict를 컬럼별 (최소, 최대) 범위로 변환
+
+    Args:
+        constraints: {"molecular_weight_min": 200, "logp_max": 5, ...}
+
+    Returns:
+        {컬럼: (최소, 최대)} - 지정되지 않은 경계는 -inf/inf
+
+    Raises:
+        ValueError: 알 수 없는 키, 숫자가 아닌 값, 최소 > 최대
+    """
+    bounds: Dict[str, Tuple[float, float]] = {}
+    for key, value in (constraints or {}).items():
+        column, _, side = key.rpartition("_")
+        if column not in CONSTRAINT_COLUMNS or side not in ("min", "max"):
+            raise ValueError(f"지원하지 않는 제약조건: {key}")
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"제약조건 값은 숫자여야 합니다: {key}={value!r}") from None
+        low, high = bounds.get(column, (-math.inf, math.inf))
+        bounds[column] = (value, high) if side == "min" else (low, value)
+
+    for column, (low, high) in bounds.items():
+        if low > high:
+            raise ValueError(f"{column}: 최소값({low})이 최대값({high})보다 큽니다")
+    return bounds
+
+
+@dataclass
+class CandidateBatch:
+    """후보 분자 배치 (컬럼별 배열)"""
+
+    rows: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def take(self, selector) -> "CandidateBatch":
+        """마스크/인덱스로 부분 배치 추출"""
+        return CandidateBatch(self.rows[selector], {k: v[selector] for k, v in self.columns.items()})
+
+    def to_molecules(self, catalog, start_index: int = 0) -> MoleculeBatch:
+        """
+        수락된 후보를 MoleculeBatch로 변환 (이름 = 시드 이름 + 일련번호)
+
+        Args:
+            catalog: 시드 행의 SMILES/이름을 가진 화합물 저장소
+            start_index: 일련번호 시작값 (첫 분자는 start_index + 1)
+        """
+        columns = {
+            name: values.astype(np.int32) if name in INTEGER_COLUMNS else values
+            for name, values in self.columns.items()
+        }
+        serial = np.arange(start_index + 1, start_index + 1 + len(self), dtype=np.int64)
+        return MoleculeBatch.from_catalog(catalog, self.rows, columns, name_serial=serial)
+
+
+@dataclass
+class GenerationStats:
+    """생성 통계 (수락률, 사용한 라운드 수)"""
+
+    num_requested: int
+    sample_budget: int = 0
+    num_sampled: int = 0
+    num_accepted: int = 0
+    rounds: int = 0
+    budget_exhausted: bool = False
+    constraints: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+    @property
+    def acceptance_rate(self) -> Optional[float]:
+        return self.num_accepted / self.num_sampled if self.num_sampled else None
+
+    def to_dict(self) -> dict:
+        rate = self.acceptance_rate
+        return {
+            "num_requested": self.num_requested,
+            "num_sampled": self.num_sampled,
+            "num_accepted": self.num_accepted,
+            "acceptance_rate": round(rate, 4) if rate is not None else None,
+            "rounds": self.rounds,
+            "sample_budget": self.sample_budget,
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+def sample_candidates(catalog, seed_rows: np.ndarray, size: int, rng: np.random.Generator) -> CandidateBatch:
+    """
+    시드 분자에 변동을 준 후보를 한 번에 생성
+
+    Args:
+        catalog: 기술자 컬럼을 제공하는 화합물 저장소
+        seed_rows: 시드로 사용할 카탈로그 행 번호
+        size: 후보 개수
+        rng: 난수 생성기
+
+    Returns:
+        CandidateBatch
+    """
+    rows = rng.choice(np.asarray(seed_rows), size=size)
+    columns = {}
+    for column in CONSTRAINT_COLUMNS:
+        values = np.asarray(catalog[column], dtype=np.float64)[rows]
+        if column in JITTER:
+            values = values + rng.uniform(-JITTER[column], JITTER[column], size=size)
+        columns[column] = values
+    columns["binding_affinity"] = rng.uniform(0.1, 1.0, size=size)
+    columns["synthesis_score"] = rng.uniform(0.6, 1.0, size=size)
+    return CandidateBatch(rows, columns)
+
+
+def constraint_mask(batch: CandidateBatch, bounds: Dict[str, Tuple[float, float]]) -> np.ndarray:
+    """제약조건을 모두 만족하는 후보 마스크"""
+    mask = np.ones(len(batch), dtype=bool)
+    for column, (low, high) in bounds.items():
+        values = batch.columns[column]
+        mask &= (values >= low) & (values <= high)
+    return mask
+
+
+def iter_constrained_batches(
+    catalog,
+    seed_rows: np.ndarray,
+    num_molecules: int,
+    constraints: Optional[dict] = None,
+    rng: Optional[np.random.Generator] = None,
+    stats: Optional[GenerationStats] = None,
+) -> Iterator[CandidateBatch]:
+    """
+    제약조건을 만족하는 후보 배치를 num_molecules개가 될 때까지 생성
+
+    라운드마다 지금까지의 수락률로 필요한 후보 수를 추정해 한 번에 뽑고
+    마스크로 걸러낸다. 라운드 크기는 남은 예산과 MAX_ROUND_SIZE로 제한하고
+    라운드 수에는 상한이 없으며, 샘플링 예산을 다 쓰면 그때까지 수락된
+    분자만 반환한다 (stats.budget_exhausted = True).
+
+    Args:
+        catalog: 화합물 저장소
+        seed_rows: 시드 행 번호
+        num_molecules: 목표 분자 개수
+        constraints: 요청 constraints dict
+        rng: 난수 생성기
+        stats: 진행 통계를 기록할 GenerationStats (선택)
+
+    Yields:
+        수락된 후보 배치 (합계 최대 num_molecules개)
+    """
+    bounds = parse_constraints(constraints)
+    rng = rng if rng is not None else np.random.default_rng()
+    budget = max(num_molecules * SAMPLES_PER_MOLECULE, MIN_SAMPLE_BUDGET)
+    if stats is None:
+        stats = GenerationStats(num_requested=num_molecules, sample_budget=budget)
+    stats.sample_budget, stats.constraints = budget, bounds
+
+    while stats.num_accepted < num_molecules:
+        remaining = num_molecules - stats.num_accepted
+        budget_left = budget - stats.num_sampled
+        if budget_left <= 0:
+            stats.budget_exhausted = True
+            return
+
+        # 관측된 수락률로 필요한 후보 수 추정 (10% 여유)
+        rate = stats.acceptance_rate if stats.num_sampled else 1.0
+        size = math.ceil(remaining / max(rate, 1.0 / SAMPLES_PER_MOLECULE) * 1.1) if bounds else remaining
+        size = max(1, min(size, budget_left, MAX_ROUND_SIZE))
+
+        batch = sample_candidates(catalog, seed_rows, size, rng)
+        accepted = batch.take(constraint_mask(batch, bounds)) if bounds else batch
+        stats.rounds += 1
+        stats.num_sampled += size
+        accepted = accepted.take(slice(0, remaining))
+        stats.num_accepted += len(accepted)
+        if len(accepted):
+            yield accepted
@@ -0,0 +1,285 @@
+"""
+ADMET model registry.
+
+Each ADMET endpoint (absorption, distribution, ...) is registered with a
+loader; the model itself is only loaded the first time that endpoint is used
+and then kept in a process-wide pool. Load time, retained memory and call
+counts are tracked per endpoint and reported through ``/models/stats``.
+Inference normally runs in compute worker processes, so each worker's
+:meth:`ModelRegistry.stats_snapshot` is sent back to the API process and
+merged there with :meth:`ModelRegistry.info`.
+
+Every endpoint ships with a small CPU-only reference model (a set of
+logistic heads over RDKit descriptors, see ``reference_models/``) so the
+service works and can be tested offline. Production models can replace them
+with :func:`ModelRegistry.register`.
+"""
+
+import json
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Protocol, Sequence
+
+import numpy as np
+
+from .featurization import FEATURE_NAMES
+
+REFERENCE_MODEL_DIR = Path(__file__).parent / "reference_models"
+
+ADMET_ENDPOINTS = ("absorption", "distribution", "metabolism", "excretion", "toxicity")
+
+
+class ADMETModel(Protocol):
+    """Interface every registered ADMET model implements."""
+
+    name: str
+    version: str
+    model_type: str
+
+    def predict(self, features: np.ndarray) -> Dict[str, np.ndarray]:
+        """Map a (n, len(FEATURE_NAMES)) descriptor matrix to named output columns."""
+        ...
+
+
+class LinearReferenceModel:
+    """Logistic-regression heads over standardized descriptors."""
+
+    def __init__(self, spec: dict):
+        if tuple(spec["features"]) != FEATURE_NAMES:
+            raise ValueError(f"Unexpected feature order in model '{spec['name']}'")
+
+        self.name = spec["name"]
+        self.version = spec["version"]
+        self.model_type = spec["type"]
+        self.features = list(spec["features"])
+        self._mean = np.asarray(spec["feature_mean"], dtype=np.float64)
+        self._std = np.asarray(spec["feature_std"], dtype=np.float64)
+
+        outputs = spec["outputs"]
+        self.output_names = list(outputs)
+        # All heads are evaluated with a single matrix product
+        self._weights = np.array([outputs[k]["weights"] for k in self.output_names]).T
+        self._bias = np.array([outputs[k]["bias"] for k in self.output_names])
+        self._binary = np.array([outputs[k]["kind"] == "binary" for k in self.output_names])
+        ranges = np.array([outputs[k].get("range", [0.0, 1.0]) for k in self.output_names])
+        self._low, self._high = ranges[:, 0], ranges[:, 1]
+
+    def predict(self, features: np.ndarray) -> Dict[str, np.ndarray]:
+        z = ((features - self._mean) / self._std) @ self._weights + self._bias
+        prob = 1.0 / (1.0 + np.exp(-z))
+        scaled = self._low + (self._high - self._low) * prob
+        return {
+            name: (prob[:, j] >= 0.5) if self._binary[j] else scaled[:, j]
+            for j, name in enumerate(self.output_names)
+        }
+
+
+def load_reference_model(endpoint: str) -> LinearReferenceModel:
+    """Load the bundled reference model for ``endpoint``."""
+    with open(REFERENCE_MODEL_DIR / f"{endpoint}.json", encoding="utf-8") as fh:
+        return LinearReferenceModel(json.load(fh))
+
+
+@dataclass
+class ModelStats:
+    """Runtime statistics of one registry entry."""
+
+    loaded: bool = False
+    load_time_ms: Optional[float] = None
+    memory_bytes: Optional[int] = None
+    call_count: int = 0
+    molecules_predicted: int = 0
+    total_predict_ms: float = 0.0
+    loaded_at: Optional[float] = None
+    last_used_at: Optional[float] = None
+
+
+def merge_stats(snapshots: Sequence[dict]) -> ModelStats:
+    """
+    Combine one endpoint's statistics from several processes.
+
+    Counters are summed, ``memory_bytes`` is the total retained by all
+    processes that loaded the model, ``load_time_ms`` the slowest load.
+    """
+    loaded = [s for s in snapshots if s["loaded"]]
+    load_times = [s["load_time_ms"] for s in snapshots if s["load_time_ms"] is not None]
+    loaded_at = [s["loaded_at"] for s in snapshots if s["loaded_at"] is not None]
+    last_used = [s["last_used_at"] for s in snapshots if s["last_used_at"] is not None]
+    return ModelStats(
+        loaded=bool(loaded),
+        load_time_ms=max(load_times, default=None),
+        memory_bytes=sum(s["memory_bytes"] or 0 for s in loaded) if loaded else None,
+        call_count=sum(s["call_count"] for s in snapshots),
+        molecules_predicted=sum(s["molecules_predicted"] for s in snapshots),
+        total_predict_ms=sum(s["total_predict_ms"] for s in snapshots),
+        loaded_at=min(loaded_at, default=None),
+        last_used_at=max(last_used, default=None),
+    )
+
+
+@dataclass
+class _Entry:
+    loader: Callable[[], ADMETModel]
+    metadata: dict
+    model: Optional[ADMETModel] = None
+    stats: ModelStats = field(default_factory=ModelStats)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    """Process-wide pool of lazily loaded ADMET models."""
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        # Bumped whenever any statistic changes, so workers only report changed stats
+        self.revision = 0
+
+    def register(self, endpoint: str, loader: Callable[[], ADMETModel], **metadata) -> None:
+        """Register (or replace) the loader for an endpoint; the old model is dropped."""
+        self._entries[endpoint] = _Entry(loader=loader, metadata=metadata)
+        self.revision += 1
+
+    @property
+    def endpoints(self):
+        return list(self._entries)
+
+    def get(self, endpoint: str) -> ADMETModel:
+        """Return the model for ``endpoint``, loading it on first use."""
+        try:
+            entry = self._entries[endpoint]
+        except KeyError:
+            raise KeyError(f"No model registered for endpoint '{endpoint}'") from None
+
+        if entry.model is None:
+            with entry.lock:
+                if entry.model is None:
+                    self._load(entry)
+        return entry.model
+
+    def _load(self, entry: _Entry) -> None:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            model = entry.loader()
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            after = tracemalloc.get_traced_memory()[0]
+            if not was_tracing:
+                tracemalloc.stop()
+
+        entry.stats.loaded = True
+        entry.stats.load_time_ms = elapsed_ms
+        entry.stats.memory_bytes = max(after - before, 0)
+        entry.stats.loaded_at = time.time()
+        entry.model = model
+        self.revision += 1
+
+    def predict(self, endpoint: str, features: np.ndarray) -> Dict[str, np.ndarray]:
+        """Run the endpoint's model on a descriptor matrix and record call stats."""
+        model = self.get(endpoint)
+        start = time.perf_counter()
+        outputs = model.predict(features)
+        stats = self._entries[endpoint].stats
+        stats.call_count += 1
+        stats.molecules_predicted += len(features)
+        stats.total_predict_ms += (time.perf_counter() - start) * 1000
+        stats.last_used_at = time.time()
+        self.revision += 1
+        return outputs
+
+    def warmup(self, endpoints: Optional[Iterable[str]] = None) -> None:
+        """Eagerly load the given endpoints (all registered ones by default)."""
+        for endpoint in endpoints if endpoints is not None else self.endpoints:
+            self.get(endpoint)
+
+    def unload(self, endpoint: str) -> None:
+        """Drop a loaded model from the pool; it is reloaded on next use."""
+        entry = self._entries[endpoint]
+        with entry.lock:
+            entry.model = None
+            entry.stats.loaded = False
+        self.revision += 1
+
+    def version_tag(self) -> str:
+        """Combined version string of all registered models (e.g. for cache keys)."""
+        return ";".join(
+            f"{endpoint}={entry.metadata.get('version', 'unknown')}"
+            for endpoint, entry in sorted(self._entries.items())
+        )
+
+    def metadata(self) -> Dict[str, dict]:
+        """Static metadata (name, version, features, ...) of every registered endpoint."""
+        return {endpoint: dict(entry.metadata) for endpoint, entry in self._entries.items()}
+
+    def stats_snapshot(self) -> Dict[str, dict]:
+        """Picklable copy of every endpoint's runtime statistics."""
+        return {endpoint: asdict(entry.stats) for endpoint, entry in self._entries.items()}
+
+    def info(self, snapshots: Optional[Sequence[Dict[str, dict]]] = None) -> Dict[str, dict]:
+        """
+        Metadata plus runtime statistics for every registered endpoint.
+
+        Args:
+            snapshots: :meth:`stats_snapshot` results of the processes that run
+                inference (e.g. compute pool workers). When given, their merged
+                statistics are reported instead of this process's own, and
+                ``loaded_processes`` counts the processes holding the model.
+        """
+        result = {}
+        for endpoint, entry in self._entries.items():
+            stats = entry.stats
+            extra = {}
+            if snapshots is not None:
+                reported = [snapshot[endpoint] for snapshot in snapshots if endpoint in snapshot]
+                stats = merge_stats(reported)
+                extra["loaded_processes"] = sum(s["loaded"] for s in reported)
+            result[endpoint] = {
+                **entry.metadata,
+                "loaded": stats.loaded,
+                **extra,
+                "load_time_ms": round(stats.load_time_ms, 3) if stats.load_time_ms is not None else None,
+                "memory_bytes": stats.memory_bytes,
+                "call_count": stats.call_count,
+                "molecules_predicted": stats.molecules_predicted,
+                "avg_predict_ms": (
+                    round(stats.total_predict_ms / stats.call_count, 3) if stats.call_count else None
+                ),
+                "loaded_at": stats.loaded_at,
+                "last_used_at": stats.last_used_at,
+            }
+        return result
+
+
+def _reference_metadata(endpoint: str) -> dict:
+    # Metadata is read eagerly for /models/info; the model object is built on first use
+    with open(REFERENCE_MODEL_DIR / f"{endpoint}.json", encoding="utf-8") as fh:
+        spec = json.load(fh)
+    return {
+        "name": spec["name"],
+        "version": spec["version"],
+        "type": spec["type"],
+        "features": spec["features"],
+        "outputs": list(spec["outputs"]),
+        "source": f"reference_models/{endpoint}.json",
+    }
+
+
+def _build_default_registry() -> ModelRegistry:
+    default = ModelRegistry()
+    for endpoint in ADMET_ENDPOINTS:
+        default.register(
+            endpoint,
+            lambda endpoint=endpoint: load_reference_model(endpoint),
+            **_reference_metadata(endpoint),
+        )
+    return default
+
+
+# Process-wide registry used by the ADMET router
+registry = _build_default_registry()
@@ -0,0 +1,331 @@
+"""
+분자 배치 (struct-of-arrays)
+
+파이프라인 내부(생성 → 제약조건 필터링 → 유사성 검색 → ADMET)에서 분자를
+dict나 pydantic 객체 리스트 대신 컬럼 배열 묶음으로 주고받는다:
+
+    columns                     기술자별 NumPy 배열 (molecular_weight, logp, ...)
+    smiles_data / smiles_offsets  연결된 UTF-8 SMILES 버퍼 + (n+1) 오프셋
+    name_data / name_offsets      연결된 이름 버퍼 + 오프셋
+    name_serial                 이름 뒤에 붙는 일련번호 (생성 분자 "HBV-Lead-01-17"), 없으면 None
+
+분자마다 객체를 만드는 것은 응답 직전 records()/iter_records() 한 번뿐이다.
+row(i)는 복사 없이 배치를 가리키는 __slots__ 뷰를 반환한다.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# 저장소 레코드 형식 (CompoundStore.record와 같은 필드/반올림)
+CATALOG_FIELDS = ("name", "smiles", "molecular_weight", "logp", "tpsa", "hbd", "hba")
+CATALOG_DECIMALS = {"molecular_weight": 2, "logp": 2, "tpsa": 2}
+INTEGER_COLUMNS = ("hbd", "hba")
+
+
+def encode_strings(values: Sequence[str]):
+    """문자열 리스트 → (uint8 버퍼, int64 오프셋)"""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def take_strings(data: np.ndarray, offsets: np.ndarray, indices: np.ndarray):
+    """
+    연결 문자열 버퍼에서 indices 행만 모은 새 버퍼 (행별 파이썬 객체 없이 벡터화)
+
+    Args:
+        data: uint8 버퍼
+        offsets: (n+1) 오프셋
+        indices: 가져올 행 번호
+
+    Returns:
+        (uint8 버퍼, int64 오프셋)
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    starts = np.asarray(offsets[indices], dtype=np.int64)
+    lengths = np.asarray(offsets[indices + 1], dtype=np.int64) - starts
+    new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    # 출력 바이트 j의 원본 위치 = starts[k] + (j - new_offsets[k])
+    positions = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1], dtype=np.int64)
+    return np.asarray(data[positions], dtype=np.uint8), new_offsets
+
+
+def mask_strings(data: np.ndarray, offsets: np.ndarray, mask: np.ndarray):
+    """take_strings의 boolean 마스크 버전 (바이트 마스크 한 번으로 복사, 순서 유지)"""
+    lengths = np.diff(offsets)
+    new_offsets = np.zeros(int(np.count_nonzero(mask)) + 1, dtype=np.int64)
+    np.cumsum(lengths[mask], out=new_offsets[1:])
+    return np.asarray(data[np.repeat(mask, lengths)], dtype=np.uint8), new_offsets
+
+
+def decode_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """연결 문자열 버퍼 → 문자열 리스트 (ASCII 버퍼는 한 번에 디코딩 후 슬라이스)"""
+    raw = np.asarray(data, dtype=np.uint8).tobytes()
+    bounds = offsets.tolist()
+    if raw.isascii():
+        text = raw.decode("ascii")
+        return [text[start:stop] for start, stop in zip(bounds, bounds[1:])]
+    return [raw[start:stop].decode("utf-8") for start, stop in zip(bounds, bounds[1:])]
+
+
+class MoleculeRow:
+    """배치의 한 행을 가리키는 뷰 (값은 접근할 때 배치에서 읽음)"""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "MoleculeBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def smiles(self) -> str:
+        return self._batch.smiles(self._index)
+
+    @property
+    def name(self) -> str:
+        return self._batch.name(self._index)
+
+    def __getitem__(self, column: str):
+        return self._batch.columns[column][self._index].item()
+
+    def __getattr__(self, column: str):
+        try:
+            return self._batch.columns[column][self._index].item()
+        except KeyError:
+            raise AttributeError(column) from None
+
+    def to_dict(self) -> dict:
+        record = {"name": self.name, "smiles": self.smiles}
+        record.update({column: values[self._index].item() for column, values in self._batch.columns.items()})
+        return record
+
+    def __repr__(self) -> str:
+        return f"MoleculeRow({self._index}, {self.smiles!r})"
+
+
+@dataclass(frozen=True)
+class MoleculeBatch:
+    """분자 배치 (컬럼 배열 + 연결 문자열 버퍼)"""
+
+    columns: Dict[str, np.ndarray]
+    smiles_data: np.ndarray
+    smiles_offsets: np.ndarray
+    name_data: np.ndarray
+    name_offsets: np.ndarray
+    name_serial: Optional[np.ndarray] = None
+
+    @classmethod
+    def empty(cls) -> "MoleculeBatch":
+        data, offsets = encode_strings([])
+        return cls({}, data, offsets, data, offsets)
+
+    @classmethod
+    def from_records(cls, records: Sequence[dict], columns: Optional[Sequence[str]] = None) -> "MoleculeBatch":
+        """
+        dict 리스트로 배치 생성 (시드 데이터, 외부 입력 변환용)
+
+        Args:
+            records: name, smiles 및 기술자 키를 가진 dict 리스트
+            columns: 가져올 기술자 컬럼 (생략 시 첫 레코드의 name/smiles 외 키)
+        """
+        if not records:
+            return cls.empty()
+        if columns is None:
+            columns = [key for key in records[0] if key not in ("name", "smiles")]
+        smiles_data, smiles_offsets = encode_strings([r["smiles"] for r in records])
+        name_data, name_offsets = encode_strings([r.get("name", "") for r in records])
+        arrays = {
+            column: np.array([r[column] for r in records], dtype=np.int32 if column in INTEGER_COLUMNS else np.float64)
+            for column in columns
+        }
+        return cls(arrays, smiles_data, smiles_offsets, name_data, name_offsets)
+
+    @classmethod
+    def from_columns(
+        cls,
+        smiles: Sequence[str],
+        names: Optional[Sequence[str]] = None,
+        **columns: Sequence[float],
+    ) -> "MoleculeBatch":
+        """
+        열 단위 입력(요청 본문 등)으로 배치 생성
+
+        Args:
+            smiles: SMILES 리스트
+            names: 이름 리스트 (생략 시 빈 문자열)
+            **columns: 기술자/목표 컬럼 (smiles와 같은 길이)
+
+        Raises:
+            ValueError: 컬럼 길이가 smiles와 다를 때
+        """
+        for name, values in columns.items():
+            if len(values) != len(smiles):
+                raise ValueError(f"{name}: 길이 {len(values)} != smiles 길이 {len(smiles)}")
+        if names is not None and len(names) != len(smiles):
+            raise ValueError(f"name: 길이 {len(names)} != smiles 길이 {len(smiles)}")
+        smiles_data, smiles_offsets = encode_strings(smiles)
+        name_data, name_offsets = encode_strings(names if names is not None else [""] * len(smiles))
+        arrays = {
+            name: np.asarray(values, dtype=np.int32 if name in INTEGER_COLUMNS else np.float64)
+            for name, values in columns.items()
+        }
+        return cls(arrays, smiles_data, smiles_offsets, name_data, name_offsets)
+
+    @classmethod
+    def from_catalog(
+        cls,
+        catalog,
+        rows: np.ndarray,
+        columns: Optional[Dict[str, np.ndarray]] = None,
+        name_serial: Optional[np.ndarray] = None,
+    ) -> "MoleculeBatch":
+        """
+        화합물 저장소 행으로 배치 생성 (문자열 버퍼는 저장소 memmap에서 벡터화 복사)
+
+        Args:
+            catalog: CompoundStore
+            rows: 저장소 행 번호
+            columns: 기술자 컬럼 (생략 시 저장소의 기술자 컬럼을 rows로 추출)
+            name_serial: 이름 뒤에 붙일 일련번호 (선택)
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if columns is None:
+            columns = {name: np.asarray(catalog[name][rows]) for name in CATALOG_FIELDS[2:]}
+        smiles_data, smiles_offsets = take_strings(catalog["smiles_data"], catalog["smiles_offsets"], rows)
+        name_data, name_offsets = take_strings(catalog["name_data"], catalog["name_offsets"], rows)
+        return cls(dict(columns), smiles_data, smiles_offsets, name_data, name_offsets, name_serial)
+
+    @classmethod
+    def concat(cls, batches: Sequence["MoleculeBatch"]) -> "MoleculeBatch":
+        """
+        배치 이어 붙이기 (컬럼 구성이 같아야 함)
+
+        일련번호는 모든 배치에 있을 때만 유지된다.
+        """
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+
+        def strings(data_field: str, offsets_field: str):
+            data = np.concatenate([getattr(b, data_field) for b in batches])
+            lengths = np.concatenate([np.diff(getattr(b, offsets_field)) for b in batches])
+            offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            return data, offsets
+
+        columns = {name: np.concatenate([b.columns[name] for b in batches]) for name in batches[0].columns}
+        serials = [b.name_serial for b in batches]
+        name_serial = np.concatenate(serials) if all(s is not None for s in serials) else None
+        return cls(columns, *strings("smiles_data", "smiles_offsets"), *strings("name_data", "name_offsets"), name_serial)
+
+    def __len__(self) -> int:
+        return len(self.smiles_offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """배치가 차지하는 배열 메모리 (bytes)"""
+        arrays = [self.smiles_data, self.smiles_offsets, self.name_data, self.name_offsets, *self.columns.values()]
+        if self.name_serial is not None:
+            arrays.append(self.name_serial)
+        return sum(array.nbytes for array in arrays)
+
+    def smiles(self, index: int) -> str:
+        return bytes(self.smiles_data[self.smiles_offsets[index]:self.smiles_offsets[index + 1]]).decode("utf-8")
+
+    def name(self, index: int) -> str:
+        name = bytes(self.name_data[self.name_offsets[index]:self.name_offsets[index + 1]]).decode("utf-8")
+        return f"{name}-{self.name_serial[index]}" if self.name_serial is not None else name
+
+    def smiles_list(self) -> List[str]:
+        return decode_strings(self.smiles_data, self.smiles_offsets)
+
+    def names(self) -> List[str]:
+        names = decode_strings(self.name_data, self.name_offsets)
+        if self.name_serial is None:
+            return names
+        return [f"{name}-{serial}" for name, serial in zip(names, self.name_serial.tolist())]
+
+    def row(self, index: int) -> MoleculeRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return MoleculeRow(self, index)
+
+    def __iter__(self) -> Iterator[MoleculeRow]:
+        return (MoleculeRow(self, i) for i in range(len(self)))
+
+    def take(self, selector) -> "MoleculeBatch":
+        """
+        마스크/인덱스/슬라이스로 부분 배치 추출
+
+        Args:
+            selector: boolean 마스크, 행 번호 배열 또는 slice
+        """
+        if isinstance(selector, np.ndarray) and selector.dtype == bool:
+            # 문자열은 바이트 마스크로, 숫자 컬럼은 행 번호로 한 번씩 복사 (boolean 인덱싱보다 빠름)
+            indices = np.flatnonzero(selector)
+            smiles_data, smiles_offsets = mask_strings(self.smiles_data, self.smiles_offsets, selector)
+            name_data, name_offsets = mask_strings(self.name_data, self.name_offsets, selector)
+        else:
+            indices = np.arange(len(self))[selector]
+            smiles_data, smiles_offsets = take_strings(self.smiles_data, self.smiles_offsets, indices)
+            name_data, name_offsets = take_strings(self.name_data, self.name_offsets, indices)
+        return MoleculeBatch(
+            {name: values[indices] for name, values in self.columns.items()},
+            smiles_data,
+            smiles_offsets,
+            name_data,
+            name_offsets,
+            self.name_serial[indices] if self.name_serial is not None else None,
+        )
+
+    def with_columns(self, **arrays: np.ndarray) -> "MoleculeBatch":
+        """컬럼을 추가/교체한 새 배치 (문자열 버퍼와 기존 컬럼은 공유)"""
+        for name, values in arrays.items():
+            if len(values) != len(self):
+                raise ValueError(f"{name}: 길이 {len(values)} != 배치 크기 {len(self)}")
+        return replace(self, columns={**self.columns, **{k: np.asarray(v) for k, v in arrays.items()}})
+
+    def iter_records(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        decimals: Optional[Dict[str, int]] = None,
+    ) -> Iterator[dict]:
+        """
+        응답용 dict를 한 분자씩 생성 (응답 경계에서만 사용)
+
+        Args:
+            fields: 출력 필드 순서 ("name", "smiles", 컬럼 이름) - 생략 시 이름, SMILES, 전체 컬럼
+            decimals: {컬럼: 반올림 자릿수}
+
+        Yields:
+            분자 dict (정수 컬럼은 int, 나머지는 float)
+        """
+        fields = tuple(fields) if fields is not None else ("name", "smiles", *self.columns)
+        decimals = decimals or {}
+        values = []
+        for field in fields:
+            if field == "name":
+                values.append(self.names())
+            elif field == "smiles":
+                values.append(self.smiles_list())
+            else:
+                column = self.columns[field]
+                if field in INTEGER_COLUMNS:
+                    column = column.astype(np.int64)
+                items = column.tolist()
+                if field in decimals:
+                    items = [round(value, decimals[field]) for value in items]
+                values.append(items)
+        for row in zip(*values):
+            yield dict(zip(fields, row))
+
+    def records(self, fields: Optional[Sequence[str]] = None, decimals: Optional[Dict[str, int]] = None) -> List[dict]:
+        return list(self.iter_records(fields, decimals))
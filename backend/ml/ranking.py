@@ -0,0 +1,238 @@
+"""
+다목적 순위 매기기 (Pareto front, 가중합)
+
+목표값은 모두 "클수록 좋음"으로 맞춘 (n, m) 행렬로 다룬다.
+
+    pareto_fronts     비지배 정렬 (front 번호, 0 = 최상위)
+                      m=2: 정렬 + 이진 탐색 O(n log n)
+                      m>=3: 목표 합 내림차순 정렬 후 front를 한 겹씩 벗겨냄
+                      (블록 단위 벡터화 비교, 필요한 front까지만 계산)
+    weighted_scores   목표별 min-max 정규화 후 가중 평균
+    top_k             argpartition으로 상위 k개만 정렬 (전체 정렬 없음)
+    rank_batch        MoleculeBatch에 순위 컬럼을 붙여 상위 k개 반환
+"""
+
+import bisect
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .molecule_batch import MoleculeBatch
+
+# 순위에 쓸 수 있는 목표 (모두 클수록 좋음)
+ADMET_OBJECTIVES = ("overall_score", "absorption", "distribution", "metabolism", "excretion", "toxicity")
+OBJECTIVES = ("binding_affinity", "synthesis_score") + ADMET_OBJECTIVES
+
+# m>=3 비지배 검사 시 한 번에 비교하는 (후보 × front) 원소 수 상한
+_COMPARE_BLOCK = 1 << 21
+
+
+def _fronts_2d(values: np.ndarray) -> np.ndarray:
+    """
+    2목표 비지배 정렬 O(n log n)
+
+    첫 번째 목표 내림차순(동률이면 두 번째 내림차순)으로 훑으면 앞선 점만
+    뒤의 점을 지배할 수 있고, 각 front의 마지막 점이 그 front의 두 번째 목표
+    최대값이 된다. 이 값들은 front 번호에 대해 단조 감소하므로 점마다 이진 탐색
+    한 번으로 들어갈 front를 찾는다.
+    """
+    order = np.lexsort((-values[:, 1], -values[:, 0]))
+    first, second = values[order, 0].tolist(), values[order, 1].tolist()
+    fronts = np.empty(len(values), dtype=np.int64)
+    # 각 front 마지막 점의 -두 번째 목표 (오름차순 유지)
+    last = []
+    previous = None
+    front = 0
+    for position, point in enumerate(zip(first, second)):
+        if point != previous:
+            front = bisect.bisect_right(last, -point[1])
+            if front == len(last):
+                last.append(-point[1])
+            else:
+                last[front] = -point[1]
+            previous = point
+        fronts[order[position]] = front
+    return fronts
+
+
+def _dominated_by_block(candidates: np.ndarray, front: np.ndarray) -> np.ndarray:
+    """candidates 각 행이 front의 어떤 행에 지배되는지 (작은 front 블록용 전체 비교)"""
+    # (후보, front) 2차원 비교를 목표마다 누적 (3차원 브로드캐스트 + 축 축약보다 빠름)
+    ge = np.ones((len(candidates), len(front)), dtype=bool)
+    gt = np.zeros((len(candidates), len(front)), dtype=bool)
+    for j in range(candidates.shape[1]):
+        column, reference = candidates[:, j, None], front[None, :, j]
+        ge &= reference >= column
+        gt |= reference > column
+    return (ge & gt).any(axis=1)
+
+
+def _dominated(candidates: np.ndarray, front: np.ndarray) -> np.ndarray:
+    """
+    candidates 각 행이 front의 어떤 행에 지배되는지 (boolean 마스크)
+
+    front 앞쪽(목표 합이 큰 점)부터 점점 큰 묶음으로 비교하고, 지배된 후보는
+    다음 묶음 비교에서 뺀다. 대부분의 후보가 첫 몇 개의 강한 점에 지배되므로
+    비교 횟수가 후보 수 × front 크기보다 훨씬 적다.
+    """
+    dominated = np.zeros(len(candidates), dtype=bool)
+    alive = np.arange(len(candidates))
+    start, size = 0, 8
+    while start < len(front) and len(alive):
+        reference = front[start:start + size]
+        step = max(1, _COMPARE_BLOCK // len(reference))
+        hits = np.concatenate([
+            _dominated_by_block(candidates[alive[i:i + step]], reference) for i in range(0, len(alive), step)
+        ])
+        dominated[alive[hits]] = True
+        alive = alive[~hits]
+        start, size = start + size, size * 2
+    return dominated
+
+
+def _first_front(values: np.ndarray, block_size: int = 1024) -> np.ndarray:
+    """
+    목표 합 내림차순으로 정렬된 values의 비지배 행 마스크 (sort-filter-skyline)
+
+    지배하는 점은 목표 합이 더 크므로 항상 앞에 있다. 앞에서부터 블록을 꺼내
+    블록 안에서 살아남은 점을 front에 넣고, 남은 후보 전체에서 새 front 점에
+    지배되는 점을 한 번에 지운다. 대부분의 후보는 첫 몇 블록의 front 점에
+    지배되므로 일찍 제거된다.
+    """
+    keep = np.zeros(len(values), dtype=bool)
+    pending = np.arange(len(values))
+    while len(pending):
+        block, rest = pending[:block_size], pending[block_size:]
+        points = values[block]
+        added = block[~_dominated(points, points)]
+        keep[added] = True
+        pending = rest[~_dominated(values[rest], values[added])]
+    return keep
+
+
+def pareto_fronts(values: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+    """
+    비지배 정렬
+
+    Args:
+        values: (n, m) 목표 행렬 (모두 클수록 좋음)
+        limit: 이만큼의 점이 front에 배정되면 중단 (top-k 선택용, 마지막 front는 통째로 포함)
+
+    Returns:
+        점별 front 번호 (0부터, limit 때문에 계산하지 않은 점은 -1)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n, m = values.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    if m == 1:
+        _, fronts = np.unique(-values[:, 0], return_inverse=True)
+        return fronts.astype(np.int64)
+    if m == 2:
+        return _fronts_2d(values)
+
+    fronts = np.full(n, -1, dtype=np.int64)
+    remaining = np.argsort(-values.sum(axis=1), kind="stable")
+    limit = n if limit is None else min(limit, n)
+    assigned = 0
+    front = 0
+    while len(remaining) and assigned < limit:
+        keep = _first_front(values[remaining])
+        fronts[remaining[keep]] = front
+        assigned += int(np.count_nonzero(keep))
+        remaining = remaining[~keep]
+        front += 1
+    return fronts
+
+
+def weighted_scores(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    가중 스칼라 점수 (목표별 min-max 정규화 → 가중 평균, 0-1)
+
+    Args:
+        values: (n, m) 목표 행렬
+        weights: 목표별 가중치 (m,)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    if len(values) == 0:
+        return np.empty(0, dtype=np.float64)
+    low, high = values.min(axis=0), values.max(axis=0)
+    span = np.where(high > low, high - low, 1.0)
+    normalized = (values - low) / span
+    return normalized @ (weights / weights.sum())
+
+
+def top_k(keys: np.ndarray, k: int) -> np.ndarray:
+    """
+    keys가 큰 순서로 상위 k개 인덱스 (argpartition 후 k개만 정렬, O(n + k log k))
+    """
+    keys = np.asarray(keys)
+    k = min(k, len(keys))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-keys, k - 1)[:k] if k < len(keys) else np.arange(len(keys))
+    return candidates[np.argsort(-keys[candidates], kind="stable")]
+
+
+def objective_matrix(batch: MoleculeBatch, weights: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    배치에서 목표 행렬과 가중치 벡터 추출
+
+    Raises:
+        ValueError: 알 수 없는 목표, 배치에 없는 컬럼, 음수/0 가중치
+    """
+    objectives = [name for name, weight in weights.items() if weight]
+    for name in weights:
+        if name not in OBJECTIVES:
+            raise ValueError(f"지원하지 않는 목표: {name} (가능: {', '.join(OBJECTIVES)})")
+        if weights[name] < 0:
+            raise ValueError(f"가중치는 0 이상이어야 합니다: {name}={weights[name]}")
+    if not objectives:
+        raise ValueError("가중치가 0보다 큰 목표가 하나 이상 필요합니다")
+    missing = [name for name in objectives if name not in batch.columns]
+    if missing:
+        raise ValueError(f"후보에 목표 값이 없습니다: {', '.join(missing)}")
+    values = np.column_stack([np.asarray(batch.columns[name], dtype=np.float64) for name in objectives])
+    return values, np.array([weights[name] for name in objectives], dtype=np.float64)
+
+
+def rank_batch(batch: MoleculeBatch, weights: Dict[str, float], method: str = "pareto", k: int = 100) -> Tuple[MoleculeBatch, dict]:
+    """
+    후보 배치 순위 매기기
+
+    method="pareto": front 번호 오름차순, 같은 front 안에서는 가중 점수 내림차순.
+        상위 k개를 채우는 데 필요한 front까지만 계산한다.
+    method="weighted": 가중 점수 내림차순.
+
+    Args:
+        batch: 목표 컬럼을 가진 분자 배치
+        weights: {목표: 가중치} (0이면 제외)
+        method: "pareto" 또는 "weighted"
+        k: 반환할 개수
+
+    Returns:
+        (rank, score[, pareto_front] 컬럼이 붙은 상위 k개 배치, 통계 dict)
+    """
+    values, weight_vector = objective_matrix(batch, weights)
+    scores = weighted_scores(values, weight_vector)
+    stats = {"num_candidates": len(batch)}
+
+    if method == "pareto":
+        fronts = pareto_fronts(values, limit=k)
+        ranked = np.flatnonzero(fronts >= 0)
+        # front 오름차순, 같은 front 안에서 점수 내림차순
+        ranked = ranked[np.lexsort((-scores[ranked], fronts[ranked]))][:k]
+        stats["num_fronts_computed"] = int(fronts.max()) + 1 if len(fronts) else 0
+        stats["pareto_front_size"] = int(np.count_nonzero(fronts == 0))
+        extra = {"pareto_front": fronts[ranked]}
+    elif method == "weighted":
+        ranked = top_k(scores, k)
+        extra = {}
+    else:
+        raise ValueError(f"지원하지 않는 순위 방법: {method}")
+
+    top = batch.take(ranked).with_columns(
+        rank=np.arange(1, len(ranked) + 1, dtype=np.int64), score=scores[ranked], **extra
+    )
+    return top, stats
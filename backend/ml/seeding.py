@@ -0,0 +1,60 @@
+"""
+요청 단위 결정적 난수 생성기
+
+요청 내용(질환, 제약조건, canonical SMILES 등)과 시드를 해시해 요청마다
+독립된 numpy Generator를 만든다. 같은 입력 + 같은 시드면 비트 단위로 같은
+결과가 나오므로 캐시/중복 제거/회귀 비교가 가능하고, 전역 난수 상태를
+공유하지 않으므로 동시 요청 간 경합도 없다. 시드를 생략한 요청은 DEFAULT_SEED를
+쓰므로 같은 요청은 항상 같은 결과를 내고, 무작위 결과는 seed="random"으로 요청한다.
+"""
+
+import hashlib
+import json
+import secrets
+from typing import Optional, Union
+
+import numpy as np
+
+# 시드를 생략한 요청의 시드 (난수열은 요청 내용 해시와 함께 유도되므로 요청마다 다름)
+DEFAULT_SEED = 0
+
+# 서버가 무작위 시드를 만들도록 하는 seed 값
+RANDOM_SEED = "random"
+
+
+def derive_seed(*parts) -> int:
+    """
+    입력 값들의 SHA-256 해시로 128비트 시드 생성
+
+    Args:
+        parts: JSON 직렬화 가능한 값 (dict는 키 순서와 무관하게 같은 시드)
+
+    Returns:
+        SeedSequence에 넣을 정수 시드
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return int.from_bytes(hashlib.sha256(payload.encode("utf-8")).digest()[:16], "big")
+
+
+def request_rng(*parts) -> np.random.Generator:
+    """입력 값들에서 유도한 독립 난수 생성기 (PCG64)"""
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(derive_seed(*parts))))
+
+
+def new_seed() -> int:
+    """seed="random" 요청용 무작위 시드 (응답에 돌려줘서 재현 가능하게 함)"""
+    return secrets.randbits(63)
+
+
+def resolve_seed(seed: Optional[Union[int, str]]) -> int:
+    """
+    요청 seed 값 → 실제 사용할 시드
+
+    Args:
+        seed: 정수 시드, None(DEFAULT_SEED) 또는 RANDOM_SEED(new_seed())
+    """
+    if seed is None:
+        return DEFAULT_SEED
+    if seed == RANDOM_SEED:
+        return new_seed()
+    return seed
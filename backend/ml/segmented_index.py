@@ -0,0 +1,415 @@
+"""
+추가 가능한(append-friendly) 세그먼트 fingerprint 인덱스
+
+새 화합물을 전체 인덱스 재구성 없이 바로 검색할 수 있도록 LSM 방식으로 나눈다:
+
+    delta       가변 세그먼트 - 용량이 찰 때까지 행을 뒤에 붙이기만 함 (검색은 전수 비교)
+    sealed      불변 세그먼트 - delta가 차면 popcount 정렬된 FingerprintIndex로 봉인
+    tombstones  삭제된 ID 집합 - 검색 결과에서 제외, 병합 시 실제로 제거
+
+봉인 세그먼트가 max_segments를 넘으면 백그라운드 스레드가 가장 작은
+merge_factor개를 하나로 병합한다. 병합은 불변 세그먼트의 스냅샷으로 락 밖에서
+수행하고, 끝난 뒤 락 안에서 세그먼트 목록만 교체하므로 검색과 추가를 막지 않는다.
+
+검색은 세그먼트마다 top-k를 구한 뒤 merge_results()로 합친다.
+
+IndexedCompounds는 인덱스와 함께 추가된 화합물 레코드(MoleculeBatch)를 보관해
+검색 결과를 바로 분자 배치로 돌려준다. ID는 카탈로그 행 번호 뒤에서 이어진다.
+삭제된 카탈로그 화합물은 세그먼트 인덱스가 아니라 별도 마스크에 기록하고,
+카탈로그 검색 결과에서 걸러낸다 (세그먼트 병합으로 없어지지 않는 tombstone이
+세그먼트 검색 범위를 계속 늘리지 않도록).
+
+인덱스는 프로세스 메모리에 있다. 여러 웹 워커가 같은 상태를 보도록 하려면
+추가/삭제를 공유 변경 로그(database/index_log.py)에 기록하고 워커마다 재생한다
+(services/live_index.py).
+"""
+
+import bisect
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .fingerprint_index import FingerprintIndex, SearchResult, morgan_fingerprints, popcount_rows
+from .molecule_batch import CATALOG_FIELDS, MoleculeBatch
+
+DEFAULT_DELTA_CAPACITY = 4096
+DEFAULT_MAX_SEGMENTS = 8
+DEFAULT_MERGE_FACTOR = 4
+
+
+def merge_results(results: Sequence[SearchResult], limit: int, exclude: Optional[np.ndarray] = None) -> SearchResult:
+    """
+    세그먼트별 검색 결과를 하나의 top-k로 병합
+
+    Args:
+        results: 세그먼트별 SearchResult
+        limit: 반환할 최대 개수
+        exclude: 제외할 ID (tombstone)
+
+    Returns:
+        유사도 내림차순 (동률이면 ID 오름차순) SearchResult
+    """
+    ids = np.concatenate([np.asarray(r.ids, dtype=np.int64) for r in results]) if results else np.empty(0, dtype=np.int64)
+    sims = np.concatenate([np.asarray(r.similarities, dtype=np.float64) for r in results]) if results else np.empty(0)
+    if exclude is not None and len(exclude) and len(ids):
+        keep = ~np.isin(ids, exclude)
+        ids, sims = ids[keep], sims[keep]
+    order = np.lexsort((ids, -sims))[:limit]
+    return SearchResult(
+        ids=ids[order],
+        similarities=sims[order],
+        num_candidates=sum(r.num_candidates for r in results),
+        num_indexed=sum(r.num_indexed for r in results),
+    )
+
+
+def merge_batches(batches: Sequence[MoleculeBatch], limit: int) -> MoleculeBatch:
+    """id, similarity 컬럼을 가진 세그먼트별 결과 배치를 하나의 top-k 배치로 병합"""
+    batch = MoleculeBatch.concat(batches)
+    if not len(batch):
+        return batch
+    order = np.lexsort((batch.columns["id"], -batch.columns["similarity"]))[:limit]
+    return batch.take(order)
+
+
+def _brute_force_search(fingerprints: np.ndarray, ids: np.ndarray, query: np.ndarray, threshold: float, limit: int) -> SearchResult:
+    """정렬되지 않은 작은 세그먼트(delta) 전수 Tanimoto 검색"""
+    query = np.asarray(query, dtype=np.uint64).reshape(1, -1)
+    query_count = int(popcount_rows(query)[0])
+    common = popcount_rows(fingerprints & query)
+    union = popcount_rows(fingerprints) + query_count - common
+    sims = np.divide(common, union, out=np.zeros(len(common)), where=union > 0)
+    hits = np.flatnonzero(sims >= threshold)
+    order = hits[np.lexsort((ids[hits], -sims[hits]))][:limit]
+    return SearchResult(ids=ids[order], similarities=sims[order], num_candidates=len(ids), num_indexed=len(ids))
+
+
+class SegmentedFingerprintIndex:
+    """delta + 봉인 세그먼트 + tombstone으로 구성된 추가 가능한 fingerprint 인덱스"""
+
+    def __init__(
+        self,
+        n_bits: int,
+        delta_capacity: int = DEFAULT_DELTA_CAPACITY,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+        merge_factor: int = DEFAULT_MERGE_FACTOR,
+        background: bool = True,
+    ):
+        """
+        Args:
+            n_bits: fingerprint 비트 수 (64의 배수)
+            delta_capacity: delta 세그먼트 최대 행 수 (차면 봉인)
+            max_segments: 이 수를 넘는 봉인 세그먼트가 생기면 병합
+            merge_factor: 한 번에 병합하는 세그먼트 수 (가장 작은 것부터)
+            background: False면 병합을 추가한 스레드에서 바로 수행 (테스트/벤치마크용)
+        """
+        self.n_words = n_bits // 64
+        self.delta_capacity = delta_capacity
+        self.max_segments = max_segments
+        self.merge_factor = max(2, merge_factor)
+        self.background = background
+
+        self._lock = threading.Lock()
+        self._merge_wanted = threading.Condition(self._lock)
+        self._delta_fps = np.empty((delta_capacity, self.n_words), dtype=np.uint64)
+        self._delta_ids = np.empty(delta_capacity, dtype=np.int64)
+        self._delta_count = 0
+        self._sealed: List[FingerprintIndex] = []
+        self._tombstones: set = set()
+        self._merging = False
+        self._merger: Optional[threading.Thread] = None
+        self._closed = False
+        self.merges = 0
+        self.seals = 0
+
+    def __len__(self) -> int:
+        """살아 있는(삭제되지 않은) 행 수 (병합 전 tombstone은 근사)"""
+        with self._lock:
+            return self._delta_count + sum(len(s) for s in self._sealed) - len(self._tombstones)
+
+    def add(self, fingerprints: np.ndarray, ids: Sequence[int]) -> None:
+        """
+        행 추가 (delta에 복사, 용량이 차면 봉인)
+
+        Args:
+            fingerprints: (n, n_words) uint64
+            ids: 각 행의 화합물 ID (인덱스 전체에서 유일해야 함)
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64).reshape(-1, self.n_words)
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            start = 0
+            while start < len(ids):
+                room = self.delta_capacity - self._delta_count
+                take = min(room, len(ids) - start)
+                self._delta_fps[self._delta_count:self._delta_count + take] = fingerprints[start:start + take]
+                self._delta_ids[self._delta_count:self._delta_count + take] = ids[start:start + take]
+                self._delta_count += take
+                start += take
+                if self._delta_count == self.delta_capacity:
+                    self._seal_locked()
+            merge_needed = len(self._sealed) > self.max_segments and not self._merging
+            if merge_needed and self.background:
+                self._ensure_merger_locked()
+                self._merge_wanted.notify()
+        if merge_needed and not self.background:
+            self.merge()
+
+    def delete(self, ids: Iterable[int]) -> None:
+        """ID를 tombstone으로 표시 (검색에서 즉시 제외, 병합 시 제거)"""
+        with self._lock:
+            self._tombstones.update(int(i) for i in ids)
+
+    def tombstones(self) -> np.ndarray:
+        with self._lock:
+            return np.fromiter(self._tombstones, dtype=np.int64, count=len(self._tombstones))
+
+    def _seal_locked(self) -> None:
+        """delta를 불변 세그먼트로 봉인하고 새 delta 버퍼를 만듦 (검색 중인 스냅샷은 옛 버퍼를 계속 사용)"""
+        if self._delta_count == 0:
+            return
+        self._sealed.append(FingerprintIndex(self._delta_fps[:self._delta_count], self._delta_ids[:self._delta_count]))
+        self._delta_fps = np.empty((self.delta_capacity, self.n_words), dtype=np.uint64)
+        self._delta_ids = np.empty(self.delta_capacity, dtype=np.int64)
+        self._delta_count = 0
+        self.seals += 1
+
+    def _snapshot(self):
+        with self._lock:
+            count = self._delta_count
+            return (
+                self._delta_fps[:count],
+                self._delta_ids[:count],
+                list(self._sealed),
+                np.fromiter(self._tombstones, dtype=np.int64, count=len(self._tombstones)),
+            )
+
+    def search(self, query: np.ndarray, threshold: float = 0.7, limit: int = 10) -> SearchResult:
+        """
+        모든 세그먼트 검색 후 top-k 병합 (tombstone 제외)
+
+        Args:
+            query: (n_words,) uint64 query fingerprint
+            threshold: 최소 Tanimoto 유사도
+            limit: 반환할 최대 개수
+        """
+        delta_fps, delta_ids, sealed, tombstones = self._snapshot()
+        # tombstone으로 빠질 행이 있어도 limit개를 채울 수 있도록 세그먼트마다 여유 있게 조회
+        segment_limit = limit + len(tombstones)
+        results = [segment.search(query, threshold=threshold, limit=segment_limit) for segment in sealed]
+        if len(delta_ids):
+            results.append(_brute_force_search(delta_fps, delta_ids, query, threshold, segment_limit))
+        merged = merge_results(results, limit, tombstones)
+        return merged
+
+    def merge(self) -> bool:
+        """
+        가장 작은 봉인 세그먼트 merge_factor개를 하나로 병합 (tombstone 행 제거)
+
+        Returns:
+            병합을 수행했으면 True
+        """
+        with self._lock:
+            if self._merging or len(self._sealed) <= 1:
+                return False
+            self._merging = True
+            chosen = sorted(self._sealed, key=len)[:self.merge_factor]
+            tombstones = np.fromiter(self._tombstones, dtype=np.int64, count=len(self._tombstones))
+        try:
+            fingerprints = np.concatenate([segment.fingerprints for segment in chosen])
+            ids = np.concatenate([segment.ids for segment in chosen])
+            live = ~np.isin(ids, tombstones) if len(tombstones) else np.ones(len(ids), dtype=bool)
+            merged = FingerprintIndex(fingerprints[live], ids[live])
+            removed = ids[~live]
+            with self._lock:
+                chosen_ids = {id(segment) for segment in chosen}
+                self._sealed = [segment for segment in self._sealed if id(segment) not in chosen_ids]
+                if len(merged):
+                    self._sealed.append(merged)
+                # ID는 유일하므로 실제로 지운 행의 tombstone은 더 필요 없음
+                self._tombstones.difference_update(removed.tolist())
+                self.merges += 1
+            return True
+        finally:
+            with self._lock:
+                self._merging = False
+
+    def _ensure_merger_locked(self) -> None:
+        if self._merger is None or not self._merger.is_alive():
+            self._merger = threading.Thread(target=self._merge_loop, name="fingerprint-merger", daemon=True)
+            self._merger.start()
+
+    def _merge_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and len(self._sealed) <= self.max_segments:
+                    self._merge_wanted.wait()
+                if self._closed:
+                    return
+            self.merge()
+
+    def close(self) -> None:
+        """백그라운드 병합 스레드 종료"""
+        with self._lock:
+            self._closed = True
+            self._merge_wanted.notify_all()
+        if self._merger is not None:
+            self._merger.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "delta_rows": self._delta_count,
+                "delta_capacity": self.delta_capacity,
+                "sealed_segments": len(self._sealed),
+                "sealed_rows": sum(len(s) for s in self._sealed),
+                "segment_sizes": sorted((len(s) for s in self._sealed), reverse=True),
+                "tombstones": len(self._tombstones),
+                "seals": self.seals,
+                "merges": self.merges,
+                "merging": self._merging,
+            }
+
+
+class IndexedCompounds:
+    """실행 중에 추가된 화합물 레코드 + 세그먼트 인덱스 (ID = first_id부터 연속)"""
+
+    def __init__(self, first_id: int, radius: int, n_bits: int, **index_options):
+        """
+        Args:
+            first_id: 첫 화합물 ID (카탈로그 크기 - 카탈로그 행 번호와 겹치지 않도록)
+            radius, n_bits: Morgan fingerprint 설정 (카탈로그와 같아야 유사도가 비교 가능)
+            index_options: SegmentedFingerprintIndex 옵션
+        """
+        self.first_id = first_id
+        self.fingerprint_params = {"radius": radius, "n_bits": n_bits}
+        self.index = SegmentedFingerprintIndex(n_bits, **index_options)
+        self._lock = threading.Lock()
+        self._batches: List[MoleculeBatch] = []
+        self._starts: List[int] = []
+        self._next_id = first_id
+        self._deleted: set = set()
+        # 삭제된 카탈로그 행 (카탈로그 검색 결과 필터용)
+        self._catalog_deleted = np.zeros(first_id, dtype=bool)
+
+    def __len__(self) -> int:
+        return self._next_id - self.first_id
+
+    def contains(self, compound_id: int) -> bool:
+        return self.first_id <= compound_id < self._next_id
+
+    def add(self, batch: MoleculeBatch, mols: Sequence) -> np.ndarray:
+        """
+        화합물 추가 후 바로 검색 가능하게 인덱싱
+
+        Args:
+            batch: 추가할 분자 배치 (카탈로그 기술자 컬럼 필요)
+            mols: batch와 같은 순서의 RDKit Mol
+
+        Returns:
+            부여된 화합물 ID
+        """
+        return self.insert(batch, morgan_fingerprints(mols, **self.fingerprint_params))
+
+    def insert(self, batch: MoleculeBatch, fingerprints: np.ndarray, first_id: Optional[int] = None) -> np.ndarray:
+        """
+        fingerprint를 이미 계산한 화합물 추가 (공유 변경 로그 재생용)
+
+        Args:
+            batch: 추가할 분자 배치 (카탈로그 기술자 컬럼 필요)
+            fingerprints: batch와 같은 순서의 (n, n_words) uint64 fingerprint
+            first_id: 첫 화합물 ID (None이면 다음 ID, ID는 빈틈 없이 이어져야 함)
+
+        Returns:
+            부여된 화합물 ID
+        """
+        # 일련번호를 이름에 확정하고 카탈로그와 같은 컬럼만 보관 (검색 결과를 카탈로그 결과와 이어 붙이기 위함)
+        stored = MoleculeBatch.from_columns(
+            batch.smiles_list(), batch.names(), **{name: batch.columns[name] for name in CATALOG_FIELDS[2:]}
+        )
+        with self._lock:
+            first_id = self._next_id if first_id is None else first_id
+            if first_id != self._next_id:
+                raise ValueError(f"ID가 이어지지 않음: {first_id} != {self._next_id}")
+            ids = np.arange(first_id, first_id + len(stored), dtype=np.int64)
+            self._batches.append(stored)
+            self._starts.append(first_id)
+            self._next_id = first_id + len(stored)
+            # ID 순서대로 인덱스에 들어가도록 레코드 락 안에서 추가
+            self.index.add(fingerprints, ids)
+        return ids
+
+    def encode(self, batch: MoleculeBatch, mols: Sequence) -> Tuple[dict, bytes]:
+        """
+        공유 변경 로그에 기록할 형태로 변환 (insert_records()로 되돌림)
+
+        Returns:
+            (열 단위 레코드 dict, uint64 fingerprint 바이트)
+        """
+        records = {
+            "smiles": batch.smiles_list(),
+            "name": batch.names(),
+            **{name: batch.columns[name].tolist() for name in CATALOG_FIELDS[2:]},
+        }
+        return records, morgan_fingerprints(mols, **self.fingerprint_params).tobytes()
+
+    def insert_records(self, records: dict, fingerprints: bytes, first_id: int) -> np.ndarray:
+        """encode() 결과를 first_id부터 추가 (다른 워커가 기록한 추가 재생)"""
+        batch = MoleculeBatch.from_columns(
+            records["smiles"], records["name"], **{name: records[name] for name in CATALOG_FIELDS[2:]}
+        )
+        return self.insert(batch, np.frombuffer(fingerprints, dtype=np.uint64).reshape(-1, self.index.n_words), first_id)
+
+    def delete(self, compound_id: int) -> bool:
+        """
+        화합물을 검색에서 제외
+
+        카탈로그 ID(first_id 미만)는 카탈로그 마스크에만 기록하고 (카탈로그 검색 시
+        catalog_tombstones()로 걸러냄), 추가된 화합물은 세그먼트 인덱스의 tombstone이 된다.
+
+        Returns:
+            이미 삭제된 ID이면 False
+        """
+        with self._lock:
+            if compound_id < self.first_id:
+                if self._catalog_deleted[compound_id]:
+                    return False
+                self._catalog_deleted[compound_id] = True
+                return True
+            if compound_id in self._deleted:
+                return False
+            self._deleted.add(compound_id)
+        self.index.delete([compound_id])
+        return True
+
+    def catalog_tombstones(self) -> np.ndarray:
+        """삭제된 카탈로그 ID (오름차순)"""
+        with self._lock:
+            return np.flatnonzero(self._catalog_deleted)
+
+    def take(self, ids: np.ndarray) -> MoleculeBatch:
+        """ID 순서대로 레코드 배치 반환"""
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            batches, starts = list(self._batches), list(self._starts)
+        if not len(ids):
+            return MoleculeBatch.empty()
+        positions = np.array([bisect.bisect_right(starts, i) - 1 for i in ids.tolist()])
+        order = np.argsort(positions, kind="stable")
+        parts = [
+            batches[position].take(ids[order][positions[order] == position] - starts[position])
+            for position in np.unique(positions).tolist()
+        ]
+        return MoleculeBatch.concat(parts).take(np.argsort(order))
+
+    def search(self, query_fp: np.ndarray, threshold: float, limit: int):
+        """
+        유사도 검색
+
+        Returns:
+            (id, similarity 컬럼이 추가된 MoleculeBatch, SearchResult)
+        """
+        result = self.index.search(query_fp, threshold=threshold, limit=limit)
+        batch = self.take(result.ids).with_columns(id=result.ids, similarity=result.similarities)
+        return batch, result
@@ -0,0 +1,156 @@
+"""
+부분구조 검색 인덱스 (pattern fingerprint 사전 선별 + 그래프 매칭)
+
+RDKit pattern fingerprint는 "query가 분자의 부분구조이면 query의 1비트는
+분자에서도 모두 1"을 보장한다. 따라서 분자 비트셋이 query 비트셋의
+상위집합이 아닌 후보는 그래프 매칭 없이 버릴 수 있다.
+
+    screen()         uint64 비트 연산으로 상위집합 검사 (query에 1비트가 있는
+                     word만, 1비트가 많은 word부터 후보를 좁혀 나감)
+    match_rows()     살아남은 후보만 RDKit HasSubstructMatch로 최종 확인
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+from rdkit import Chem, DataStructs
+
+from .fingerprint_index import popcount_rows
+
+DEFAULT_SCREEN_BITS = 2048
+
+# 그래프 매칭을 한 번에 처리하는 후보 수 (스트리밍 단위)
+MATCH_CHUNK_ROWS = 2048
+
+
+def pattern_fingerprints(mols: Sequence[Chem.Mol], n_bits: int = DEFAULT_SCREEN_BITS) -> np.ndarray:
+    """
+    pattern fingerprint를 uint64로 패킹
+
+    Args:
+        mols: RDKit Mol 리스트 (SMARTS query Mol 가능)
+        n_bits: 비트 수 (64의 배수)
+
+    Returns:
+        (분자 수, n_bits // 64) uint64 행렬
+    """
+    if n_bits % 64:
+        raise ValueError("n_bits는 64의 배수여야 합니다")
+
+    bits = np.zeros((len(mols), n_bits), dtype=np.uint8)
+    for i, mol in enumerate(mols):
+        DataStructs.ConvertToNumpyArray(Chem.PatternFingerprint(mol, fpSize=n_bits), bits[i])
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def parse_query(query: str, query_format: str = "smiles") -> Optional[Chem.Mol]:
+    """
+    부분구조 query 파싱
+
+    Args:
+        query: SMILES 또는 SMARTS
+        query_format: "smiles" 또는 "smarts"
+
+    Returns:
+        query Mol (파싱 실패 시 None)
+    """
+    if not query or not query.strip():
+        return None
+    if query_format == "smarts":
+        return Chem.MolFromSmarts(query.strip())
+    return Chem.MolFromSmiles(query.strip())
+
+
+@dataclass
+class ScreenResult:
+    """사전 선별 결과"""
+
+    rows: np.ndarray
+    num_indexed: int
+    query_bits: int
+    seconds: float
+
+    @property
+    def screen_out_ratio(self) -> float:
+        """그래프 매칭 없이 제외된 후보 비율"""
+        return 1 - len(self.rows) / self.num_indexed if self.num_indexed else 0.0
+
+
+class SubstructureIndex:
+    """pattern fingerprint 행렬 위의 사전 선별 인덱스 (행 번호 = 저장소 행 번호)"""
+
+    def __init__(self, fingerprints: np.ndarray):
+        """
+        Args:
+            fingerprints: (n, n_words) uint64 - memmap 그대로 사용 가능 (복사 없음)
+        """
+        if fingerprints.ndim != 2:
+            raise ValueError("fingerprints는 2차원 (n, n_words) 배열이어야 합니다")
+        self.fingerprints = fingerprints
+        self.n_bits = fingerprints.shape[1] * 64
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def query_fingerprint(self, query: Chem.Mol) -> np.ndarray:
+        return pattern_fingerprints([query], self.n_bits)[0]
+
+    def screen(
+        self, query_fp: np.ndarray, rows: Optional[np.ndarray] = None, exclude: Optional[np.ndarray] = None
+    ) -> ScreenResult:
+        """
+        비트셋이 query의 상위집합인 행만 남김
+
+        Args:
+            query_fp: (n_words,) uint64 query pattern fingerprint
+            rows: 검사할 행 번호 (생략 시 전체, 오름차순 유지)
+            exclude: 결과에서 뺄 행 번호 (삭제된 화합물)
+
+        Returns:
+            ScreenResult (살아남은 행 번호 오름차순)
+        """
+        start = time.perf_counter()
+        query_fp = np.asarray(query_fp, dtype=np.uint64)
+        candidates = np.arange(len(self), dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        num_indexed = len(candidates)
+
+        words = np.flatnonzero(query_fp)
+        # 1비트가 많은 word일수록 통과하는 후보가 적으므로 먼저 검사
+        words = words[np.argsort(-popcount_rows(query_fp[words].reshape(-1, 1)), kind="stable")]
+        for word in words:
+            if not len(candidates):
+                break
+            bits = query_fp[word]
+            candidates = candidates[(self.fingerprints[candidates, word] & bits) == bits]
+        if exclude is not None and len(exclude) and len(candidates):
+            candidates = candidates[~np.isin(candidates, exclude)]
+
+        return ScreenResult(
+            rows=candidates,
+            num_indexed=num_indexed,
+            query_bits=int(popcount_rows(query_fp.reshape(1, -1))[0]),
+            seconds=time.perf_counter() - start,
+        )
+
+
+def match_rows(query: Chem.Mol, smiles: Sequence[str], rows: np.ndarray) -> List[int]:
+    """
+    후보 SMILES를 파싱해 부분구조 매칭되는 행 번호만 반환
+
+    Args:
+        query: query Mol
+        smiles: rows와 같은 순서의 후보 SMILES
+        rows: 후보 행 번호
+
+    Returns:
+        매칭된 행 번호 (입력 순서 유지)
+    """
+    matched = []
+    for row, text in zip(rows.tolist(), smiles):
+        mol = Chem.MolFromSmiles(text)
+        if mol is not None and mol.HasSubstructMatch(query):
+            matched.append(row)
+    return matched
@@ -5,12 +5,16 @@
 from fastapi import APIRouter
 from .molecules import router as molecules_router
 from .admet import router as admet_router
+from .cache import router as cache_router
+from .jobs import router as jobs_router
 
-# 메인 라우터
-api_router = APIRouter(prefix="/api", tags=["API"])
+# 메인 라우터 (하위 라우터가 각자 /api/v1/... prefix를 가짐)
+api_router = APIRouter(tags=["API"])
 
 # 라우터 통합
 api_router.include_router(molecules_router)
 api_router.include_router(admet_router)
+api_router.include_router(cache_router)
+api_router.include_router(jobs_router)
 
 __all__ = ["api_router"]
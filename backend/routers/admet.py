@@ -4,12 +4,31 @@ ADMET (Absorption, Distribution, Metabolism, Excretion, Toxicity) Prediction Rou
 This module provides endpoints for predicting ADMET properties of molecules.
 """
 
-from fastapi import APIRouter, HTTPException
+import csv
+import os
+
+from fastapi import APIRouter, File, Header, HTTPException, UploadFile
 from pydantic import BaseModel, Field
 from typing import List, Optional
-import random
 from datetime import datetime
 
+from core import http_cache, jobs
+from core.batcher import MicroBatcher
+from core.cache import prediction_cache
+from core.executor import compute
+from core.metrics import timed_stage
+from core.responses import FastJSONResponse, dumps
+from core.lazy import lazy_module
+from services.admet import build_prediction, cache_entry, cache_key, finish_many, lookup_many
+
+# Chemistry/ML modules load on first use so app startup and /health don't wait on RDKit
+admet_predictor = lazy_module("ml.admet_predictor")
+chem = lazy_module("ml.chem")
+model_registry = lazy_module("ml.model_registry")
+
+# Maximum number of molecules accepted by one batch request
+MAX_BATCH_SIZE = 100_000
+
 router = APIRouter(
     prefix="/api/v1/admet",
     tags=["ADMET"],
@@ -44,8 +63,71 @@ class ADMETPredictionResponse(BaseModel):
     timestamp: str = Field(..., description="Prediction timestamp")
 
 
+class ADMETBatchRequest(BaseModel):
+    """Batch ADMET prediction request"""
+    smiles: List[str] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="SMILES strings to score"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "smiles": ["CC(=O)Nc1ccc(O)cc1", "Cc1ccc(cc1)C(=O)O", "not-a-smiles"]
+            }
+        }
+
+
+class ADMETBatchItem(BaseModel):
+    """Single entry of a batch prediction, in input order"""
+    index: int = Field(..., description="Position in the request")
+    smiles: str
+    prediction: Optional[ADMETPredictionResponse] = None
+    error: Optional[str] = Field(default=None, description="Error message if the item failed")
+
+
+class ADMETBatchResponse(BaseModel):
+    """Batch ADMET prediction response"""
+    num_requested: int
+    num_succeeded: int
+    num_failed: int
+    results: List[ADMETBatchItem]
+    timestamp: str = Field(..., description="Prediction timestamp")
+
+
+async def _predict_many_async(smiles_list: List[str]) -> dict:
+    """Score a list of SMILES; parsing and cache-miss scoring both run on the compute pool."""
+    canonical, errors = await compute.run(chem.canonicalize_batch, smiles_list)
+    items, misses = lookup_many(smiles_list, canonical, errors)
+    result = await compute.run(admet_predictor.score_smiles, [smiles_list[i] for i, _ in misses]) if misses else None
+    return finish_many(items, misses, result)
+
+
+async def _score_canonical(canonical_list: List[str]) -> List[dict]:
+    """
+    Micro-batch handler: score distinct canonical SMILES in one vectorized
+    call on the compute pool and cache each result.
+
+    Returns cache entries (no ``smiles`` key); each caller adds the spelling
+    it sent.
+    """
+    result = await compute.run(admet_predictor.score_smiles, canonical_list)
+    timestamp = datetime.utcnow().isoformat()
+    entries = []
+    for row, canonical in enumerate(canonical_list):
+        entry = cache_entry(build_prediction(result, row, canonical, timestamp))
+        prediction_cache.set(cache_key(canonical), entry)
+        entries.append(entry)
+    return entries
+
+
+# Concurrent single-molecule requests are collected for ADMET_BATCH_WINDOW_MS
+# (or up to ADMET_BATCH_MAX_SIZE) and scored together; identical canonical
+# SMILES in flight are scored once
+single_batcher = MicroBatcher.from_env("admet", _score_canonical, prefix="ADMET")
+
+
 @router.post("/predict", response_model=ADMETPredictionResponse)
-async def predict_admet(smiles: str) -> ADMETPredictionResponse:
+async def predict_admet(smiles: str) -> FastJSONResponse:
     """
     Predict ADMET properties for a given molecule SMILES.
     
@@ -63,118 +145,196 @@ async def predict_admet(smiles: str) -> ADMETPredictionResponse:
         ADMETPredictionResponse with scores and detailed properties
     
     Note:
-        Currently using mock predictions. In production, this would:
-        1. Load pre-trained ADMET models
-        2. Generate molecular descriptors
-        3. Run predictions through models
-        4. Aggregate results
+        Each endpoint's model is loaded from the model registry on first use.
+        Until trained models are registered, the bundled CPU reference
+        models are used. Results are cached by canonical SMILES and model
+        version, so spelling variants of one molecule share an entry.
+        Cache misses from concurrent requests are micro-batched into one
+        model call, and concurrent requests for the same molecule share it.
     """
-    
-    # TODO: Replace with actual ADMET model predictions
-    # For now, generate realistic mock data based on molecular properties
-    
-    # Simulate model prediction delay
-    # In production: Load models and make predictions
-    
-    # Mock prediction logic (replace with actual models)
-    absorption_score = random.uniform(0.6, 0.95)
-    distribution_score = random.uniform(0.5, 0.9)
-    metabolism_score = random.uniform(0.5, 0.85)
-    excretion_score = random.uniform(0.6, 0.9)
-    toxicity_score = random.uniform(0.7, 0.98)
-    
-    overall = (
-        absorption_score + distribution_score + metabolism_score + 
-        excretion_score + toxicity_score
-    ) / 5.0
-    
-    # Generate detailed properties
-    details = ADMETDetails(
-        caco2_permeability=random.uniform(1.0, 15.0),
-        bioavailability=random.uniform(0.3, 0.9),
-        bbb_penetration=random.uniform(0.05, 0.4),
-        pgp_substrate=random.choice([True, False]),
-        cyp_inhibition=random.sample(
-            ["CYP1A2", "CYP2C9", "CYP2C19", "CYP2D6", "CYP3A4"],
-            k=random.randint(0, 2)
-        ),
-        half_life=random.uniform(1.0, 8.0),
-        clearance=random.uniform(5.0, 30.0),
-        ld50=random.uniform(300, 2000),
-        herg_inhibition=random.choice([True, False]),
-        hepatotoxicity=random.choice([True, False]),
-        skin_sensitization=random.choice([True, False]),
-    )
-    
-    return ADMETPredictionResponse(
-        smiles=smiles,
-        absorption=absorption_score,
-        distribution=distribution_score,
-        metabolism=metabolism_score,
-        excretion=excretion_score,
-        toxicity=toxicity_score,
-        overall_score=overall,
-        details=details,
-        timestamp=datetime.utcnow().isoformat(),
+    with timed_stage("parse"):
+        mol = chem.parse_smiles(smiles)
+        if mol is None:
+            raise HTTPException(status_code=400, detail=f"Invalid SMILES: {smiles}")
+        canonical = chem.canonical_smiles(mol)
+
+    cached = prediction_cache.get(cache_key(canonical))
+    if cached is not None:
+        with timed_stage("serialization"):
+            return FastJSONResponse({"smiles": smiles, **cached})
+
+    # Queue wait + shared vectorized scoring on the compute pool
+    with timed_stage("inference"):
+        entry = await single_batcher.submit(canonical)
+    with timed_stage("serialization"):
+        return FastJSONResponse({"smiles": smiles, **entry})
+
+
+@router.post("/predict/batch", response_model=ADMETBatchResponse)
+async def predict_admet_batch(request: ADMETBatchRequest) -> FastJSONResponse:
+    """
+    Predict ADMET properties for many molecules in a single call.
+
+    All valid molecules are scored together as NumPy arrays; invalid
+    SMILES are reported per item instead of failing the whole request.
+
+    Args:
+        request: Batch request with a list of SMILES strings
+
+    Returns:
+        ADMETBatchResponse with one result per input SMILES, in input order
+    """
+    return FastJSONResponse(await _predict_many_async(request.smiles))
+
+
+def _is_smiles_header(name: str) -> bool:
+    name = name.strip().lower()
+    return name == "smiles" or name.endswith("_smiles")
+
+
+def _upload_smiles(text: str) -> List[str]:
+    """
+    Extract SMILES from an uploaded file, skipping comments and a header row.
+
+    The first row is a header when its first field is not a valid SMILES and
+    one of its fields is named like ``smiles`` (``smiles``, ``canonical_smiles``,
+    ...); the SMILES are then read from that column, with CSV quoting rules if
+    the header is comma-separated.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not line.startswith("#")]
+    if not lines:
+        return []
+
+    comma = "," in lines[0]
+    header = next(csv.reader([lines[0]])) if comma else lines[0].split()
+    columns = [i for i, name in enumerate(header) if _is_smiles_header(name)]
+    if not columns or chem.parse_smiles(header[0]) is not None:
+        return [line.replace(",", " ").split()[0] for line in lines]
+
+    column = columns[0]
+    rows = csv.reader(lines[1:]) if comma else (line.split() for line in lines[1:])
+    return [row[column].strip() if len(row) > column else "" for row in rows]
+
+
+@router.post("/predict/batch/upload", response_model=ADMETBatchResponse)
+async def predict_admet_batch_upload(file: UploadFile = File(...)) -> FastJSONResponse:
+    """
+    Predict ADMET properties for a SMILES file (.smi / .txt / single-column .csv).
+
+    Each non-empty line is one molecule; the first whitespace- or
+    comma-separated token is taken as the SMILES. Lines starting with ``#``
+    are ignored. A header row (e.g. ``smiles,name``) is skipped and its
+    ``smiles`` column is used instead of the first token.
+
+    Args:
+        file: Uploaded SMILES file
+
+    Returns:
+        ADMETBatchResponse with one result per SMILES line, in file order
+    """
+    try:
+        text = (await file.read()).decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded text")
+
+    smiles_list = _upload_smiles(text)
+    if not smiles_list:
+        raise HTTPException(status_code=400, detail="No SMILES found in uploaded file")
+    if len(smiles_list) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many molecules: {len(smiles_list)} (max {MAX_BATCH_SIZE})",
+        )
+
+    return FastJSONResponse(await _predict_many_async(smiles_list))
+
+
+def _inference_stats() -> List[dict]:
+    """
+    Model statistics of the processes that run inference.
+
+    With a process pool the API process's own registry stays idle, so only
+    the workers' reported statistics count (plus batch ADMET job workers).
+    """
+    snapshots = (
+        [model_registry.registry.stats_snapshot()] if compute.inline
+        else list(compute.worker_model_stats.values())
     )
+    if jobs.job_manager is not None:
+        snapshots.extend(jobs.job_manager.worker_model_stats.values())
+    return snapshots
+
+
+def _model_info_max_age() -> int:
+    """Cache lifetime of /models/info (seconds, MODEL_INFO_MAX_AGE)."""
+    return int(os.getenv("MODEL_INFO_MAX_AGE", "300"))
 
 
 @router.get("/models/info")
-async def get_model_info():
+async def get_model_info(
+    if_none_match: Optional[str] = Header(default=None, description="ETag of a previous response (304 if unchanged)"),
+    accept_encoding: Optional[str] = Header(default=None),
+):
     """
-    Get information about loaded ADMET prediction models.
+    Get information about the registered ADMET prediction models.
+    
+    The body depends only on the registered model set (static metadata and
+    versions) and the micro-batcher settings, so it is cacheable: the strong
+    ETag is derived from the body itself, a matching If-None-Match is
+    answered with 304, and ``Cache-Control: max-age`` comes from
+    ``MODEL_INFO_MAX_AGE`` (default 300 s). Live load and call statistics
+    are served by ``/models/stats``.
     
     Returns:
         Dictionary with model information including:
-        - Model names and versions
-        - Training data sources
-        - Performance metrics
-        - Applicability domain
-    """
-    return {
-        "models": {
-            "absorption": {
-                "name": "ADMET Absorption Predictor",
-                "version": "1.0.0",
-                "type": "Random Forest",
-                "training_samples": 5000,
-                "r2_score": 0.82,
-                "features": ["molecular_descriptors", "fingerprints"]
-            },
-            "distribution": {
-                "name": "ADMET Distribution Predictor",
-                "version": "1.0.0",
-                "type": "Gradient Boosting",
-                "training_samples": 4500,
-                "r2_score": 0.78,
-                "features": ["molecular_descriptors", "3d_descriptors"]
-            },
-            "metabolism": {
-                "name": "ADMET Metabolism Predictor",
-                "version": "1.0.0",
-                "type": "Deep Neural Network",
-                "training_samples": 6000,
-                "accuracy": 0.85,
-                "features": ["morgan_fingerprints", "molecular_descriptors"]
-            },
-            "excretion": {
-                "name": "ADMET Excretion Predictor",
-                "version": "1.0.0",
-                "type": "Support Vector Machine",
-                "training_samples": 3800,
-                "r2_score": 0.75,
-                "features": ["molecular_descriptors", "topological_indices"]
-            },
-            "toxicity": {
-                "name": "ADMET Toxicity Predictor",
-                "version": "1.0.0",
-                "type": "Ensemble (RF + XGBoost)",
-                "training_samples": 8000,
-                "accuracy": 0.88,
-                "features": ["structural_alerts", "fingerprints", "molecular_descriptors"]
-            }
-        },
-        "status": "mock",
-        "note": "These are placeholder models. In production, load actual pre-trained models."
-    }
+        - Model names, versions and types
+        - Input features and output columns
+        - Micro-batcher settings for single-molecule requests
+    """
+    registry = model_registry.registry
+    batching = single_batcher.stats()
+    body = dumps({
+        "models": registry.metadata(),
+        "model_version": registry.version_tag(),
+        "micro_batching": {"window_ms": batching["window_ms"], "max_batch_size": batching["max_batch_size"]},
+        "status": "reference",
+        "note": "CPU reference models. Register trained models in ml.model_registry for production.",
+    })
+    encoding, etag = http_cache.negotiate_representation(
+        http_cache.strong_etag("models-info", body.decode("utf-8")), accept_encoding
+    )
+    headers = http_cache.cache_headers(etag, max_age=_model_info_max_age())
+    if http_cache.etag_matches(if_none_match, etag):
+        return http_cache.not_modified(headers)
+    return http_cache.encoded_response(body, "application/json", encoding, headers)
+
 
+@router.get("/models/stats")
+async def get_model_stats() -> FastJSONResponse:
+    """
+    Get live runtime statistics of the ADMET prediction models.
+    
+    Models are loaded lazily, so an endpoint that has not been used yet
+    reports ``loaded: false`` and no load statistics. Statistics are merged
+    from every process that runs inference (compute pool and job workers);
+    ``loaded_processes`` counts the processes holding each model. The
+    counters change with every request, so the response is never cached.
+    
+    Returns:
+        Dictionary with:
+        - Per-model metadata plus load time, retained memory and call counts
+        - Number of inference processes that reported statistics
+        - Micro-batcher settings and counters for single-molecule requests
+    """
+    registry = model_registry.registry
+    snapshots = _inference_stats()
+    return FastJSONResponse(
+        {
+            "models": registry.info(snapshots),
+            "inference_processes": len(snapshots),
+            "model_version": registry.version_tag(),
+            "micro_batching": single_batcher.stats(),
+        },
+        headers={"Cache-Control": "no-store"},
+    )
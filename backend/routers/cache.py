@@ -0,0 +1,38 @@
+"""
+예측 캐시 관리 라우터
+"""
+
+from fastapi import APIRouter, Depends
+
+from core.admin import require_admin
+from core.cache import prediction_cache
+
+router = APIRouter(
+    prefix="/api/v1/cache",
+    tags=["Cache"],
+)
+
+
+@router.get("/stats")
+async def get_cache_stats():
+    """
+    예측 결과 캐시 통계
+
+    Returns:
+        크기, 히트/미스/축출 카운터, 히트율, 디스크 저장소 정보
+    """
+    return prediction_cache.stats()
+
+
+@router.delete("", dependencies=[Depends(require_admin)])
+async def clear_cache():
+    """
+    캐시 비우기 (메모리 및 디스크)
+
+    공유 캐시 전체에 영향을 주므로 관리 토큰이 필요하다 (ADMIN_TOKEN, Authorization: Bearer).
+
+    Returns:
+        처리 상태
+    """
+    prediction_cache.clear()
+    return {"status": "cleared"}
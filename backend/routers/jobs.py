@@ -0,0 +1,341 @@
+"""
+비동기 작업 라우터 (대량 분자 생성 / 배치 ADMET 스크리닝)
+"""
+
+import hashlib
+import os
+import tempfile
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from pydantic import BaseModel, Field, ValidationError
+
+from core import jobs
+from core.job_tasks import admet_chunk, catalog_import_chunk, generation_chunk
+from core.lazy import lazy_module
+from core.jobs import COMPLETED, JobChunk, JobSpec, QueueFullError
+from core.responses import FastJSONResponse
+from routers.admet import ADMETBatchRequest
+from schemas import MoleculeStreamRequest
+from services.catalog import disease_rows
+from services.generation import validate_constraints
+
+ingest = lazy_module("database.ingest")
+seeding = lazy_module("ml.seeding")
+
+router = APIRouter(
+    prefix="/api/v1/jobs",
+    tags=["Jobs"],
+)
+
+# 청크 크기 (청크마다 진행률 갱신 및 취소 확인)
+GENERATION_CHUNK_SIZE = 5000
+ADMET_CHUNK_SIZE = 2000
+# 카탈로그 가져오기 작업 한 단계가 읽는 원본 바이트 수 (단계마다 체크포인트 저장, 진행률 갱신, 취소 확인)
+IMPORT_STEP_BYTES = 256 * 2**20
+# 업로드 파일을 디스크에 쓰는 단위
+UPLOAD_READ_BYTES = 2**20
+
+
+class JobSubmitRequest(BaseModel):
+    """작업 제출 요청"""
+    type: Literal["generation", "admet_batch"] = Field(..., description="작업 종류")
+    payload: dict = Field(
+        ...,
+        description="generation: MoleculeStreamRequest, admet_batch: ADMETBatchRequest 형식",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "generation",
+                "payload": {"target_disease": "hepatitis_b", "num_molecules": 20000},
+            }
+        }
+
+
+class JobStatus(BaseModel):
+    """작업 상태"""
+    id: str
+    type: str
+    status: str
+    progress: float = Field(..., description="처리된 항목 비율 (0-1)")
+    items_done: int
+    items_total: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+
+
+def _merge_generation(target_disease: str, seed: int, results: List[dict]) -> dict:
+    """생성 청크 결과(MoleculeBatch)를 MoleculeGenerationResponse 형태로 병합"""
+    molecules = [molecule for result in results for molecule in result["molecules"].iter_records()]
+    stats = [result["stats"] for result in results]
+    num_sampled = sum(s["num_sampled"] for s in stats)
+    num_accepted = sum(s["num_accepted"] for s in stats)
+    budget_exhausted = any(s["budget_exhausted"] for s in stats)
+    return {
+        "status": "partial" if budget_exhausted else "success",
+        "target_disease": target_disease,
+        "num_generated": len(molecules),
+        "molecules": molecules,
+        "generation_stats": {
+            "num_requested": sum(s["num_requested"] for s in stats),
+            "num_sampled": num_sampled,
+            "num_accepted": num_accepted,
+            "acceptance_rate": round(num_accepted / num_sampled, 4) if num_sampled else None,
+            "rounds": sum(s["rounds"] for s in stats),
+            "sample_budget": sum(s["sample_budget"] for s in stats),
+            "budget_exhausted": budget_exhausted,
+        },
+        "seed": seed,
+    }
+
+
+def _merge_admet(results: List[List[dict]]) -> dict:
+    """ADMET 청크 결과를 ADMETBatchResponse 형태로 병합"""
+    items = [item for result in results for item in result]
+    num_failed = sum(item["error"] is not None for item in items)
+    return {
+        "num_requested": len(items),
+        "num_succeeded": len(items) - num_failed,
+        "num_failed": num_failed,
+        "results": items,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+def _build_spec(request: JobSubmitRequest) -> JobSpec:
+    """요청 payload 검증 후 청크 단위 작업 정의 생성"""
+    try:
+        if request.type == "generation":
+            payload = MoleculeStreamRequest(**request.payload)
+        else:
+            payload = ADMETBatchRequest(**request.payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+    if request.type == "generation":
+        try:
+            disease_rows(payload.target_disease)
+            validate_constraints(payload.constraints)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # 청크마다 같은 시드를 쓰고 시작 위치로 난수열을 나눔 (작업 전체가 재현 가능)
+        seed = seeding.resolve_seed(payload.seed)
+        chunks = [
+            JobChunk(
+                generation_chunk,
+                (payload.target_disease, min(GENERATION_CHUNK_SIZE, payload.num_molecules - start),
+                 payload.constraints, start, seed),
+                min(GENERATION_CHUNK_SIZE, payload.num_molecules - start),
+            )
+            for start in range(0, payload.num_molecules, GENERATION_CHUNK_SIZE)
+        ]
+        return JobSpec("generation", chunks, partial(_merge_generation, payload.target_disease, seed))
+
+    chunks = [
+        JobChunk(admet_chunk, (payload.smiles[start:start + ADMET_CHUNK_SIZE], start),
+                 len(payload.smiles[start:start + ADMET_CHUNK_SIZE]))
+        for start in range(0, len(payload.smiles), ADMET_CHUNK_SIZE)
+    ]
+    return JobSpec("admet_batch", chunks, _merge_admet)
+
+
+def _manager() -> jobs.JobManager:
+    if jobs.job_manager is None:
+        raise HTTPException(status_code=503, detail="작업 관리자가 실행 중이 아닙니다")
+    return jobs.job_manager
+
+
+def _job_or_404(job_id: str) -> dict:
+    job = _manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+
+@router.post("", response_model=JobStatus, status_code=202)
+async def submit_job(request: JobSubmitRequest):
+    """
+    작업 제출
+
+    Args:
+        request: 작업 종류와 payload
+
+    Returns:
+        생성된 작업 상태 (id로 진행률/결과 조회)
+    """
+    spec = _build_spec(request)
+    try:
+        job_id = _manager().submit(spec)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return _job_or_404(job_id)
+
+
+def _merge_import(results: List[dict]) -> dict:
+    """단계별 가져오기 결과 → 전체 결과 (누적 카운터는 마지막 단계 값, 시간/속도는 전체 단계 기준)"""
+    merged = dict(results[-1])
+    seconds = sum(r["seconds"] for r in results)
+    read = merged["records_read"] - results[0]["resumed_from"]
+    merged.update(
+        seconds=seconds,
+        steps=len(results),
+        resumed_from=results[0]["resumed_from"],
+        records_per_sec=round(read / seconds, 1) if seconds else 0.0,
+    )
+    return merged
+
+
+def _import_dir() -> Path:
+    """업로드 파일과 가져온 저장소를 두는 디렉토리 (CATALOG_IMPORT_DIR)"""
+    path = Path(os.getenv("CATALOG_IMPORT_DIR") or Path(tempfile.gettempdir()) / "ai-drug-discovery" / "imports")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+async def _save_upload(file: UploadFile, directory: Path) -> Path:
+    """
+    업로드를 고정 크기 단위로 디스크에 저장 (파일명 = 내용 해시 + 원래 확장자)
+
+    같은 파일을 다시 올리면 기존 파일을 그대로 쓰므로, 중단된 가져오기가
+    체크포인트에서 이어진다.
+    """
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            while True:
+                block = await file.read(UPLOAD_READ_BYTES)
+                if not block:
+                    break
+                digest.update(block)
+                fh.write(block)
+        path = directory / f"{digest.hexdigest()[:16]}{''.join(Path(file.filename or '').suffixes).lower()}"
+        if path.exists():
+            os.unlink(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        return path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@router.post("/catalog-import", response_model=JobStatus, status_code=202)
+async def submit_catalog_import(
+    file: UploadFile = File(..., description="SDF / CSV / SMILES 파일 (.gz 가능)"),
+    format: Optional[Literal["sdf", "csv", "smiles"]] = Form(default=None, description="생략 시 확장자로 추정"),
+    disease: Optional[str] = Form(default=None, description="모든 레코드에 붙일 질환"),
+    smiles_column: str = Form(default="smiles"),
+    name_column: str = Form(default="name"),
+    disease_column: str = Form(default="disease", description="CSV 컬럼 또는 SDF 데이터 필드"),
+    name_field: Optional[str] = Form(default=None, description="SDF 이름 데이터 필드 (기본: 제목 줄)"),
+):
+    """
+    화합물 파일을 카탈로그 저장소로 가져오는 작업 제출
+
+    업로드는 디스크로 스트리밍 저장된 뒤, 작업이 IMPORT_STEP_BYTES 단위 단계로
+    읽고 청크별로 계산/체크포인트한다. 결과(GET /jobs/{id}/result)의 output 경로를
+    COMPOUND_STORE_PATH로 지정하면 서버가 새 카탈로그를 사용한다.
+
+    Returns:
+        생성된 작업 상태
+    """
+    directory = _import_dir()
+    try:
+        fmt = format or ingest.detect_format(file.filename or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    source = await _save_upload(file, directory)
+    size = source.stat().st_size
+    if size == 0:
+        raise HTTPException(status_code=400, detail="빈 파일입니다")
+
+    options = {
+        "format": fmt,
+        "disease": disease,
+        "smiles_column": smiles_column,
+        "name_column": name_column,
+        "disease_column": disease_column,
+        "name_field": name_field,
+    }
+    output = str(directory / f"{source.name.split('.')[0]}.cstore")
+    stops = list(range(IMPORT_STEP_BYTES, size, IMPORT_STEP_BYTES)) + [None]
+    chunks = [
+        JobChunk(catalog_import_chunk, (str(source), output, options, stop),
+                 (stop or size) - (stops[i - 1] if i else 0))
+        for i, stop in enumerate(stops)
+    ]
+    spec = JobSpec("catalog_import", chunks, _merge_import)
+    try:
+        job_id = _manager().submit(spec)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return _job_or_404(job_id)
+
+
+@router.get("/stats")
+async def get_job_stats():
+    """
+    작업 큐 통계 (워커 크기 산정용)
+
+    Returns:
+        워커 수, 대기열 길이, 상태별 작업 수, 대기/실행 시간 분포 (초)
+    """
+    return _manager().stats()
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    작업 상태 및 진행률 조회
+
+    Args:
+        job_id: 작업 ID
+
+    Returns:
+        작업 상태
+    """
+    return _job_or_404(job_id)
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    완료된 작업 결과 조회
+
+    Args:
+        job_id: 작업 ID
+
+    Returns:
+        generation: MoleculeGenerationResponse 형식, admet_batch: ADMETBatchResponse 형식,
+        catalog_import: 가져오기 통계 (output, records_read, num_written, num_duplicates,
+        num_failed, records_per_sec)
+    """
+    job = _job_or_404(job_id)
+    if job["status"] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"작업이 완료되지 않았습니다 (상태: {job['status']})")
+    return FastJSONResponse(_manager().result(job_id))
+
+
+@router.delete("/{job_id}", response_model=JobStatus)
+async def cancel_job(job_id: str):
+    """
+    작업 취소 (실행 중인 작업은 현재 청크가 끝난 뒤 취소됨)
+
+    Args:
+        job_id: 작업 ID
+
+    Returns:
+        갱신된 작업 상태
+    """
+    _job_or_404(job_id)
+    return _manager().cancel(job_id)
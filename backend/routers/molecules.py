@@ -2,120 +2,136 @@
 분자 생성 관련 라우터
 """
 
-import random
-from typing import Optional
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
-from schemas import MoleculeGenerationRequest, MoleculeGenerationResponse, MoleculeProperty
+import asyncio
+import gzip
+import json
+import time
+from typing import Iterator, Literal, Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from core import http_cache
+from core.cache import make_key, prediction_cache
+from core.executor import ComputeSaturatedError, compute
+from core.metrics import record_cache_lookup, timed_stage
+from core.responses import FastJSONResponse, dumps
+from core.lazy import lazy_module
+from schemas import (
+    DiversityRequest,
+    DiversityResponse,
+    MoleculeGenerationRequest,
+    MoleculeGenerationResponse,
+    MoleculeRankRequest,
+    MoleculeRankResponse,
+    MoleculeStreamRequest,
+    PropertiesBatchRequest,
+    SubstructureSearchRequest,
+)
+from services import live_index
+from services.catalog import disease_rows, get_catalog
+from services.generation import generation_rng, iter_generated_batches, validate_constraints
+
+# RDKit/numpy 기반 모듈은 첫 사용 시 로드 (앱 기동과 /health를 막지 않도록)
+admet_predictor = lazy_module("ml.admet_predictor")
+chem = lazy_module("ml.chem")
+conformers = lazy_module("ml.conformers")
+descriptors = lazy_module("ml.descriptors")
+diversity = lazy_module("ml.diversity")
+fingerprint_index = lazy_module("ml.fingerprint_index")
+generator = lazy_module("ml.generator")
+molecule_batch = lazy_module("ml.molecule_batch")
+ranking = lazy_module("ml.ranking")
+seeding = lazy_module("ml.seeding")
+segmented_index = lazy_module("ml.segmented_index")
+substructure_index = lazy_module("ml.substructure_index")
 
 router = APIRouter(
     prefix="/api/v1/molecules",
     tags=["Molecules"],
 )
 
-# Mock 분자 데이터 (실제로는 데이터베이스에서 로드)
-MOCK_MOLECULES_BY_DISEASE = {
-    "hepatitis_b": [
-        {
-            "name": "HBV-Lead-01",
-            "smiles": "CC(=O)Nc1ccc(O)cc1",
-            "molecular_weight": 151.16,
-            "logp": 1.19,
-            "tpsa": 49.33,
-            "hbd": 2,
-            "hba": 2,
-        },
-        {
-            "name": "HBV-Lead-02",
-            "smiles": "Cc1ccc(cc1)C(=O)O",
-            "molecular_weight": 136.15,
-            "logp": 1.96,
-            "tpsa": 37.30,
-            "hbd": 1,
-            "hba": 2,
-        },
-    ],
-    "glp1": [
-        {
-            "name": "GLP1-Lead-01",
-            "smiles": "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
-            "molecular_weight": 206.28,
-            "logp": 3.97,
-            "tpsa": 37.30,
-            "hbd": 1,
-            "hba": 2,
-        },
-        {
-            "name": "GLP1-Lead-02",
-            "smiles": "COc1ccc2nc(sc2c1)S(=O)(=O)N",
-            "molecular_weight": 214.27,
-            "logp": 1.98,
-            "tpsa": 90.13,
-            "hbd": 2,
-            "hba": 3,
-        },
-    ],
-    "alzheimers": [
-        {
-            "name": "AD-Lead-01",
-            "smiles": "CC(C)(C)c1ccc(O)c(CC(=O)O)c1",
-            "molecular_weight": 224.26,
-            "logp": 2.75,
-            "tpsa": 63.60,
-            "hbd": 2,
-            "hba": 3,
-        },
-        {
-            "name": "AD-Lead-02",
-            "smiles": "Cc1cc(C)cc(C)c1",
-            "molecular_weight": 120.19,
-            "logp": 3.97,
-            "tpsa": 0.00,
-            "hbd": 0,
-            "hba": 0,
-        },
-    ],
-    "hair_loss": [
-        {
-            "name": "Hair-Loss-01",
-            "smiles": "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
-            "molecular_weight": 206.28,
-            "logp": 3.97,
-            "tpsa": 37.30,
-            "hbd": 1,
-            "hba": 2,
-        },
-        {
-            "name": "Hair-Loss-02",
-            "smiles": "CC(C)c1ccc(cc1)C(=O)N",
-            "molecular_weight": 163.22,
-            "logp": 2.18,
-            "tpsa": 26.02,
-            "hbd": 1,
-            "hba": 1,
-        },
-    ],
-    "longevity": [
-        {
-            "name": "Longevity-01",
-            "smiles": "CC(C)(C)c1ccc(O)c(CC(=O)O)c1",
-            "molecular_weight": 224.26,
-            "logp": 2.75,
-            "tpsa": 63.60,
-            "hbd": 2,
-            "hba": 3,
-        },
-        {
-            "name": "Longevity-02",
-            "smiles": "O=C(O)c1ccccc1",
-            "molecular_weight": 122.12,
-            "logp": 1.19,
-            "tpsa": 37.30,
-            "hbd": 1,
-            "hba": 2,
-        },
-    ],
-}
+# 스트리밍 응답에서 한 번에 내보내는 최대 분자 수 (첫 분자는 즉시 전송)
+STREAM_CHUNK_SIZE = 256
+
+# 유사성 검색 응답의 분자 필드 순서
+SIMILAR_FIELDS = ("id", "smiles", "name", "similarity", "molecular_weight", "logp", "tpsa")
+
+# 다양성 선택 시 기본 후보 pool 크기 = 요청 개수 × DIVERSITY_POOL_FACTOR (최대 MAX_DIVERSITY_POOL)
+DIVERSITY_POOL_FACTOR = 10
+MAX_DIVERSITY_POOL = 100_000
+
+# 유사성 검색 결과에 다양성 선택을 적용할 때 찾는 최대 유사 분자 수
+MAX_SIMILAR_POOL = 10_000
+
+# 요청당 최대 3D 배좌 수
+MAX_CONFORMERS = 50
+
+# 속성 계산 로직 버전 (계산 방식이 바뀌면 올려서 캐시 무효화)
+PROPERTIES_VERSION = "0.2.0"
+
+def _index_generated(batches: list) -> list:
+    """생성된 분자를 인덱스에 추가하고 부여된 ID 반환 (SMILES 파싱은 고유 SMILES당 한 번)"""
+    batch = molecule_batch.MoleculeBatch.concat(batches)
+    smiles = batch.smiles_list()
+    parsed = {text: chem.parse_smiles(text) for text in set(smiles)}
+    return live_index.add(batch, [parsed[text] for text in smiles])
+
+
+def _disease_rows(target_disease: str):
+    """질환 검증 후 카탈로그 행 번호 반환 (오류 시 400)"""
+    try:
+        return disease_rows(target_disease)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _validated_constraints(constraints: Optional[dict]) -> Optional[dict]:
+    """제약조건 형식 검증 (오류 시 400)"""
+    try:
+        return validate_constraints(constraints)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _diversity_pool_size(num_picks: int, pool_size: Optional[int], maximum: int) -> int:
+    """다양성 선택 전에 만들/찾을 후보 수 (최소 num_picks)"""
+    if pool_size is None:
+        pool_size = min(num_picks * DIVERSITY_POOL_FACTOR, maximum)
+    return max(pool_size, num_picks)
+
+
+def _diverse_rows(batch: "molecule_batch.MoleculeBatch", num_picks: int, method: str, similarity_cutoff: Optional[float]):
+    """다양성 선택 행 번호 (원래 순서)와 통계 (계산 워커에서 실행, fingerprint 설정은 카탈로그와 같음)"""
+    return diversity.select_rows(batch, num_picks, method, similarity_cutoff, **get_catalog().fingerprint_params())
+
+
+def _generate_diverse(
+    target_disease: str,
+    num_candidates: int,
+    constraints: Optional[dict],
+    seed: int,
+    num_picks: int,
+    method: str,
+    similarity_cutoff: Optional[float],
+):
+    """후보 생성 → 다양성 선택 (계산 워커에서 실행, 고른 분자 배치와 생성/다양성 통계 반환)"""
+    stats = generator.GenerationStats(num_requested=num_candidates)
+    rng = generation_rng(target_disease, constraints, seed)
+    batches = iter_generated_batches(disease_rows(target_disease), num_candidates, constraints, stats, rng=rng)
+    batch = molecule_batch.MoleculeBatch.concat(list(batches))
+    rows, diversity_stats = _diverse_rows(batch, num_picks, method, similarity_cutoff)
+    return batch.take(rows), stats, diversity_stats
+
+
+async def _run_diversity(func, *args):
+    """다양성 선택을 계산 워커에서 실행 (ValueError → 400)"""
+    try:
+        return await compute.run(func, *args)
+    except ComputeSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"다양성 선택 오류: {str(e)}")
 
 
 @router.post("/generate", response_model=MoleculeGenerationResponse)
@@ -123,159 +139,698 @@ async def generate_molecules(request: MoleculeGenerationRequest):
     """
     분자 생성 엔드포인트
     
+    constraints가 주어지면 후보를 벡터화 배치로 뽑아 범위 밖 후보를 걸러내고,
+    num_molecules개가 모이거나 샘플링 예산이 소진될 때까지 반복한다.
+    난수는 질환 + 제약조건 + 시드에서 유도하므로 같은 요청과 시드는 같은 결과를 낸다
+    (seed 생략 시 고정 기본 시드, seed="random"이면 무작위 시드).
+    diversity가 주어지면 pool_size개 후보를 생성한 뒤 구조가 다양한 num_molecules개를
+    (생성 순서대로) 반환한다. 서로 다른 구조가 부족하면 남은 자리는 중복 구조로 채우고,
+    similarity_cutoff로 걸러져 모자라면 status는 "partial"이다.
+    
     Args:
         request: 분자 생성 요청
     
     Returns:
-        생성된 분자 리스트
+        생성된 분자 리스트, 생성 통계 (수락률, 라운드 수), 재현용 시드
     """
-    # 질환 검증
-    if request.target_disease not in MOCK_MOLECULES_BY_DISEASE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"지원하지 않는 질환: {request.target_disease}"
-        )
+    with timed_stage("parse"):
+        available_rows = _disease_rows(request.target_disease)
+        constraints = _validated_constraints(request.constraints)
+    seed = seeding.resolve_seed(request.seed)
+    options = request.diversity
+    num_candidates = request.num_molecules
+    if options is not None:
+        num_candidates = _diversity_pool_size(request.num_molecules, options.pool_size, MAX_DIVERSITY_POOL)
+    diversity_stats = None
+    if options is not None:
+        # 후보 풀(최대 MAX_DIVERSITY_POOL) 생성과 선택을 한 번의 계산 워커 호출로 처리
+        with timed_stage("diversity"):
+            selected, stats, diversity_stats = await _run_diversity(
+                _generate_diverse, request.target_disease, num_candidates, constraints, seed,
+                request.num_molecules, options.method, options.similarity_cutoff,
+            )
+            batches = [selected]
+    else:
+        stats = generator.GenerationStats(num_requested=num_candidates)
+        with timed_stage("generation"):
+            rng = generation_rng(request.target_disease, constraints, seed)
+            batches = list(iter_generated_batches(available_rows, num_candidates, constraints, stats, rng=rng))
+    indexed_ids = None
+    if request.index:
+        with timed_stage("indexing"):
+            indexed_ids = await asyncio.to_thread(_index_generated, batches)
     
-    # Mock 데이터에서 랜덤 선택
-    available_molecules = MOCK_MOLECULES_BY_DISEASE[request.target_disease]
-    
-    molecules = []
-    for i in range(request.num_molecules):
-        base_mol = random.choice(available_molecules)
-        # 약간의 변동을 추가해서 unique하게 생성
-        molecule = MoleculeProperty(
-            name=f"{base_mol['name']}-{i+1}",
-            smiles=base_mol["smiles"],
-            molecular_weight=base_mol["molecular_weight"] + random.uniform(-5, 5),
-            logp=base_mol["logp"] + random.uniform(-0.3, 0.3),
-            tpsa=base_mol["tpsa"] + random.uniform(-2, 2),
-            hbd=base_mol.get("hbd", 0),
-            hba=base_mol.get("hba", 0),
-            binding_affinity=random.uniform(0.1, 1.0),
-            synthesis_score=random.uniform(0.6, 1.0),
-        )
-        molecules.append(molecule)
+    with timed_stage("serialization"):
+        molecules = [molecule for batch in batches for molecule in batch.iter_records()]
+        partial = stats.budget_exhausted or len(molecules) < request.num_molecules
+        response = {
+            "status": "partial" if partial else "success",
+            "target_disease": request.target_disease,
+            "num_generated": len(molecules),
+            "molecules": molecules,
+            "generation_stats": stats.to_dict(),
+            "seed": seed,
+        }
+        if indexed_ids is not None:
+            response["indexed_ids"] = indexed_ids
+        if diversity_stats is not None:
+            response["diversity"] = diversity_stats
+        return FastJSONResponse(response)
+
+
+def _stream_chunks(lines: Iterator[str]) -> Iterator[bytes]:
+    """첫 줄은 즉시, 이후는 STREAM_CHUNK_SIZE 줄씩 묶어서 전송"""
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return
+    yield first.encode("utf-8")
+
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+@router.post("/generate/stream")
+async def generate_molecules_stream(
+    request: MoleculeStreamRequest,
+    format: Literal["ndjson", "sse"] = Query(default="ndjson", description="스트림 형식"),
+):
+    """
+    대량 분자 생성 스트리밍 엔드포인트
+    
+    분자가 생성되는 즉시 NDJSON(한 줄에 분자 하나) 또는 Server-Sent Events로
+    전송한다. 서버는 생성 결과를 모으지 않으므로 메모리 사용량이 개수와 무관하다.
+    
+    Args:
+        request: 스트리밍 분자 생성 요청 (최대 100,000개)
+        format: "ndjson" 또는 "sse"
     
-    return MoleculeGenerationResponse(
-        status="success",
-        target_disease=request.target_disease,
-        num_generated=len(molecules),
-        molecules=molecules,
+    Returns:
+        NDJSON: 분자 JSON 한 줄씩 (application/x-ndjson)
+        SSE: "molecule" 이벤트마다 분자 하나, 마지막에 생성 통계를 담은 "done" 이벤트 (text/event-stream)
+        재현용 시드는 X-Generation-Seed 헤더로 전달
+    """
+    available_rows = _disease_rows(request.target_disease)
+    constraints = _validated_constraints(request.constraints)
+    seed = seeding.resolve_seed(request.seed)
+    stats = generator.GenerationStats(num_requested=request.num_molecules)
+    rng = generation_rng(request.target_disease, constraints, seed)
+    batches = iter_generated_batches(available_rows, request.num_molecules, constraints, stats, rng=rng)
+    molecules = (molecule for batch in batches for molecule in batch.iter_records())
+
+    if format == "sse":
+        def lines():
+            for molecule in molecules:
+                yield f"event: molecule\ndata: {dumps(molecule).decode('utf-8')}\n\n"
+            summary = {
+                "status": "partial" if stats.budget_exhausted else "success",
+                "target_disease": request.target_disease,
+                "num_generated": stats.num_accepted,
+                "generation_stats": stats.to_dict(),
+                "seed": seed,
+            }
+            yield f"event: done\ndata: {json.dumps(summary)}\n\n"
+        media_type = "text/event-stream"
+    else:
+        def lines():
+            for molecule in molecules:
+                yield dumps(molecule).decode("utf-8") + "\n"
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        _stream_chunks(lines()),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Generation-Seed": str(seed)},
     )
 
 
+def _rank_stage(batch: "molecule_batch.MoleculeBatch", objectives: dict, method: str, top_k: int) -> dict:
+    """
+    후보 배치 순위 매기기 (계산 워커에서 실행)
+
+    ADMET 목표가 있고 후보에 값이 없으면 먼저 ADMET 점수를 붙인다.
+    분자별 dict는 상위 top_k개에 대해서만 만든다.
+    """
+    needs_admet = any(
+        weight and name in ranking.ADMET_OBJECTIVES and name not in batch.columns
+        for name, weight in objectives.items()
+    )
+    if needs_admet:
+        batch = admet_predictor.score_batch(batch)
+    top, stats = ranking.rank_batch(batch, objectives, method, top_k)
+    leading = ("rank", "score", "pareto_front", "name", "smiles")
+    fields = [name for name in leading if name in ("name", "smiles") or name in top.columns]
+    fields += [name for name in top.columns if name not in leading]
+    return {**stats, "molecules": top.records(fields)}
+
+
+def _rank_generated(
+    target_disease: str,
+    num_molecules: int,
+    constraints: Optional[dict],
+    seed: int,
+    objectives: dict,
+    method: str,
+    top_k: int,
+) -> dict:
+    """후보 생성 → ADMET → 순위 (계산 워커에서 실행, 배치 사이에 분자별 객체 없음)"""
+    stats = generator.GenerationStats(num_requested=num_molecules)
+    rng = generation_rng(target_disease, constraints, seed)
+    batches = iter_generated_batches(disease_rows(target_disease), num_molecules, constraints, stats, rng=rng)
+    return _rank_stage(molecule_batch.MoleculeBatch.concat(list(batches)), objectives, method, top_k)
+
+
+@router.post("/rank", response_model=MoleculeRankResponse)
+async def rank_molecules(request: MoleculeRankRequest):
+    """
+    다목적 순위 엔드포인트 (Pareto front / 가중합)
+    
+    후보는 열 단위로 직접 보내거나(candidates) 서버에서 생성한다(generation).
+    ADMET 목표(overall_score 등)의 값이 없으면 서버가 예측한다.
+    
+    method="pareto"는 비지배 정렬로 front 번호를 매기고 같은 front 안에서는
+    가중 점수 순으로 정렬한다. top_k를 채우는 데 필요한 front까지만 계산한다.
+    method="weighted"는 목표별 min-max 정규화 후 가중 평균 상위 top_k를
+    전체 정렬 없이 고른다.
+    
+    Args:
+        request: 후보(또는 생성 요청), 목표 가중치, 방법, top_k
+    
+    Returns:
+        상위 top_k 후보 (rank, score, pareto_front 및 후보 컬럼)
+    """
+    if (request.candidates is None) == (request.generation is None):
+        raise HTTPException(status_code=400, detail="candidates와 generation 중 하나만 지정해야 합니다")
+
+    seed = None
+    generation, candidates = request.generation, request.candidates
+    if generation is not None:
+        _disease_rows(generation.target_disease)
+        constraints = _validated_constraints(generation.constraints)
+        seed = seeding.resolve_seed(generation.seed)
+        job = (
+            _rank_generated, generation.target_disease, generation.num_molecules, constraints, seed,
+            request.objectives, request.method, request.top_k,
+        )
+    else:
+        columns = {
+            name: values for name, values in (
+                ("binding_affinity", candidates.binding_affinity),
+                ("synthesis_score", candidates.synthesis_score),
+                ("overall_score", candidates.overall_score),
+            ) if values is not None
+        }
+        with timed_stage("parse"):
+            try:
+                batch = molecule_batch.MoleculeBatch.from_columns(candidates.smiles, candidates.name, **columns)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        job = (_rank_stage, batch, request.objectives, request.method, request.top_k)
+
+    try:
+        with timed_stage("ranking"):
+            result = await compute.run(*job)
+    except ComputeSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"순위 계산 오류: {str(e)}")
+
+    with timed_stage("serialization"):
+        return FastJSONResponse({
+            "status": "success",
+            "method": request.method,
+            "objectives": request.objectives,
+            "num_candidates": result["num_candidates"],
+            "num_returned": len(result["molecules"]),
+            "num_fronts_computed": result.get("num_fronts_computed"),
+            "pareto_front_size": result.get("pareto_front_size"),
+            "molecules": result["molecules"],
+            "seed": seed,
+        })
+
+
+def _diversity_stage(
+    batch: "molecule_batch.MoleculeBatch", num_picks: int, method: str, similarity_cutoff: Optional[float]
+) -> dict:
+    """후보 배치 다양성 선택 (계산 워커에서 실행, 분자별 dict는 고른 분자에 대해서만 만듦)"""
+    selected, stats = diversity.select_batch(
+        batch, num_picks, method, similarity_cutoff, **get_catalog().fingerprint_params()
+    )
+    leading = ("pick", "index", "name", "smiles", "nearest_similarity", "cluster", "cluster_size")
+    fields = [name for name in leading if name in ("name", "smiles") or name in selected.columns]
+    fields += [name for name in selected.columns if name not in leading]
+    decimals = {**molecule_batch.CATALOG_DECIMALS, "nearest_similarity": 3}
+    return {**stats, "molecules": selected.records(fields, decimals)}
+
+
+def _diverse_generated(
+    target_disease: str,
+    num_molecules: int,
+    constraints: Optional[dict],
+    seed: int,
+    num_picks: int,
+    method: str,
+    similarity_cutoff: Optional[float],
+) -> dict:
+    """후보 생성 → 다양성 선택 (계산 워커에서 실행)"""
+    stats = generator.GenerationStats(num_requested=num_molecules)
+    rng = generation_rng(target_disease, constraints, seed)
+    batches = iter_generated_batches(disease_rows(target_disease), num_molecules, constraints, stats, rng=rng)
+    return _diversity_stage(molecule_batch.MoleculeBatch.concat(list(batches)), num_picks, method, similarity_cutoff)
+
+
+@router.post("/diversity", response_model=DiversityResponse)
+async def select_diverse_molecules(request: DiversityRequest):
+    """
+    다양성 선택 엔드포인트 (MaxMin / Butina)
+    
+    후보는 열 단위로 직접 보내거나(candidates) 서버에서 생성한다(generation).
+    Morgan fingerprint(카탈로그와 같은 설정) Tanimoto 유사도로 구조가 다양한
+    num_picks개를 고른다. 같은 SMILES는 한 번만 고려한다.
+    
+    method="maxmin"은 첫 후보에서 시작해 이미 고른 분자와의 최근접 유사도가 가장
+    낮은 후보를 차례로 고른다 (전체 거리 행렬 없이 후보 수에 비례하는 메모리).
+    method="butina"는 similarity_cutoff로 클러스터링한 뒤 큰 클러스터의 중심부터 고른다.
+    
+    Args:
+        request: 후보(또는 생성 요청), num_picks, 방법, similarity_cutoff
+    
+    Returns:
+        고른 순서대로의 분자 (pick, index, nearest_similarity 또는 cluster/cluster_size 및 후보 컬럼)
+    """
+    if (request.candidates is None) == (request.generation is None):
+        raise HTTPException(status_code=400, detail="candidates와 generation 중 하나만 지정해야 합니다")
+
+    seed = None
+    generation, candidates = request.generation, request.candidates
+    options = (request.num_picks, request.method, request.similarity_cutoff)
+    if generation is not None:
+        _disease_rows(generation.target_disease)
+        constraints = _validated_constraints(generation.constraints)
+        seed = seeding.resolve_seed(generation.seed)
+        job = (_diverse_generated, generation.target_disease, generation.num_molecules, constraints, seed, *options)
+    else:
+        with timed_stage("parse"):
+            try:
+                batch = molecule_batch.MoleculeBatch.from_columns(candidates.smiles, candidates.name)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        job = (_diversity_stage, batch, *options)
+
+    with timed_stage("diversity"):
+        result = await _run_diversity(*job)
+
+    with timed_stage("serialization"):
+        return FastJSONResponse({"status": "success", **result, "seed": seed})
+
+
 @router.get("/search")
 async def search_molecules(
-    disease: str,
-    skip: int = 0,
-    limit: int = 10,
+    disease: Optional[str] = None,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=10, ge=1, le=1000),
+    cursor: Optional[int] = Query(default=None, ge=0, description="이전 페이지의 next_cursor"),
+    molecular_weight_min: Optional[float] = None,
+    molecular_weight_max: Optional[float] = None,
+    logp_min: Optional[float] = None,
+    logp_max: Optional[float] = None,
+    tpsa_min: Optional[float] = None,
+    tpsa_max: Optional[float] = None,
+    hbd_min: Optional[float] = None,
+    hbd_max: Optional[float] = None,
+    hba_min: Optional[float] = None,
+    hba_max: Optional[float] = None,
 ):
     """
     분자 검색 엔드포인트
     
+    질환 CSR 인덱스와 기술자별 정렬 인덱스로 후보를 좁힌 뒤 나머지 조건을 검사한다.
+    삭제된(DELETE /index/{id}) 카탈로그 화합물은 결과와 전체 개수에서 빠진다.
+    깊은 페이지는 skip 대신 cursor(keyset)를 사용하면 페이지 깊이와 무관한 비용으로 조회된다.
+    
     Args:
-        disease: 질환 필터
-        skip: 건너뛸 개수
+        disease: 질환 필터 (생략 시 전체 카탈로그)
+        skip: 건너뛸 개수 (cursor 이후 기준)
         limit: 반환할 개수
+        cursor: 이전 응답의 next_cursor (이 레코드 다음부터 반환)
+        *_min / *_max: 기술자 범위 필터 (molecular_weight, logp, tpsa, hbd, hba)
     
     Returns:
-        분자 리스트
+        분자 리스트, 조건을 만족하는 전체 개수, 다음 페이지 cursor
     """
+    catalog = get_catalog()
+    ranges = {
+        "molecular_weight": (molecular_weight_min, molecular_weight_max),
+        "logp": (logp_min, logp_max),
+        "tpsa": (tpsa_min, tpsa_max),
+        "hbd": (hbd_min, hbd_max),
+        "hba": (hba_min, hba_max),
+    }
+    # 다음 페이지 존재 여부 확인을 위해 한 개 더 조회
+    rows, total = catalog.select(
+        disease=disease, ranges=ranges, after=cursor, limit=limit + 1, skip=skip,
+        exclude=live_index.get_indexed_compounds().catalog_tombstones(),
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     return {
         "status": "ok",
-        "molecules": [],
-        "total": 0,
+        "molecules": molecule_batch.MoleculeBatch.from_catalog(catalog, rows).records(
+            molecule_batch.CATALOG_FIELDS, molecule_batch.CATALOG_DECIMALS
+        ),
+        "total": total,
         "disease": disease,
+        "next_cursor": int(rows[-1]) if has_more else None,
     }
 
 
+def _search_similar(query_smiles: str, threshold: float, limit: int, exclude=None):
+    """
+    카탈로그 fingerprint 인덱스 검색 (계산 워커에서 실행)
+
+    Args:
+        exclude: 결과에서 뺄 ID (삭제된 카탈로그 화합물)
+
+    Returns:
+        (id, similarity 컬럼이 추가된 MoleculeBatch, 후보 수, 인덱스 크기)
+    """
+    catalog = get_catalog()
+    query_fp = fingerprint_index.morgan_fingerprints([chem.parse_smiles(query_smiles)], **catalog.fingerprint_params())[0]
+    num_excluded = 0 if exclude is None else len(exclude)
+    result = catalog.fingerprint_index.search(query_fp, threshold=threshold, limit=limit + num_excluded)
+    if num_excluded:
+        result = segmented_index.merge_results([result], limit, exclude)
+    batch = molecule_batch.MoleculeBatch.from_catalog(catalog, result.ids).with_columns(
+        id=result.ids, similarity=result.similarities
+    )
+    return batch, result.num_candidates, result.num_indexed
+
+
+def _search_indexed(query_mol, threshold: float, limit: int):
+    """실행 중 추가된 화합물 검색 (인덱스가 웹 워커 프로세스에 있으므로 스레드에서 실행)"""
+    indexed = live_index.get_indexed_compounds()
+    query_fp = fingerprint_index.morgan_fingerprints([query_mol], **indexed.fingerprint_params)[0]
+    batch, result = indexed.search(query_fp, threshold, limit)
+    return batch, result.num_candidates, result.num_indexed
+
+
+def _screen_substructure(query: str, query_format: str, disease: Optional[str], exclude=None):
+    """
+    pattern fingerprint 상위집합 검사로 후보 행 선별 (계산 워커에서 실행)
+
+    Args:
+        exclude: 후보에서 뺄 행 번호 (삭제된 카탈로그 화합물, 오름차순)
+
+    Returns:
+        (후보 행 번호, 선별 통계 dict)
+    """
+    catalog = get_catalog()
+    index = catalog.substructure_index
+    rows = catalog.rows_for_disease(disease) if disease is not None else None
+    query_fp = index.query_fingerprint(substructure_index.parse_query(query, query_format))
+    result = index.screen(query_fp, rows, exclude)
+    return result.rows, {
+        "num_indexed": result.num_indexed,
+        "num_candidates": len(result.rows),
+        "screen_out_ratio": round(result.screen_out_ratio, 4),
+        "query_bits": result.query_bits,
+        "screen_ms": round(result.seconds * 1000, 3),
+    }
+
+
+def _match_substructure(query: str, query_format: str, rows) -> list:
+    """후보 행의 전체 그래프 매칭 (계산 워커에서 실행)"""
+    smiles = molecule_batch.MoleculeBatch.from_catalog(get_catalog(), rows).smiles_list()
+    return substructure_index.match_rows(substructure_index.parse_query(query, query_format), smiles, rows)
+
+
+@router.post("/search/substructure")
+async def search_substructure(
+    request: SubstructureSearchRequest,
+    format: Literal["ndjson", "sse"] = Query(default="ndjson", description="스트림 형식"),
+):
+    """
+    부분구조 검색 엔드포인트 (스트리밍)
+    
+    1단계(screen): 카탈로그 pattern fingerprint가 query 비트의 상위집합이 아닌
+    분자를 uint64 비트 연산으로 한 번에 제외한다.
+    2단계(match): 남은 후보만 RDKit 그래프 매칭으로 확인하며, 청크마다 찾은
+    분자를 바로 전송한다.
+    
+    Args:
+        request: query (SMILES/SMARTS), 질환 필터, 최대 개수
+        format: "ndjson" 또는 "sse"
+    
+    Returns:
+        NDJSON: 매칭된 분자 한 줄씩 (선별 통계는 X-Screen-* 헤더)
+        SSE: "molecule" 이벤트마다 분자 하나, 마지막에 단계별 시간과
+            screen-out 비율을 담은 "done" 이벤트
+    """
+    with timed_stage("parse"):
+        if substructure_index.parse_query(request.query, request.query_format) is None:
+            raise HTTPException(status_code=400, detail=f"유효하지 않은 query: {request.query}")
+        if request.disease is not None and not get_catalog().has_disease(request.disease):
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 질환: {request.disease}")
+
+    try:
+        with timed_stage("screen"):
+            exclude = live_index.get_indexed_compounds().catalog_tombstones()
+            rows, stats = await compute.run(
+                _screen_substructure, request.query, request.query_format, request.disease, exclude
+            )
+    except ComputeSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"부분구조 검색 오류: {str(e)}")
+
+    catalog = get_catalog()
+    chunk_rows = substructure_index.MATCH_CHUNK_ROWS
+
+    async def chunks():
+        started = time.perf_counter()
+        matched, match_seconds, truncated = 0, 0.0, False
+        for start in range(0, len(rows), chunk_rows):
+            if matched >= request.limit:
+                truncated = True
+                break
+            chunk_started = time.perf_counter()
+            with timed_stage("match"):
+                hits = await compute.run(
+                    _match_substructure, request.query, request.query_format, rows[start:start + chunk_rows]
+                )
+            match_seconds += time.perf_counter() - chunk_started
+            if len(hits) > request.limit - matched:
+                hits, truncated = hits[:request.limit - matched], True
+            matched += len(hits)
+            if not hits:
+                continue
+            molecules = molecule_batch.MoleculeBatch.from_catalog(catalog, hits).iter_records(
+                molecule_batch.CATALOG_FIELDS, molecule_batch.CATALOG_DECIMALS
+            )
+            if format == "sse":
+                lines = [f"event: molecule\ndata: {dumps(molecule).decode('utf-8')}\n\n" for molecule in molecules]
+            else:
+                lines = [dumps(molecule).decode("utf-8") + "\n" for molecule in molecules]
+            yield "".join(lines).encode("utf-8")
+
+        if format == "sse":
+            summary = {
+                "status": "success",
+                "query": request.query,
+                "num_matched": matched,
+                "truncated": truncated,
+                **stats,
+                "match_ms": round(match_seconds * 1000, 3),
+                "stream_ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+            yield f"event: done\ndata: {json.dumps(summary)}\n\n".encode("utf-8")
+
+    return StreamingResponse(
+        chunks(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Screen-Indexed": str(stats["num_indexed"]),
+            "X-Screen-Candidates": str(stats["num_candidates"]),
+            "X-Screen-Out-Ratio": str(stats["screen_out_ratio"]),
+            "X-Screen-Ms": str(stats["screen_ms"]),
+        },
+    )
+
+
+@router.post("/properties/batch")
+async def get_molecule_properties_batch(request: PropertiesBatchRequest):
+    """
+    분자 속성 일괄 계산 엔드포인트 (열 단위 응답)
+    
+    분자별 객체 대신 기술자마다 배열 하나를 담은 열 단위(columnar) 형식으로
+    반환한다. 계산과 직렬화는 모두 계산 워커에서 수행된다.
+    
+    Args:
+        request: SMILES 리스트와 응답 포맷
+    
+    Returns:
+        format="json": {"columns": {열 이름: 값 리스트}, "errors": [...], ...}
+            (유효하지 않은 SMILES 행의 값은 null)
+        format="arrow": Arrow IPC stream (application/vnd.apache.arrow.stream)
+    """
+    if request.format == "arrow" and descriptors.pa is None:
+        raise HTTPException(status_code=400, detail="Arrow 포맷을 사용하려면 서버에 pyarrow가 설치되어 있어야 합니다")
+
+    try:
+        body = await compute.run(descriptors.property_payload, request.smiles, request.format)
+    except ComputeSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"속성 계산 오류: {str(e)}")
+
+    if request.format == "arrow":
+        return Response(content=body, media_type="application/vnd.apache.arrow.stream")
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/{smiles}/properties")
-async def get_molecule_properties(smiles: str):
+async def get_molecule_properties(
+    smiles: str,
+    if_none_match: Optional[str] = Header(default=None, description="이전 응답의 ETag (같으면 304)"),
+    accept_encoding: Optional[str] = Header(default=None),
+):
     """
     분자 속성 계산 엔드포인트 (상세 특성)
     
+    응답은 입력 SMILES, canonical SMILES와 계산 버전으로 정해지므로 strong ETag와
+    Cache-Control (HTTP_CACHE_MAX_AGE)을 붙이고, If-None-Match가 맞으면 계산 없이 304를 반환한다.
+    ETag는 Accept-Encoding으로 정한 압축 표현의 것이다 (200과 304가 같은 ETag).
+    
     Args:
         smiles: SMILES 문자열 (URL 인코딩 필요)
     
     Returns:
-        분자의 상세 특성
+        분자의 상세 특성 (canonical SMILES 기준으로 캐시됨)
     """
+    mol = chem.parse_smiles(smiles)
+    if mol is None:
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 SMILES: {smiles}")
+
+    canonical = chem.canonical_smiles(mol)
+    # 응답에 입력 SMILES가 그대로 들어가므로 ETag에도 포함
+    encoding, etag = http_cache.negotiate_representation(
+        http_cache.strong_etag("properties", PROPERTIES_VERSION, canonical, smiles), accept_encoding
+    )
+    headers = http_cache.cache_headers(etag)
+    if http_cache.etag_matches(if_none_match, etag):
+        return http_cache.not_modified(headers)
+
+    key = make_key("properties", canonical, PROPERTIES_VERSION)
+    cached = prediction_cache.get(key)
+    if cached is not None:
+        return http_cache.encoded_response(dumps({**cached, "smiles": smiles}), "application/json", encoding, headers)
+
     try:
-        # TODO: RDKit로 실제 계산 구현
-        # from rdkit import Chem
-        # from rdkit.Chem import Descriptors, Lipinski
-        
-        # Mock 데이터 반환 (실제로는 RDKit 계산)
-        return {
-            "smiles": smiles,
-            "molecular_weight": round(random.uniform(150, 500), 2),
-            "logp": round(random.uniform(-1, 5), 2),
-            "tpsa": round(random.uniform(20, 140), 2),
-            "hbd": random.randint(0, 5),
-            "hba": random.randint(0, 10),
-            "rotatable_bonds": random.randint(0, 10),
-            "qed": round(random.uniform(0.3, 0.95), 3),
-            "lipinski_violations": random.randint(0, 2),
-            "lipinski_rules": {
-                "mw_under_500": True,
-                "logp_under_5": True,
-                "hbd_under_5": True,
-                "hba_under_10": True,
-            }
-        }
+        with timed_stage("descriptor"):
+            properties = await compute.run(descriptors.property_row, smiles)
+    except ComputeSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"속성 계산 오류: {str(e)}")
 
+    prediction_cache.set(key, properties)
+    return http_cache.encoded_response(dumps(properties), "application/json", encoding, headers)
+
 
 @router.get("/{smiles}/sdf")
-async def get_molecule_3d(smiles: str):
+async def get_molecule_3d(
+    smiles: str,
+    num_conformers: int = Query(default=1, ge=1, le=MAX_CONFORMERS, description="생성할 배좌 수"),
+    method: Literal["etkdgv3", "etkdgv2", "etdg"] = Query(default="etkdgv3", description="임베딩 방법"),
+    seed: int = Query(default=42, ge=0, description="난수 시드"),
+    optimize: bool = Query(default=True, description="MMFF 구조 최적화"),
+    compress: bool = Query(default=False, description="Accept-Encoding과 상관없이 gzip 압축 응답 (Content-Encoding: gzip)"),
+    if_none_match: Optional[str] = Header(default=None, description="이전 응답의 ETag (같으면 304)"),
+    accept_encoding: Optional[str] = Header(default=None),
+):
     """
     SMILES를 3D SDF 포맷으로 변환
     
+    RDKit ETKDG로 3D 좌표를 생성하고 (수소 포함, 선택적 MMFF 최적화),
+    결과를 canonical SMILES + 방법 + 시드 기준 디스크 캐시에 저장한다.
+    num_conformers > 1이면 배좌마다 SDF 레코드 하나씩 반환한다.
+    
+    ETag는 배좌 캐시 키(계산 버전 포함)와 압축 방식(compress 또는 Accept-Encoding)에서
+    만들므로 If-None-Match가 맞으면 배좌를 만들거나 캐시를 읽지 않고 그 표현의 ETag로
+    304를 반환한다. gzip 표현은 캐시에 저장된 gzip 바이트를 그대로 보낸다.
+    
     Args:
         smiles: SMILES 문자열
+        num_conformers: 배좌 수
+        method: 임베딩 방법
+        seed: 난수 시드
+        optimize: MMFF 최적화 여부
+        compress: gzip 압축 여부
     
     Returns:
         SDF 포맷 데이터 (Content-Type: chemical/x-mdl-sdfile)
     """
+    with timed_stage("parse"):
+        mol = chem.parse_smiles(smiles)
+        if mol is None:
+            raise HTTPException(status_code=400, detail=f"유효하지 않은 SMILES: {smiles}")
+        canonical = chem.canonical_smiles(mol)
+
+    key = conformers.conformer_key(canonical, method, seed, num_conformers, optimize)
+    encoding, etag = http_cache.negotiate_representation(
+        http_cache.strong_etag("sdf", key), accept_encoding, "gzip" if compress else None
+    )
+    if http_cache.etag_matches(if_none_match, etag):
+        return http_cache.not_modified(http_cache.cache_headers(etag))
+
     try:
-        # TODO: RDKit로 실제 3D 좌표 생성
-        # from rdkit import Chem
-        # from rdkit.Chem import AllChem
-        # mol = Chem.MolFromSmiles(smiles)
-        # AllChem.EmbedMolecule(mol, AllChem.ETKDG())
-        # sdf = Chem.MolToMolBlock(mol)
-        
-        # Placeholder SDF
-        sdf_data = f"""
-  Molecule from {smiles}
-  3DMol.js    
-
-  6  5  0  0  0  0  0  0  0  0999 V2000
-    0.0000    0.0000    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
-    1.2000    0.0000    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
-    1.8000    1.0392    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
-    1.2000    2.0784    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
-    0.0000    2.0784    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
-   -0.6000    1.0392    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
-  1  2  1  0  0  0  0
-  2  3  2  0  0  0  0
-  3  4  1  0  0  0  0
-  4  5  2  0  0  0  0
-  5  6  1  0  0  0  0
-M  END
-$$$$
-"""
-        return Response(content=sdf_data, media_type="chemical/x-mdl-sdfile")
+        sdf_gz = conformers.conformer_cache.get(key)
+        record_cache_lookup("conformer", sdf_gz is not None)
+        cache_status = "hit"
+        if sdf_gz is None:
+            with timed_stage("conformer"):
+                sdf_gz = await compute.run(conformers.generate_and_cache, canonical, num_conformers, method, seed, optimize)
+            cache_status = "miss"
+    except ComputeSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"3D 변환 오류: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"3D 변환 오류: {str(e)}")
 
+    headers = {"X-Conformer-Cache": cache_status, **http_cache.cache_headers(etag)}
+    if encoding == "gzip":
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=sdf_gz, media_type="chemical/x-mdl-sdfile", headers=headers)
+    with timed_stage("serialization"):
+        sdf = gzip.decompress(sdf_gz)
+        return http_cache.encoded_response(sdf, "chemical/x-mdl-sdfile", encoding, headers)
+
 
 @router.post("/search/similar")
 async def search_similar_molecules(
     query_smiles: str,
-    threshold: float = 0.7,
-    limit: int = 10
+    threshold: float = Query(default=0.7, ge=0.0, le=1.0),
+    limit: int = Query(default=10, ge=1, le=1000),
+    diversity_method: Optional[Literal["maxmin", "butina"]] = Query(
+        default=None, alias="diversity", description="유사 분자 pool에서 구조가 다양한 limit개 선택"
+    ),
+    diversity_cutoff: Optional[float] = Query(
+        default=None, ge=0.0, le=1.0, description="다양성 선택 similarity_cutoff (DiversityOptions와 같음)"
+    ),
+    diversity_pool: Optional[int] = Query(
+        default=None, ge=1, le=MAX_SIMILAR_POOL, description="다양성 선택 전에 찾을 유사 분자 수 (생략 시 limit의 10배)"
+    ),
 ):
     """
     분자 유사성 검색 엔드포인트
@@ -284,50 +839,88 @@ async def search_similar_molecules(
         query_smiles: 검색할 기준 분자의 SMILES
         threshold: Tanimoto 유사도 임계값 (0.0-1.0)
         limit: 반환할 최대 개수
+        diversity: "maxmin" 또는 "butina" - 유사도 상위 diversity_pool개 중 서로 다른
+                   limit개를 골라 유사도 순으로 반환 (거의 같은 이웃이 결과를 채우지 않도록)
     
     Returns:
-        유사한 분자 리스트 (유사도 점수 포함)
+        유사한 분자 리스트 (Morgan fingerprint Tanimoto 유사도 내림차순)
+        카탈로그와 generate(index=true)로 추가된 분자를 함께 검색한다.
     """
+    with timed_stage("parse"):
+        query_mol = chem.parse_smiles(query_smiles)
+    if query_mol is None:
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 SMILES: {query_smiles}")
+
+    fetch = limit
+    if diversity_method is not None:
+        fetch = _diversity_pool_size(limit, diversity_pool, MAX_SIMILAR_POOL)
+
     try:
-        # TODO: RDKit로 실제 fingerprint 계산 및 유사도 검색
-        # from rdkit import Chem
-        # from rdkit.Chem import AllChem, DataStructs
-        # query_mol = Chem.MolFromSmiles(query_smiles)
-        # query_fp = AllChem.GetMorganFingerprintAsBitVect(query_mol, 2, 2048)
-        
-        # Mock 유사 분자 생성
-        similar_molecules = []
-        all_molecules = []
-        
-        # 모든 질환의 분자 수집
-        for disease_mols in MOCK_MOLECULES_BY_DISEASE.values():
-            all_molecules.extend(disease_mols)
-        
-        # 랜덤하게 유사 분자 선택 (실제로는 fingerprint 유사도 계산)
-        import random
-        selected = random.sample(all_molecules, min(limit, len(all_molecules)))
-        
-        for mol in selected:
-            similarity = random.uniform(threshold, 1.0)  # Mock similarity
-            similar_molecules.append({
-                "smiles": mol["smiles"],
-                "name": mol["name"],
-                "similarity": round(similarity, 3),
-                "molecular_weight": mol["molecular_weight"],
-                "logp": mol["logp"],
-                "tpsa": mol["tpsa"],
-            })
-        
-        # 유사도 순으로 정렬
-        similar_molecules.sort(key=lambda x: x["similarity"], reverse=True)
+        with timed_stage("search"):
+            # 카탈로그(계산 워커)와 실행 중 추가된 세그먼트 인덱스(스레드)를 동시에 검색 후 병합
+            exclude = live_index.get_indexed_compounds().catalog_tombstones()
+            results = await asyncio.gather(
+                compute.run(_search_similar, query_smiles, threshold, fetch, exclude),
+                asyncio.to_thread(_search_indexed, query_mol, threshold, fetch),
+            )
+            batch = segmented_index.merge_batches([batch for batch, _, _ in results], fetch)
+            num_candidates = sum(candidates for _, candidates, _ in results)
+            num_indexed = sum(indexed for _, _, indexed in results)
+
+        diversity_stats = None
+        if diversity_method is not None:
+            with timed_stage("diversity"):
+                # 첫 선택은 가장 유사한 분자, 결과는 유사도 순서 유지
+                rows, diversity_stats = await _run_diversity(
+                    _diverse_rows, batch, limit, diversity_method, diversity_cutoff
+                )
+                batch = batch.take(rows)
+
+        with timed_stage("serialization"):
+            similar_molecules = batch.records(SIMILAR_FIELDS, {**molecule_batch.CATALOG_DECIMALS, "similarity": 3})
         
-        return {
+        response = {
             "status": "success",
             "query_smiles": query_smiles,
             "threshold": threshold,
             "num_found": len(similar_molecules),
+            "num_candidates": num_candidates,
+            "num_indexed": num_indexed,
             "molecules": similar_molecules,
         }
+        if diversity_stats is not None:
+            response["diversity"] = diversity_stats
+        return response
+    except (ComputeSaturatedError, HTTPException):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"유사성 검색 오류: {str(e)}")
 
+
+@router.delete("/index/{compound_id}")
+async def delete_indexed_compound(compound_id: int):
+    """
+    화합물을 유사성 검색에서 제외 (tombstone)
+
+    공유 변경 로그에 기록되므로 모든 웹 워커의 유사성 검색, /search, 부분구조 검색에서 바로 빠지고,
+    추가된 화합물은 다음 세그먼트 병합 때 실제로 제거된다.
+
+    Args:
+        compound_id: 카탈로그 행 번호 또는 generate(index=true)가 반환한 ID
+    """
+    if not live_index.delete(compound_id):
+        raise HTTPException(status_code=404, detail=f"화합물을 찾을 수 없습니다: {compound_id}")
+    return {"status": "deleted", "id": compound_id}
+
+
+@router.get("/index/stats")
+async def indexed_compound_stats():
+    """실행 중 추가된 화합물 인덱스 상태 (세그먼트 수/크기, tombstone, 병합 횟수)"""
+    indexed = live_index.get_indexed_compounds()
+    return {
+        "status": "ok",
+        "first_id": indexed.first_id,
+        "num_added": len(indexed),
+        "catalog_tombstones": len(indexed.catalog_tombstones()),
+        **indexed.index.stats(),
+    }
@@ -2,8 +2,34 @@
 분자 생성 요청/응답 스키마
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, conint
+from typing import Dict, Literal, Optional, List, Union
+
+
+class DiversityOptions(BaseModel):
+    """다양성 선택 옵션 (후보 pool을 넉넉히 만든 뒤 구조가 다양한 부분집합 선택)"""
+    method: Literal["maxmin", "butina"] = Field(
+        default="maxmin", description="maxmin: 최근접 유사도가 가장 낮은 후보부터, butina: 큰 클러스터 중심부터"
+    )
+    similarity_cutoff: Optional[float] = Field(
+        default=None, ge=0.0, le=1.0,
+        description="maxmin: 이미 고른 분자와 이보다 더 유사한 후보는 고르지 않음 (생략 시 제한 없음), "
+                    "butina: 같은 클러스터로 묶는 최소 유사도 (생략 시 0.6)",
+    )
+    pool_size: Optional[int] = Field(
+        default=None, ge=1, le=100_000, description="선택 전에 만들 후보 수 (생략 시 요청 개수의 10배)"
+    )
+
+
+class DiversityStats(BaseModel):
+    """다양성 선택 통계"""
+    method: str
+    num_candidates: int = Field(..., description="선택 대상 후보 수")
+    num_unique: int = Field(..., description="서로 다른 SMILES 수")
+    num_picked: int
+    num_clusters: Optional[int] = Field(default=None, description="Butina 클러스터 수 (butina)")
+    similarity_cutoff: Optional[float] = Field(default=None, description="사용한 클러스터 유사도 기준 (butina)")
+    num_evaluations: Optional[int] = Field(default=None, description="계산한 후보 × 선택 분자 유사도 수 (maxmin)")
 
 
 class MoleculeGenerationRequest(BaseModel):
@@ -11,6 +37,16 @@ class MoleculeGenerationRequest(BaseModel):
     target_disease: str = Field(..., description="타겟 질환")
     num_molecules: int = Field(default=20, ge=1, le=100, description="생성할 분자 개수")
     constraints: Optional[dict] = Field(default=None, description="분자 특성 제약조건")
+    seed: Optional[Union[conint(ge=0), Literal["random"]]] = Field(
+        default=None,
+        description='재현용 시드 (같은 요청 + 같은 시드 → 같은 결과, 생략 시 고정 기본값, "random"이면 서버가 무작위로 생성)',
+    )
+    index: bool = Field(
+        default=False, description="생성된 분자를 유사성 검색 인덱스에 추가 (응답의 indexed_ids로 ID 반환)"
+    )
+    diversity: Optional[DiversityOptions] = Field(
+        default=None, description="후보 pool을 생성한 뒤 구조가 다양한 num_molecules개만 반환"
+    )
 
     class Config:
         json_schema_extra = {
@@ -27,6 +63,34 @@ class MoleculeGenerationRequest(BaseModel):
         }
 
 
+class MoleculeStreamRequest(MoleculeGenerationRequest):
+    """스트리밍 분자 생성 요청 (대량 생성용)"""
+    num_molecules: int = Field(default=1000, ge=1, le=100_000, description="생성할 분자 개수")
+    index: Literal[False] = Field(default=False, description="대량 생성 결과는 인덱스에 추가하지 않음")
+    diversity: None = Field(default=None, description="스트리밍 생성에는 다양성 선택을 쓰지 않음")
+
+
+class PropertiesBatchRequest(BaseModel):
+    """분자 속성 일괄 계산 요청"""
+    smiles: List[str] = Field(..., min_length=1, max_length=100_000, description="SMILES 리스트")
+    format: Literal["json", "arrow"] = Field(
+        default="json", description="응답 포맷 (열 단위 JSON 또는 Arrow IPC stream)"
+    )
+
+
+class SubstructureSearchRequest(BaseModel):
+    """부분구조 검색 요청"""
+    query: str = Field(..., description="찾을 부분구조 (SMILES 또는 SMARTS)")
+    query_format: Literal["smiles", "smarts"] = Field(default="smiles", description="query 형식")
+    disease: Optional[str] = Field(default=None, description="질환 필터 (생략 시 전체 카탈로그)")
+    limit: int = Field(default=1000, ge=1, le=100_000, description="반환할 최대 분자 수")
+
+    class Config:
+        json_schema_extra = {
+            "example": {"query": "c1ccccc1C(=O)O", "query_format": "smiles", "limit": 1000}
+        }
+
+
 class MoleculeProperty(BaseModel):
     """분자 특성"""
     name: str
@@ -40,12 +104,31 @@ class MoleculeProperty(BaseModel):
     synthesis_score: Optional[float] = Field(default=None, description="합성 점수 (0-1)")
 
 
+class GenerationStats(BaseModel):
+    """제약조건 기반 생성 통계"""
+    num_requested: int
+    num_sampled: int = Field(..., description="뽑은 후보 수")
+    num_accepted: int = Field(..., description="제약조건을 만족한 후보 수")
+    acceptance_rate: Optional[float] = Field(default=None, description="수락률 (0-1)")
+    rounds: int = Field(..., description="샘플링 라운드 수")
+    sample_budget: int = Field(..., description="최대 후보 수")
+    budget_exhausted: bool = Field(..., description="예산 소진으로 목표 개수 미달 여부")
+
+
 class MoleculeGenerationResponse(BaseModel):
     """분자 생성 응답"""
-    status: str
+    status: str = Field(..., description='"success" 또는 목표 개수 미달 시 "partial"')
     target_disease: str
     num_generated: int
     molecules: List[MoleculeProperty]
+    generation_stats: Optional[GenerationStats] = None
+    seed: Optional[int] = Field(default=None, description="이 결과를 재현하는 시드")
+    indexed_ids: Optional[List[int]] = Field(
+        default=None, description="index=true일 때 molecules 순서대로 부여된 화합물 ID"
+    )
+    diversity: Optional[DiversityStats] = Field(
+        default=None, description="diversity 사용 시 선택 통계 (generation_stats는 후보 pool 기준)"
+    )
 
     class Config:
         json_schema_extra = {
@@ -63,6 +146,125 @@ class MoleculeGenerationResponse(BaseModel):
                         "binding_affinity": 0.45,
                         "synthesis_score": 0.78,
                     }
-                ]
+                ],
+                "seed": 1234,
+            }
+        }
+
+
+class RankCandidates(BaseModel):
+    """순위를 매길 후보 (열 단위: 필드마다 smiles와 같은 길이의 리스트)"""
+    smiles: List[str] = Field(..., min_length=1, max_length=500_000, description="SMILES 리스트")
+    name: Optional[List[str]] = Field(default=None, description="후보 이름")
+    binding_affinity: Optional[List[float]] = Field(default=None, description="결합친화도")
+    synthesis_score: Optional[List[float]] = Field(default=None, description="합성 점수")
+    overall_score: Optional[List[float]] = Field(
+        default=None, description="ADMET 종합 점수 (생략 시 서버에서 예측)"
+    )
+
+
+class MoleculeRankRequest(BaseModel):
+    """다목적 순위 요청 (candidates 또는 generation 중 하나)"""
+    candidates: Optional[RankCandidates] = Field(default=None, description="직접 전달하는 후보")
+    generation: Optional[MoleculeStreamRequest] = Field(default=None, description="서버에서 생성할 후보")
+    objectives: Dict[str, float] = Field(
+        default_factory=lambda: {"binding_affinity": 1.0, "synthesis_score": 1.0, "overall_score": 1.0},
+        description="목표별 가중치 (모두 클수록 좋음, 0이면 제외)",
+    )
+    method: Literal["pareto", "weighted"] = Field(
+        default="pareto", description="pareto: 비지배 front 순, weighted: 정규화 가중합 순"
+    )
+    top_k: int = Field(default=100, ge=1, le=10_000, description="반환할 상위 후보 수")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "generation": {"target_disease": "hepatitis_b", "num_molecules": 100000, "seed": 1234},
+                "objectives": {"binding_affinity": 2.0, "synthesis_score": 1.0, "overall_score": 1.0},
+                "method": "pareto",
+                "top_k": 100,
             }
         }
+
+
+class RankedMolecule(BaseModel):
+    """순위가 매겨진 후보 (후보의 기술자/목표 컬럼이 함께 포함됨)"""
+    rank: int = Field(..., description="순위 (1부터)")
+    score: float = Field(..., description="정규화 가중 점수 (0-1)")
+    pareto_front: Optional[int] = Field(default=None, description="비지배 front 번호 (0 = Pareto 최적)")
+    name: str
+    smiles: str
+    binding_affinity: Optional[float] = None
+    synthesis_score: Optional[float] = None
+    overall_score: Optional[float] = None
+
+    class Config:
+        extra = "allow"
+
+
+class MoleculeRankResponse(BaseModel):
+    """다목적 순위 응답"""
+    status: str
+    method: str
+    objectives: Dict[str, float] = Field(..., description="사용한 목표 가중치")
+    num_candidates: int = Field(..., description="순위를 매긴 후보 수")
+    num_returned: int
+    num_fronts_computed: Optional[int] = Field(
+        default=None, description="top_k를 채우기 위해 계산한 front 수 (pareto)"
+    )
+    pareto_front_size: Optional[int] = Field(default=None, description="Pareto 최적 후보 수 (pareto)")
+    molecules: List[RankedMolecule]
+    seed: Optional[int] = Field(default=None, description="generation 사용 시 재현용 시드")
+
+
+class DiversityCandidates(BaseModel):
+    """다양성 선택 후보 (열 단위)"""
+    smiles: List[str] = Field(..., min_length=1, max_length=1_000_000, description="SMILES 리스트")
+    name: Optional[List[str]] = Field(default=None, description="후보 이름")
+
+
+class DiversityRequest(BaseModel):
+    """다양성 선택 요청 (candidates 또는 generation 중 하나)"""
+    candidates: Optional[DiversityCandidates] = Field(default=None, description="직접 전달하는 후보")
+    generation: Optional[MoleculeStreamRequest] = Field(default=None, description="서버에서 생성할 후보")
+    num_picks: int = Field(default=100, ge=1, le=10_000, description="고를 최대 분자 수")
+    method: Literal["maxmin", "butina"] = Field(
+        default="maxmin", description="maxmin: 최근접 유사도가 가장 낮은 후보부터, butina: 큰 클러스터 중심부터"
+    )
+    similarity_cutoff: Optional[float] = Field(
+        default=None, ge=0.0, le=1.0,
+        description="maxmin: 이미 고른 분자와 이보다 더 유사한 후보만 남으면 중단 (생략 시 num_picks개까지), "
+                    "butina: 같은 클러스터로 묶는 최소 유사도 (생략 시 0.6, 최대 100,000 후보)",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "candidates": {"smiles": ["CC(=O)Nc1ccc(O)cc1", "CC(=O)Oc1ccccc1C(=O)O", "Cn1cnc2c1c(=O)n(C)c(=O)n2C"]},
+                "num_picks": 2,
+                "method": "maxmin",
+            }
+        }
+
+
+class DiverseMolecule(BaseModel):
+    """선택된 분자 (후보의 기술자 컬럼이 함께 포함됨)"""
+    pick: int = Field(..., description="고른 순서 (1부터)")
+    index: int = Field(..., description="후보(candidates 또는 생성된 후보)에서의 위치 (0부터)")
+    name: str
+    smiles: str
+    nearest_similarity: Optional[float] = Field(
+        default=None, description="고를 당시 먼저 고른 분자와의 최대 유사도 (maxmin, 첫 분자는 0)"
+    )
+    cluster: Optional[int] = Field(default=None, description="클러스터 번호 (butina, 큰 클러스터부터 0)")
+    cluster_size: Optional[int] = Field(default=None, description="클러스터 크기 (butina, 중복 SMILES 포함)")
+
+    class Config:
+        extra = "allow"
+
+
+class DiversityResponse(DiversityStats):
+    """다양성 선택 응답 (molecules는 고른 순서 - 앞쪽 k개는 그 자체로 k개 선택 결과)"""
+    status: str
+    molecules: List[DiverseMolecule]
+    seed: Optional[int] = Field(default=None, description="generation 사용 시 재현용 시드")
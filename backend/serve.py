@@ -0,0 +1,246 @@
+"""
+프로덕션 실행 엔트리포인트 (pre-fork 멀티 워커)
+
+부모 프로세스가 앱, 무거운 모듈(RDKit/numpy), ADMET 모델, 카탈로그를 한 번
+로드한 뒤 리스닝 소켓을 열고 워커를 fork한다. 워커는 로드된 메모리를
+copy-on-write로 공유하므로 워커마다 import/모델 로딩 비용을 내지 않는다.
+부모는 요청을 처리하지 않고 워커를 감시하다가 비정상 종료된 워커를 다시 띄운다.
+
+각 워커는 자기 /metrics, /ready를 가진다 (워커별 값).
+
+웹 워커마다 계산 프로세스 풀(COMPUTE_WORKERS)과 작업 프로세스 풀(JOB_WORKERS)을
+따로 띄우고, 이 풀은 spawn이라 copy-on-write 이점 없이 RDKit/모델을 다시 로드한다.
+그래서 따로 지정하지 않으면 두 풀 크기를 CPU 수를 웹 워커 수로 나눈 값(최소 1)으로
+정해 전체 프로세스 수가 CPU 수에 비례하도록 한다.
+
+워커가 둘 이상이면 비동기 작업 저장소는 모든 워커가 공유하는 SQLite 파일이어야
+한다 (JOB_DB_PATH, 미설정 시 임시 디렉토리의 jobs-<port>.sqlite3). 부모가 시작 시
+이전 실행의 미완료 작업을 실패 처리하고, 각 워커는 슬롯 번호(JOB_WORKER_ID)를
+owner로 써서 재시작된 워커는 같은 슬롯의 이전 워커가 남긴 작업만 정리한다.
+
+generate(index=true)로 추가한 화합물과 DELETE /index/{id} 삭제 표시도 워커가
+공유하는 SQLite 변경 로그에 기록하고 워커마다 재생한다 (INDEX_DB_PATH, 미설정 시
+임시 디렉토리의 index-<port>.sqlite3). 부모가 시작 시 이전 실행 기록을 비운다.
+
+사용법 (backend 디렉토리에서):
+    python serve.py --workers 4 --port 8000
+
+환경변수:
+    WEB_CONCURRENCY: 기본 워커 수 (기본: CPU 수)
+    COMPUTE_WORKERS / JOB_WORKERS: 웹 워커당 풀 크기 (기본: CPU 수 / 워커 수, 작업 풀은 CPU 수 - 1 기준)
+    JOB_DB_PATH: 공유 작업 저장소 SQLite 파일 (워커가 둘 이상이면 메모리 DB 불가)
+    INDEX_DB_PATH: 실행 중 추가/삭제 화합물 공유 변경 로그 SQLite 파일 (워커가 둘 이상이면 메모리 DB 불가)
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+from dotenv import load_dotenv
+
+logger = logging.getLogger("serve")
+
+# 워커가 이 시간 안에 죽으면 재시작 전에 대기 (크래시 루프 방지)
+RESTART_BACKOFF_SECONDS = 1.0
+
+
+def preload_app():
+    """앱과 무거운 모듈/모델/카탈로그를 부모 프로세스에서 로드"""
+    from core.lazy import preload
+    from main import app
+    from ml.model_registry import registry
+    from services.catalog import get_catalog
+
+    preload()
+    registry.warmup()
+    get_catalog()
+    return app
+
+
+def size_worker_pools(args) -> None:
+    """웹 워커당 계산/작업 프로세스 풀 크기를 CPU 수 / 워커 수로 설정 (환경변수로 지정하지 않은 경우)"""
+    cpus = os.cpu_count() or 1
+    defaults = {
+        "COMPUTE_WORKERS": max(1, cpus // args.workers),
+        "JOB_WORKERS": max(1, (cpus - 1) // args.workers),
+    }
+    for name, value in defaults.items():
+        if not os.getenv(name):
+            os.environ[name] = str(value)
+    logger.info(
+        "per-worker pools: compute=%s jobs=%s (cpus=%d, web workers=%d)",
+        os.environ["COMPUTE_WORKERS"], os.environ["JOB_WORKERS"], cpus, args.workers,
+    )
+
+
+def shared_db_path(env_name: str, filename: str, args) -> Optional[str]:
+    """
+    워커가 공유하는 SQLite 파일 경로 (워커가 둘 이상이면 파일 DB 강제, 미설정 시 임시 디렉토리)
+
+    Returns:
+        파일 경로 (메모리 DB이면 None)
+    """
+    path = os.getenv(env_name)
+    if path == ":memory:" and args.workers > 1:
+        sys.exit(f"워커가 둘 이상이면 {env_name}는 공유 파일이어야 합니다 (:memory: 불가)")
+    if not path and args.workers > 1:
+        directory = Path(tempfile.gettempdir()) / "ai-drug-discovery"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = str(directory / filename)
+        os.environ[env_name] = path
+    if not path or path == ":memory:":
+        return None
+    return path
+
+
+def prepare_job_store(args) -> None:
+    """
+    작업 저장소 준비: 워커가 둘 이상이면 공유 파일 DB를 강제하고, 이전 실행의 미완료 작업 정리
+
+    부모에서 연 연결은 fork 전에 닫는다 (SQLite 연결은 프로세스 사이에 공유할 수 없음).
+    """
+    from core.jobs import JobStore
+
+    path = shared_db_path("JOB_DB_PATH", f"jobs-{args.port}.sqlite3", args)
+    if path is None:
+        return
+    store = JobStore(path, recover=False)
+    failed = store.fail_unfinished()
+    store.close()
+    logger.info("job store %s (%d unfinished jobs from the previous run marked failed)", path, failed)
+
+
+def prepare_index_log(args) -> None:
+    """
+    실행 중 추가 화합물 변경 로그 준비: 워커가 둘 이상이면 공유 파일 DB를 강제하고, 이전 실행 기록 삭제
+
+    추가된 화합물과 삭제 표시는 실행 중 상태이므로 재시작하면 비운다.
+    """
+    from database.index_log import IndexLog
+    from services.catalog import get_catalog
+
+    path = shared_db_path("INDEX_DB_PATH", f"index-{args.port}.sqlite3", args)
+    if path is None:
+        return
+    log = IndexLog(path, len(get_catalog()))
+    log.clear()
+    log.close()
+    logger.info("live index log %s (cleared)", path)
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, args) -> None:
+    """fork된 자식에서 uvicorn 서버 실행 (SIGTERM/SIGINT는 uvicorn이 처리)"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(
+        app,
+        log_level=args.log_level,
+        access_log=args.access_log,
+        timeout_keep_alive=args.keep_alive,
+        proxy_headers=True,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(app, sock: socket.socket, args, slot: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            # 작업 owner = 슬롯 번호 (재시작된 워커가 같은 슬롯의 남은 작업을 정리)
+            os.environ["JOB_WORKER_ID"] = str(slot)
+            run_worker(app, sock, args)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Drug Discovery API 프로덕션 서버 (pre-fork)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--keep-alive", type=int, default=5, help="keep-alive 타임아웃 (초)")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--access-log", action="store_true")
+    parser.add_argument("--no-preload", action="store_true", help="부모에서 모듈/모델을 미리 로드하지 않음")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py는 fork를 지원하는 OS에서만 동작합니다 (개발 환경은 python main.py)")
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s [serve] %(message)s")
+    load_dotenv()
+
+    size_worker_pools(args)
+    prepare_job_store(args)
+
+    start = time.perf_counter()
+    if args.no_preload:
+        from main import app
+    else:
+        app = preload_app()
+    prepare_index_log(args)
+    # 부모가 만든 객체를 GC 대상에서 빼서 워커에서 GC가 페이지를 건드리지 않게 함 (copy-on-write 유지)
+    gc.collect()
+    gc.freeze()
+    logger.info("preload %.2fs (preload=%s)", time.perf_counter() - start, not args.no_preload)
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    workers = {spawn_worker(app, sock, args, slot): (slot, time.monotonic()) for slot in range(args.workers)}
+    logger.info("listening on %s:%d with %d workers %s", args.host, args.port, args.workers, sorted(workers))
+
+    stopping = False
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        worker = workers.pop(pid, None)
+        if worker is None or stopping:
+            continue
+        slot, started = worker
+        logger.warning("worker %d (slot %d) exited (status %d), restarting", pid, slot, status)
+        if time.monotonic() - started < RESTART_BACKOFF_SECONDS:
+            time.sleep(RESTART_BACKOFF_SECONDS)
+        workers[spawn_worker(app, sock, args, slot)] = (slot, time.monotonic())
+
+    sock.close()
+    logger.info("stopped")
+
+
+if __name__ == "__main__":
+    main()
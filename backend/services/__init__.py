@@ -0,0 +1,3 @@
+"""
+도메인 서비스 모듈 (라우터와 작업 워커가 함께 쓰는 공개 API)
+"""
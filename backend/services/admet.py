@@ -0,0 +1,100 @@
+"""
+ADMET prediction service shared by the API routes and the job workers
+
+Builds prediction dicts in the ADMETPredictionResponse shape and reads/writes
+them through the process-wide prediction cache.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from core.cache import make_key, prediction_cache
+from core.lazy import lazy_module
+
+admet_predictor = lazy_module("ml.admet_predictor")
+chem = lazy_module("ml.chem")
+model_registry = lazy_module("ml.model_registry")
+
+
+def build_prediction(result: "admet_predictor.ADMETBatchResult", row: int, smiles: str, timestamp: str) -> dict:
+    """
+    Materialize one row of a batch result in the ADMETPredictionResponse shape.
+
+    Built as a plain dict rather than a validated model: every value comes
+    from the server's own models, so re-validating it per molecule only adds
+    CPU time. The response_model on each route still documents the shape.
+    """
+    details = result.details
+    return {
+        "smiles": smiles,
+        **{name: float(result.scores[name][row]) for name in model_registry.ADMET_ENDPOINTS},
+        "overall_score": float(result.overall[row]),
+        "details": {
+            "caco2_permeability": float(details["caco2_permeability"][row]),
+            "bioavailability": float(details["bioavailability"][row]),
+            "bbb_penetration": float(details["bbb_penetration"][row]),
+            "pgp_substrate": bool(details["pgp_substrate"][row]),
+            "cyp_inhibition": result.cyp_inhibition(row),
+            "half_life": float(details["half_life"][row]),
+            "clearance": float(details["clearance"][row]),
+            "ld50": float(details["ld50"][row]),
+            "herg_inhibition": bool(details["herg_inhibition"][row]),
+            "hepatotoxicity": bool(details["hepatotoxicity"][row]),
+            "skin_sensitization": bool(details["skin_sensitization"][row]),
+        },
+        "timestamp": timestamp,
+    }
+
+
+def cache_entry(prediction: dict) -> dict:
+    """Cached form of a prediction (the SMILES spelling is per request)."""
+    return {name: value for name, value in prediction.items() if name != "smiles"}
+
+
+def cache_key(canonical: str) -> str:
+    """Prediction cache key: canonical SMILES plus the registry's model versions."""
+    return make_key("admet", canonical, model_registry.registry.version_tag())
+
+
+def lookup_many(smiles_list: List[str], canonical: List[Optional[str]], errors: List[Optional[str]]):
+    """Serve cached predictions for canonicalized SMILES; returns (items, misses)."""
+    items = [
+        {"index": i, "smiles": smiles, "prediction": None, "error": errors[i]}
+        for i, smiles in enumerate(smiles_list)
+    ]
+
+    misses = []
+    for i, canonical_i in enumerate(canonical):
+        if canonical_i is None:
+            continue
+        key = cache_key(canonical_i)
+        cached = prediction_cache.get(key)
+        if cached is not None:
+            items[i]["prediction"] = {"smiles": smiles_list[i], **cached}
+        else:
+            misses.append((i, key))
+    return items, misses
+
+
+def finish_many(items: List[dict], misses, result: Optional["admet_predictor.ADMETBatchResult"]) -> dict:
+    """Fill in freshly scored cache misses, store them, and build the batch response dict."""
+    timestamp = datetime.utcnow().isoformat()
+    for row, (i, key) in enumerate(misses):
+        items[i]["prediction"] = build_prediction(result, row, items[i]["smiles"], timestamp)
+        prediction_cache.set(key, cache_entry(items[i]["prediction"]))
+
+    num_failed = sum(item["error"] is not None for item in items)
+    return {
+        "num_requested": len(items),
+        "num_succeeded": len(items) - num_failed,
+        "num_failed": num_failed,
+        "results": items,
+        "timestamp": timestamp,
+    }
+
+
+def predict_many(smiles_list: List[str]) -> dict:
+    """Score a list of SMILES in the current process (used inside worker processes)."""
+    items, misses = lookup_many(smiles_list, *chem.canonicalize_batch(smiles_list))
+    result = admet_predictor.score_smiles([smiles_list[i] for i, _ in misses]) if misses else None
+    return finish_many(items, misses, result)
@@ -0,0 +1,151 @@
+"""
+화합물 카탈로그 (API 프로세스와 계산/작업 워커가 함께 사용)
+"""
+
+import os
+from typing import Optional
+
+from core.lazy import lazy_module
+
+compound_store = lazy_module("database.compound_store")
+
+# Mock 시드 분자 데이터 (COMPOUND_STORE_PATH 미설정 시 화합물 저장소로 변환되어 사용)
+MOCK_MOLECULES_BY_DISEASE = {
+    "hepatitis_b": [
+        {
+            "name": "HBV-Lead-01",
+            "smiles": "CC(=O)Nc1ccc(O)cc1",
+            "molecular_weight": 151.16,
+            "logp": 1.19,
+            "tpsa": 49.33,
+            "hbd": 2,
+            "hba": 2,
+        },
+        {
+            "name": "HBV-Lead-02",
+            "smiles": "Cc1ccc(cc1)C(=O)O",
+            "molecular_weight": 136.15,
+            "logp": 1.96,
+            "tpsa": 37.30,
+            "hbd": 1,
+            "hba": 2,
+        },
+    ],
+    "glp1": [
+        {
+            "name": "GLP1-Lead-01",
+            "smiles": "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
+            "molecular_weight": 206.28,
+            "logp": 3.97,
+            "tpsa": 37.30,
+            "hbd": 1,
+            "hba": 2,
+        },
+        {
+            "name": "GLP1-Lead-02",
+            "smiles": "COc1ccc2nc(sc2c1)S(=O)(=O)N",
+            "molecular_weight": 214.27,
+            "logp": 1.98,
+            "tpsa": 90.13,
+            "hbd": 2,
+            "hba": 3,
+        },
+    ],
+    "alzheimers": [
+        {
+            "name": "AD-Lead-01",
+            "smiles": "CC(C)(C)c1ccc(O)c(CC(=O)O)c1",
+            "molecular_weight": 224.26,
+            "logp": 2.75,
+            "tpsa": 63.60,
+            "hbd": 2,
+            "hba": 3,
+        },
+        {
+            "name": "AD-Lead-02",
+            "smiles": "Cc1cc(C)cc(C)c1",
+            "molecular_weight": 120.19,
+            "logp": 3.97,
+            "tpsa": 0.00,
+            "hbd": 0,
+            "hba": 0,
+        },
+    ],
+    "hair_loss": [
+        {
+            "name": "Hair-Loss-01",
+            "smiles": "CC(C)Cc1ccc(cc1)C(C)C(=O)O",
+            "molecular_weight": 206.28,
+            "logp": 3.97,
+            "tpsa": 37.30,
+            "hbd": 1,
+            "hba": 2,
+        },
+        {
+            "name": "Hair-Loss-02",
+            "smiles": "CC(C)c1ccc(cc1)C(=O)N",
+            "molecular_weight": 163.22,
+            "logp": 2.18,
+            "tpsa": 26.02,
+            "hbd": 1,
+            "hba": 1,
+        },
+    ],
+    "longevity": [
+        {
+            "name": "Longevity-01",
+            "smiles": "CC(C)(C)c1ccc(O)c(CC(=O)O)c1",
+            "molecular_weight": 224.26,
+            "logp": 2.75,
+            "tpsa": 63.60,
+            "hbd": 2,
+            "hba": 3,
+        },
+        {
+            "name": "Longevity-02",
+            "smiles": "O=C(O)c1ccccc1",
+            "molecular_weight": 122.12,
+            "logp": 1.19,
+            "tpsa": 37.30,
+            "hbd": 1,
+            "hba": 2,
+        },
+    ],
+}
+
+
+# 화합물 카탈로그 (첫 사용 시 memmap으로 열림)
+_catalog: Optional["compound_store.CompoundStore"] = None
+
+
+def get_catalog() -> "compound_store.CompoundStore":
+    """
+    화합물 카탈로그 저장소 반환
+
+    COMPOUND_STORE_PATH가 설정되어 있으면 해당 파일을, 아니면 시드 데이터로
+    만든 저장소를 연다.
+    """
+    global _catalog
+    if _catalog is None:
+        path = os.getenv("COMPOUND_STORE_PATH")
+        if not path:
+            path = compound_store.seed_store_path([
+                {**mol, "disease": disease}
+                for disease, mols in MOCK_MOLECULES_BY_DISEASE.items()
+                for mol in mols
+            ])
+        _catalog = compound_store.CompoundStore(path)
+    return _catalog
+
+
+def disease_rows(target_disease: str):
+    """
+    질환 검증 후 카탈로그 행 번호 반환
+
+    Raises:
+        ValueError: 카탈로그에 없는 질환
+    """
+    catalog = get_catalog()
+    if not catalog.has_disease(target_disease):
+        raise ValueError(f"지원하지 않는 질환: {target_disease}")
+    return catalog.rows_for_disease(target_disease)
@@ -0,0 +1,97 @@
+"""
+카탈로그 기반 분자 생성 (라우터와 작업 워커 공용)
+
+제약조건/질환 오류는 ValueError로 알리고, HTTP 상태 코드 변환은 호출하는 쪽이 맡는다.
+"""
+
+from typing import Iterator, Optional, Tuple
+
+from core.lazy import lazy_module
+from services.catalog import disease_rows, get_catalog
+
+generator = lazy_module("ml.generator")
+molecule_batch = lazy_module("ml.molecule_batch")
+seeding = lazy_module("ml.seeding")
+
+
+def validate_constraints(constraints: Optional[dict]) -> Optional[dict]:
+    """
+    제약조건 형식 검증
+
+    Raises:
+        ValueError: 알 수 없는 키 또는 잘못된 범위
+    """
+    generator.parse_constraints(constraints)
+    return constraints
+
+
+def generation_rng(target_disease: str, constraints: Optional[dict], seed: int, start_index: int = 0):
+    """
+    생성 요청 단위 난수 생성기 (질환 + 제약조건 + 시드 해시)
+
+    Args:
+        target_disease: 타겟 질환
+        constraints: 요청 constraints
+        seed: 요청 시드
+        start_index: 작업을 나눠 생성할 때 청크 시작 위치 (청크마다 다른 난수열)
+    """
+    return seeding.request_rng("generation", target_disease, constraints, seed, start_index)
+
+
+def iter_generated_batches(
+    available_rows,
+    num_molecules: int,
+    constraints: Optional[dict],
+    stats: "generator.GenerationStats",
+    start_index: int = 0,
+    rng=None,
+) -> Iterator["molecule_batch.MoleculeBatch"]:
+    """
+    제약조건을 만족하는 분자를 MoleculeBatch 단위로 생성하는 제너레이터
+
+    분자별 dict는 만들지 않는다. 응답 직전에 batch.iter_records()로 변환한다
+    (필드 순서는 MoleculeProperty와 같음).
+
+    Args:
+        available_rows: 시드로 사용할 카탈로그 행 번호 (disease_rows)
+        num_molecules: 생성할 분자 개수
+        constraints: 분자 특성 제약조건
+        stats: 생성 통계 (진행하면서 갱신됨)
+        start_index: 이름 번호 시작값 (작업을 나눠 생성할 때 사용)
+        rng: 요청 단위 난수 생성기 (generation_rng)
+
+    Yields:
+        생성된 분자 배치
+    """
+    catalog = get_catalog()
+    index = start_index
+    batches = generator.iter_constrained_batches(
+        catalog, available_rows, num_molecules, constraints, rng=rng, stats=stats
+    )
+    for batch in batches:
+        yield batch.to_molecules(catalog, index)
+        index += len(batch)
+
+
+def generate(
+    target_disease: str,
+    num_molecules: int,
+    constraints: Optional[dict],
+    seed: int,
+    start_index: int = 0,
+) -> Tuple["molecule_batch.MoleculeBatch", "generator.GenerationStats"]:
+    """
+    분자를 한 번에 생성 (난수는 요청 시드 + 시작 위치에서 유도)
+
+    Returns:
+        (생성된 분자 배치, 생성 통계)
+
+    Raises:
+        ValueError: 지원하지 않는 질환 또는 잘못된 제약조건
+    """
+    stats = generator.GenerationStats(num_requested=num_molecules)
+    rng = generation_rng(target_disease, constraints, seed, start_index)
+    batches = iter_generated_batches(
+        disease_rows(target_disease), num_molecules, constraints, stats, start_index, rng
+    )
+    return molecule_batch.MoleculeBatch.concat(list(batches)), stats
@@ -0,0 +1,94 @@
+"""
+실행 중 추가된 화합물 인덱스 (웹 워커 간 공유)
+
+추가(generate index=true)와 삭제(DELETE /index/{id})는 먼저 공유 변경 로그
+(database/index_log.py, INDEX_DB_PATH)에 기록한다. 각 워커는 인덱스를 쓰기 전에
+아직 적용하지 않은 기록을 seq 순서로 재생하므로, 어느 워커로 온 검색이든
+모든 워커의 추가/삭제가 반영된다.
+"""
+
+import os
+import threading
+from typing import List, Optional
+
+from core.lazy import lazy_module
+from services.catalog import get_catalog
+
+index_log = lazy_module("database.index_log")
+molecule_batch = lazy_module("ml.molecule_batch")
+segmented_index = lazy_module("ml.segmented_index")
+
+_lock = threading.Lock()
+_indexed: Optional["segmented_index.IndexedCompounds"] = None
+_log: Optional["index_log.IndexLog"] = None
+# 이 프로세스가 인덱스에 적용한 마지막 로그 seq
+_applied_seq = 0
+
+
+def _sync_locked() -> None:
+    """아직 적용하지 않은 로그 기록 재생 (_lock 보유 상태에서 호출)"""
+    global _indexed, _log, _applied_seq
+    if _indexed is None:
+        catalog = get_catalog()
+        _indexed = segmented_index.IndexedCompounds(len(catalog), **catalog.fingerprint_params())
+        _log = index_log.IndexLog(os.getenv("INDEX_DB_PATH") or None, len(catalog))
+    for seq, op, compound_id, count, records, fingerprints in _log.read_since(_applied_seq):
+        if op == index_log.ADD:
+            _indexed.insert_records(records, fingerprints, compound_id)
+        else:
+            _indexed.delete(compound_id)
+        _applied_seq = seq
+
+
+def get_indexed_compounds() -> "segmented_index.IndexedCompounds":
+    """
+    모든 워커의 추가/삭제가 반영된 화합물 저장소 + 세그먼트 인덱스 반환
+
+    ID는 카탈로그 행 번호 뒤에서 이어지고, fingerprint 설정은 카탈로그와 같다.
+    """
+    with _lock:
+        _sync_locked()
+        return _indexed
+
+
+def add(batch: "molecule_batch.MoleculeBatch", mols) -> List[int]:
+    """
+    화합물 추가 (로그에 기록 후 재생)
+
+    Args:
+        batch: 추가할 분자 배치 (카탈로그 기술자 컬럼 필요)
+        mols: batch와 같은 순서의 RDKit Mol
+
+    Returns:
+        부여된 화합물 ID
+    """
+    records, fingerprints = get_indexed_compounds().encode(batch, mols)
+    first_id = _log.append_add(records, fingerprints, len(batch))
+    get_indexed_compounds()
+    return list(range(first_id, first_id + len(batch)))
+
+
+def delete(compound_id: int) -> bool:
+    """
+    화합물을 검색에서 제외 (로그에 기록 후 재생)
+
+    Returns:
+        카탈로그 또는 추가된 ID이고 아직 삭제되지 않았으면 True
+    """
+    get_indexed_compounds()
+    if not _log.append_delete(compound_id):
+        return False
+    get_indexed_compounds()
+    return True
+
+
+def _reset_after_fork() -> None:
+    """fork된 자식 프로세스에서 락과 로그 연결을 새로 만듦 (부모 연결 공유 금지)"""
+    global _lock, _indexed, _log, _applied_seq
+    _lock = threading.Lock()
+    _indexed, _log, _applied_seq = None, None, 0
+
+
+# pre-fork 런처(serve.py)에서 워커로 fork될 때 상태 초기화
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)